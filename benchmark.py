@@ -0,0 +1,529 @@
+"""Benchmark suite for the strategy, transform and persistence hot paths with regression checks.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import argparse
+import datetime
+import importlib
+import json
+import platform
+import sqlite3
+import sys
+import time
+import xml.sax.saxutils
+
+import dates
+import persist
+import strategies
+import template_method
+
+
+DEFAULT_ITEMS = 1000
+DEFAULT_PARAGRAPHS = 20
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+
+# Benchmarks from the older per module scripts, each exposing run_benchmarks.
+BENCHMARK_MODULES = [
+    ('html_text_benchmark', {}),
+    ('model_benchmark', {}),
+    ('persist_benchmark', {'rows': 100000}),
+    ('parse_pool_benchmark', {})
+]
+
+# Metric in each result and if larger values are better.
+METRICS = [
+    ('items_per_second', True),
+    ('bytes_per_item', False)
+]
+
+# Each strategy with the spec shaping its synthetic feed and arguments creating it.
+STRATEGY_SPECS = [
+    (strategies.NprParseStrategy, strategies.NPR_SPEC, ()),
+    (strategies.CnnParseStrategy, strategies.CNN_SPEC, ()),
+    (strategies.VoxParseStrategy, strategies.VOX_SPEC, ()),
+    (strategies.WsjParseStrategy, strategies.WSJ_SPEC, ('World',)),
+    (strategies.DrudgeReportParseStrategy, strategies.DRUDGE_REPORT_SPEC, ()),
+    (strategies.NewYorkTimesParseStrategy, strategies.NEW_YORK_TIMES_SPEC, ()),
+    (strategies.BbcParseStrategy, strategies.BBC_SPEC, ()),
+    (strategies.BreitbartParseStrategy, strategies.BREITBART_SPEC, ()),
+    (strategies.DailyMailParseStrategy, strategies.DAILY_MAIL_SPEC, ()),
+    (strategies.FoxParseStrategy, strategies.FOX_SPEC, ())
+]
+
+GETTERS = ['get_title', 'get_description', 'get_publish_date', 'get_link', 'get_author']
+
+NAMESPACES = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'dc': 'http://purl.org/dc/elements/1.1/',
+    'media': 'http://search.yahoo.com/mrss/'
+}
+
+# Tags written in the case used by real feeds, which the parsers lower case.
+TAG_NAMES = {
+    'pubdate': 'pubDate'
+}
+
+RSS_DATE_FORMAT = '%a, %d %b %Y %H:%M:%S -0400'
+ISO_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S-04:00'
+
+PARAGRAPH = (
+    '<p>The <a href="https://example.com/committee?id=%d&amp;ref=rss">committee</a> said on '
+    '<em>Tuesday</em> that it would &ldquo;revisit&rdquo; proposal %d after hearing from '
+    'residents, many of whom <strong>opposed</strong> the plan &mdash; citing costs, noise '
+    'and traffic.</p><img src="https://example.com/images/%d.jpg" alt="Residents" />'
+)
+
+START_DATE = datetime.datetime(2019, 5, 20, 1, 2, 3)
+CRAWL_DATE = datetime.datetime(2019, 5, 21, tzinfo=datetime.timezone.utc)
+
+
+def get_strategy_name(strategy_class):
+    """Get the short name under which a strategy's results are reported.
+
+    Args:
+        strategy_class: The SpecParseStrategy subclass like NprParseStrategy.
+    Returns:
+        Lower case name like npr.
+    """
+    return strategy_class.__name__.replace('ParseStrategy', '').lower()
+
+
+def make_description(index, paragraphs):
+    """Make a large HTML description like those found in full text feeds.
+
+    Args:
+        index: Integer distinguishing this description from others.
+        paragraphs: The number of paragraphs of markup.
+    Returns:
+        String HTML.
+    """
+    return ''.join(PARAGRAPH % (index, index, i) for i in range(paragraphs))
+
+
+def make_value(field, path, index, paragraphs):
+    """Make a plausible value for a field read from a given path.
+
+    Args:
+        field: The name of the field from strategies.FIELDS.
+        path: The path from the spec from which the field is read like dc:date.
+        index: Integer distinguishing this item from others in the feed.
+        paragraphs: The number of paragraphs in descriptions.
+    Returns:
+        String value for the field.
+    """
+    if field == 'title':
+        return 'Committee revisits proposal %d' % index
+    elif field == 'description':
+        return make_description(index, paragraphs)
+    elif field == 'publish_date':
+        date = START_DATE - datetime.timedelta(minutes=index)
+        date_format = RSS_DATE_FORMAT if path == 'pubdate' else ISO_DATE_FORMAT
+        return date.strftime(date_format)
+    elif field == 'link':
+        return 'https://example.com/news/2019/05/20/story-%d.html' % index
+    else:
+        return 'Reporter %d' % (index % 50)
+
+
+def make_element(path, value):
+    """Write the XML for a value at a field path.
+
+    Args:
+        path: Path from the spec like title, author/name or atom:link@href.
+        value: The string value to write.
+    Returns:
+        String XML with HTML values wrapped in CDATA.
+    """
+    (name, attribute) = strategies.compile_path(path)
+    tags = [TAG_NAMES.get(tag, tag) for tag in name.split('/')]
+
+    if attribute:
+        inner = None
+        last = '<%s %s=%s />' % (tags[-1], attribute, xml.sax.saxutils.quoteattr(value))
+    elif value.startswith('<'):
+        inner = '<![CDATA[%s]]>' % value
+    else:
+        inner = xml.sax.saxutils.escape(value)
+
+    if inner is not None:
+        last = '<%s>%s</%s>' % (tags[-1], inner, tags[-1])
+
+    for tag in reversed(tags[:-1]):
+        last = '<%s>%s</%s>' % (tag, last, tag)
+
+    return last
+
+
+def get_first_paths(spec):
+    """Get the path from which each field in a spec is read first.
+
+    Args:
+        spec: The spec dict as described in strategies.SpecParseStrategy.
+    Returns:
+        List of tuples of field name and path.
+    """
+    paths = []
+    for field in strategies.FIELDS:
+        field_spec = spec['fields'].get(field)
+        if field_spec is None:
+            continue
+
+        if isinstance(field_spec, dict):
+            field_spec = field_spec['paths']
+
+        paths.append((field, field_spec[0]))
+
+    return paths
+
+
+def make_feed(spec, items=DEFAULT_ITEMS, paragraphs=DEFAULT_PARAGRAPHS):
+    """Create a synthetic feed shaped like those read by a strategy.
+
+    Args:
+        spec: The spec dict of the strategy whose feed should be imitated.
+        items: The number of items in the feed.
+        paragraphs: The number of paragraphs of HTML in each description.
+    Returns:
+        String RSS or, for specs with an entry item tag, Atom contents.
+    """
+    paths = get_first_paths(spec)
+    item_tag = spec.get('item_tag', strategies.ParseStrategy.ITEM_TAG)
+
+    prefixes = set(path.split(':')[0] for (field, path) in paths if ':' in path)
+    declarations = ''.join(
+        ' xmlns:%s="%s"' % (prefix, NAMESPACES.get(prefix, 'https://example.com/' + prefix))
+        for prefix in sorted(prefixes)
+    )
+
+    body = ''.join(
+        '<%s>%s</%s>' % (
+            item_tag,
+            ''.join(make_element(path, make_value(field, path, i, paragraphs))
+                for (field, path) in paths),
+            item_tag
+        )
+        for i in range(items)
+    )
+
+    if item_tag == 'entry':
+        template = '<?xml version="1.0"?><feed xmlns="%s"%s>%s</feed>'
+        return template % (NAMESPACES['atom'], declarations, body)
+    else:
+        template = '<?xml version="1.0"?><rss version="2.0"%s><channel>%s</channel></rss>'
+        return template % (declarations, body)
+
+
+def time_best(function, repeat, setup=None):
+    """Time a function, keeping the fastest of several runs.
+
+    Args:
+        function: Function to time which takes the value returned by setup.
+        repeat: The number of runs.
+        setup: Optional function run before each run and excluded from its time.
+    Returns:
+        Float seconds taken by the fastest run.
+    """
+    best = None
+    for i in range(repeat):
+        argument = setup() if setup else None
+        start = time.perf_counter()
+        function(argument)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return best
+
+
+def clear_caches():
+    """Empty the memo of parsed dates so that repeated runs measure parsing rather than lookups."""
+    dates.parse_date.cache_clear()
+
+
+def make_db():
+    """Create an empty in memory articles database with the full schema.
+
+    Returns:
+        sqlite3 connection including the search index and its triggers.
+    """
+    target_db = sqlite3.connect(':memory:')
+    persist.create_schema(target_db)
+    return target_db
+
+
+def run_strategy_benchmarks(strategy_class, spec, args=(), items=DEFAULT_ITEMS,
+    paragraphs=DEFAULT_PARAGRAPHS, repeat=DEFAULT_REPEAT):
+    """Measure each hot path for a single strategy against its synthetic feed.
+
+    Args:
+        strategy_class: The SpecParseStrategy subclass to measure.
+        spec: The spec dict for that strategy, used to shape its feed.
+        args: Tuple of positional arguments with which the strategy is created.
+        items: The number of items in the feed.
+        paragraphs: The number of paragraphs of HTML in each description.
+        repeat: The number of runs of which the fastest is reported.
+    Returns:
+        List of dicts with the name of each benchmark and its items_per_second.
+    """
+    strategy = strategy_class(*args)
+    name = get_strategy_name(strategy_class)
+    text = make_feed(spec, items, paragraphs)
+
+    feed_items = strategy.get_items(text)
+    if len(feed_items) != items:
+        raise ValueError('Expected %d items for %s but parsed %d.' % (
+            items,
+            name,
+            len(feed_items)
+        ))
+
+    articles = [
+        template_method.transform_rss_item(item, strategy, crawl_date=CRAWL_DATE)
+        for item in feed_items
+    ]
+
+    def call_getter(getter):
+        return lambda unused: [getter(item) for item in feed_items]
+
+    cases = [('get_items', lambda unused: strategy.get_items(text), None)]
+    for getter_name in GETTERS:
+        cases.append((getter_name, call_getter(getattr(strategy, getter_name)), clear_caches))
+
+    cases.append((
+        'transform_rss_item',
+        lambda unused: [
+            template_method.transform_rss_item(item, strategy, crawl_date=CRAWL_DATE)
+            for item in feed_items
+        ],
+        clear_caches
+    ))
+    cases.append((
+        'persist_articles',
+        lambda target_db: persist.persist_articles(articles, target_db),
+        make_db
+    ))
+
+    results = []
+    for (case_name, function, setup) in cases:
+        seconds = time_best(function, repeat, setup=setup)
+        results.append({
+            'name': 'strategies.%s.%s' % (name, case_name),
+            'items_per_second': items / seconds
+        })
+
+    return results
+
+
+def run_module_benchmarks(modules=BENCHMARK_MODULES):
+    """Run the benchmarks of the per module scripts.
+
+    Args:
+        modules: List of tuples of module name and keyword arguments for its run_benchmarks.
+    Returns:
+        List of dicts with the name of each benchmark and its metric.
+    """
+    results = []
+    for (module_name, kwargs) in modules:
+        module = importlib.import_module(module_name)
+        results.extend(module.run_benchmarks(**kwargs))
+
+    return results
+
+
+def run_benchmarks(items=DEFAULT_ITEMS, paragraphs=DEFAULT_PARAGRAPHS, repeat=DEFAULT_REPEAT,
+    include_modules=True):
+    """Run the strategy benchmarks for every strategy along with the per module benchmarks.
+
+    Args:
+        items: The number of items in each synthetic feed.
+        paragraphs: The number of paragraphs of HTML in each description.
+        repeat: The number of runs of which the fastest is reported.
+        include_modules: Flag indicating if the benchmarks in BENCHMARK_MODULES should be run.
+    Returns:
+        List of dicts with the name of each benchmark and either items_per_second or
+        bytes_per_item.
+    """
+    results = []
+    for (strategy_class, spec, args) in STRATEGY_SPECS:
+        results.extend(
+            run_strategy_benchmarks(strategy_class, spec, args, items, paragraphs, repeat)
+        )
+
+    if include_modules:
+        results.extend(run_module_benchmarks())
+
+    return results
+
+
+def get_metric(result):
+    """Get the metric reported by a result.
+
+    Args:
+        result: Dict from run_benchmarks.
+    Returns:
+        Tuple of metric name and if larger values are better or None if no metric is known.
+    """
+    for (metric, higher_is_better) in METRICS:
+        if metric in result:
+            return (metric, higher_is_better)
+
+    return None
+
+
+def add_thresholds(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Annotate results with the worst value allowed relative to a baseline run.
+
+    Args:
+        results: List of dicts from run_benchmarks, updated in place.
+        baseline: List of dicts from an earlier run_benchmarks. Benchmarks missing from the
+            baseline are left without a threshold.
+        tolerance: The fraction by which a metric may worsen before it is a regression.
+    Returns:
+        List of the results which are worse than their threshold.
+    """
+    baseline_by_name = dict((result['name'], result) for result in baseline)
+    regressions = []
+
+    for result in results:
+        metric = get_metric(result)
+        previous = baseline_by_name.get(result['name'])
+        if metric is None or previous is None or metric[0] not in previous:
+            continue
+
+        (name, higher_is_better) = metric
+        if higher_is_better:
+            threshold = previous[name] * (1 - tolerance)
+            regressed = result[name] < threshold
+        else:
+            threshold = previous[name] * (1 + tolerance)
+            regressed = result[name] > threshold
+
+        result['baseline'] = previous[name]
+        result['threshold'] = threshold
+        result['regressed'] = regressed
+
+        if regressed:
+            regressions.append(result)
+
+    return regressions
+
+
+def make_report(results, items, paragraphs, tolerance):
+    """Make the machine readable report of a run.
+
+    Args:
+        results: List of dicts from run_benchmarks, optionally annotated by add_thresholds.
+        items: The number of items in each synthetic feed.
+        paragraphs: The number of paragraphs of HTML in each description.
+        tolerance: The fraction by which a metric may worsen before it is a regression.
+    Returns:
+        Dict ready to be written as JSON.
+    """
+    return {
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'items': items,
+        'paragraphs': paragraphs,
+        'tolerance': tolerance,
+        'results': results
+    }
+
+
+def load_baseline(path):
+    """Read the results of an earlier run.
+
+    Args:
+        path: Path to a report written by this script through --output.
+    Returns:
+        List of result dicts.
+    """
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def main():
+    """Execute this script from the command line.
+
+    Exits with a non-zero status if any benchmark regressed beyond the tolerance from the
+    baseline.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark strategies, transform and persistence against synthetic feeds.'
+    )
+    parser.add_argument('--items', type=int, default=DEFAULT_ITEMS, help='Items per feed.')
+    parser.add_argument(
+        '--paragraphs',
+        type=int,
+        default=DEFAULT_PARAGRAPHS,
+        help='Paragraphs of HTML per description.'
+    )
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Runs per benchmark.')
+    parser.add_argument(
+        '--skip-modules',
+        action='store_true',
+        help='Only run the strategy benchmarks, skipping the per module scripts.'
+    )
+    parser.add_argument('--output', default=None, help='Path at which to write the JSON report.')
+    parser.add_argument('--baseline', default=None, help='Report from an earlier run to check.')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='Fraction by which a benchmark may worsen from the baseline.'
+    )
+    options = parser.parse_args()
+
+    results = run_benchmarks(
+        options.items,
+        options.paragraphs,
+        options.repeat,
+        include_modules=not options.skip_modules
+    )
+
+    regressions = []
+    if options.baseline:
+        regressions = add_thresholds(results, load_baseline(options.baseline), options.tolerance)
+
+    report = make_report(results, options.items, options.paragraphs, options.tolerance)
+    if options.output:
+        with open(options.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    for result in regressions:
+        (metric, higher_is_better) = get_metric(result)
+        sys.stderr.write('Regression in %s: %.1f %s against threshold %.1f.\n' % (
+            result['name'],
+            result[metric],
+            metric,
+            result['threshold']
+        ))
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import unittest
+
+import benchmark
+import strategies
+
+
+class BenchmarkTest(unittest.TestCase):
+
+    def test_make_feed_matches_spec(self):
+        for (strategy_class, spec, args) in benchmark.STRATEGY_SPECS:
+            strategy = strategy_class(*args)
+            items = strategy.get_items(benchmark.make_feed(spec, items=3, paragraphs=2))
+            self.assertEqual(len(items), 3)
+
+            values = strategy.extract(items[1])
+            for (field, value) in zip(strategies.FIELDS, values):
+                if field in spec['fields']:
+                    self.assertIsNotNone(value, '%s of %s' % (field, strategy_class.__name__))
+
+            self.assertEqual(values[3], 'https://example.com/news/2019/05/20/story-1.html')
+
+    def test_make_element(self):
+        self.assertEqual(benchmark.make_element('author/name', 'A & B'),
+            '<author><name>A &amp; B</name></author>')
+        self.assertEqual(benchmark.make_element('atom:link@href', 'https://example.com'),
+            '<atom:link href="https://example.com" />')
+        self.assertEqual(benchmark.make_element('pubdate', 'x'), '<pubDate>x</pubDate>')
+
+    def test_run_strategy_benchmarks(self):
+        results = benchmark.run_strategy_benchmarks(
+            strategies.CnnParseStrategy,
+            strategies.CNN_SPEC,
+            items=5,
+            paragraphs=1,
+            repeat=1
+        )
+        names = [result['name'] for result in results]
+        self.assertIn('strategies.cnn.get_items', names)
+        self.assertIn('strategies.cnn.get_publish_date', names)
+        self.assertIn('strategies.cnn.persist_articles', names)
+        self.assertTrue(all(result['items_per_second'] > 0 for result in results))
+
+    def test_add_thresholds(self):
+        baseline = [
+            {'name': 'fast', 'items_per_second': 100},
+            {'name': 'small', 'bytes_per_item': 100},
+            {'name': 'steady', 'items_per_second': 100}
+        ]
+        results = [
+            {'name': 'fast', 'items_per_second': 70},
+            {'name': 'small', 'bytes_per_item': 130},
+            {'name': 'steady', 'items_per_second': 90},
+            {'name': 'new', 'items_per_second': 10}
+        ]
+
+        regressions = benchmark.add_thresholds(results, baseline, tolerance=0.25)
+
+        self.assertEqual([result['name'] for result in regressions], ['fast', 'small'])
+        self.assertEqual(results[0]['threshold'], 75)
+        self.assertEqual(results[1]['threshold'], 125)
+        self.assertFalse(results[2]['regressed'])
+        self.assertNotIn('threshold', results[3])
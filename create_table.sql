@@ -1,10 +1,60 @@
 CREATE TABLE "articles" (
+    `id` INTEGER PRIMARY KEY,
     `source` TEXT,
     `sourceFeed` TEXT,
     `title` TEXT,
     `description` TEXT,
-    `publishDate` TEXT,
-    `crawlDate` TEXT,
+    `publishDate` INTEGER,
+    `crawlDate` INTEGER,
     `link` TEXT,
     `author` TEXT
-)
+);
+
+CREATE UNIQUE INDEX "articlesSourceLink" ON "articles" (`source`, `link`);
+
+CREATE INDEX "articlesSourcePublishDate" ON "articles" (`source`, `publishDate`);
+
+CREATE INDEX "articlesCrawlDate" ON "articles" (`crawlDate`);
+
+CREATE TABLE "feedCache" (
+    `url` TEXT PRIMARY KEY,
+    `etag` TEXT,
+    `lastModified` TEXT,
+    `bodyHash` TEXT,
+    `itemHashes` BLOB
+);
+
+CREATE TABLE "crawlSchedule" (
+    `url` TEXT PRIMARY KEY,
+    `rate` REAL,
+    `interval` REAL,
+    `nextDue` REAL,
+    `lastCrawl` REAL
+);
+
+CREATE VIRTUAL TABLE "articlesSearch" USING fts5(
+    `title`,
+    `description`,
+    content='articles',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER "articlesSearchInsert" AFTER INSERT ON "articles" BEGIN
+    INSERT INTO articlesSearch (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+
+CREATE TRIGGER "articlesSearchDelete" AFTER DELETE ON "articles" BEGIN
+    INSERT INTO articlesSearch (articlesSearch, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+END;
+
+CREATE TRIGGER "articlesSearchUpdate" AFTER UPDATE OF `title`, `description` ON "articles" BEGIN
+    INSERT INTO articlesSearch (articlesSearch, rowid, title, description)
+    VALUES ('delete', old.id, old.title, old.description);
+    INSERT INTO articlesSearch (rowid, title, description)
+    VALUES (new.id, new.title, new.description);
+END;
+
+PRAGMA user_version = 5;
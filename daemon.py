@@ -0,0 +1,426 @@
+"""Resident crawler daemon taking commands over a Unix socket and from signals.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import argparse
+import json
+import logging
+import os
+import queue
+import signal
+import socket
+import socketserver
+import threading
+
+import feed_cache
+import http_session
+import news_crawler
+import persist
+import seen_links
+import sources
+
+
+DEFAULT_SOCKET_NAME = 'news_crawler.sock'
+ENCODING = 'utf-8'
+MAX_COMMAND_BYTES = 4096
+POLL_SECONDS = 1
+SOCKET_MODE = 0o600
+
+COMMAND_SIGNALS = {
+    signal.SIGHUP: 'crawl',
+    signal.SIGUSR1: 'flush',
+    signal.SIGTERM: 'shutdown',
+    signal.SIGINT: 'shutdown'
+}
+
+logger = logging.getLogger(__name__)
+
+
+class WarmCrawler:
+    """Crawler whose HTTP session, feed cache, seen links and database stay open across crawls.
+
+    Not thread safe. Every method should be called from the thread which opened the database.
+    """
+
+    def __init__(self, target_db, news_sources, seen_path, workers=news_crawler.DEFAULT_WORKERS,
+        timeout=news_crawler.DEFAULT_TIMEOUT, use_cache=True, filter_seen=True):
+        """Open the resources shared by every crawl.
+
+        Args:
+            target_db: DB API v2 compliant connection into which articles are persisted.
+            news_sources: List of NewsSource which may be crawled.
+            seen_path: The file path at which seen links are saved.
+            workers: The maximum number of sources to process at once.
+            timeout: Number of seconds to wait on connecting to or reading from each server.
+            use_cache: Flag indicating if feeds unchanged since the last crawl should be skipped.
+            filter_seen: Flag indicating if items whose articles were already stored should be
+                skipped.
+        """
+        self.__db = target_db
+        self.__news_sources = news_sources
+        self.__seen_path = seen_path
+        self.__workers = workers
+        self.__cache = feed_cache.FeedCache(target_db) if use_cache else None
+        self.__seen = seen_links.load_seen_links(target_db, seen_path)
+        self.__session = http_session.HttpSession(
+            pool_maxsize=max(workers, http_session.DEFAULT_POOL_MAXSIZE)
+        )
+        self.__context = news_crawler.CrawlContext(
+            timeout=timeout,
+            session=self.__session,
+            cache=self.__cache,
+            seen=self.__seen if filter_seen else None
+        )
+        self.__crawls = 0
+
+    def find_sources(self, name):
+        """Find the sources matching a feed URL or the name of a news agency.
+
+        Args:
+            name: String URL of a feed or case insensitive source name like "npr".
+        Returns:
+            List of matching NewsSource which is empty if none match.
+        """
+        lower_name = name.lower()
+        return [
+            source for source in self.__news_sources
+            if source.get_url() == name
+            or source.get_parse_strategy().get_source().lower() == lower_name
+        ]
+
+    def crawl(self, news_sources=None):
+        """Crawl and persist sources using the warm resources.
+
+        Args:
+            news_sources: Optional list of NewsSource to crawl. Defaults to every source.
+        Returns:
+            Dict from the URL of each source to the number of new articles found.
+        """
+        if news_sources is None:
+            news_sources = self.__news_sources
+
+        counts = news_crawler.crawl_due_sources(
+            news_sources,
+            self.__db,
+            workers=self.__workers,
+            context=self.__context,
+            seen=self.__seen
+        )
+        self.__crawls += 1
+        return counts
+
+    def flush(self):
+        """Write the feed cache and seen links so that a restart does not repeat work."""
+        if self.__cache:
+            self.__cache.save()
+
+        self.__seen.save(self.__seen_path, self.__db)
+
+    def get_status(self):
+        """Describe the resources held by this crawler.
+
+        Returns:
+            Dict with the number of crawls, sources, articles seen and bytes received.
+        """
+        return {
+            'crawls': self.__crawls,
+            'sources': len(self.__news_sources),
+            'seen': self.__seen.get_filter().get_count(),
+            'bytesReceived': sum(self.__session.get_bytes_received().values())
+        }
+
+    def execute(self, command):
+        """Run a text command sent to the daemon.
+
+        Args:
+            command: String command being one of "crawl", "crawl <url or source name>",
+                "flush" or "status".
+        Returns:
+            Dict response which is JSON serializable with "ok" indicating success.
+        """
+        parts = command.split(None, 1)
+        name = parts[0] if parts else ''
+        argument = parts[1].strip() if len(parts) > 1 else None
+
+        if name == 'crawl':
+            if argument is None:
+                news_sources = None
+            else:
+                news_sources = self.find_sources(argument)
+                if not news_sources:
+                    return {'ok': False, 'error': 'No source matches %s.' % argument}
+
+            return {'ok': True, 'articles': self.crawl(news_sources)}
+        elif name == 'flush':
+            self.flush()
+            return {'ok': True}
+        elif name == 'status':
+            return {'ok': True, 'status': self.get_status()}
+        else:
+            return {'ok': False, 'error': 'Unknown command %s.' % command}
+
+    def close(self):
+        """Flush state and close the HTTP session. The database is left open for its owner."""
+        self.flush()
+        self.__session.close()
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """Handler reading one command per connection and writing back a JSON response."""
+
+    def handle(self):
+        """Forward a command to the daemon and wait for its response."""
+        line = self.rfile.readline(MAX_COMMAND_BYTES)
+        command = line.decode(ENCODING).strip()
+
+        reply = queue.SimpleQueue()
+        self.server.daemon.submit(command, reply)
+        response = reply.get()
+
+        self.wfile.write(json.dumps(response).encode(ENCODING) + b'\n')
+
+
+class CommandServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server passing commands through to a Daemon."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, daemon):
+        """Listen for commands on a Unix socket readable only by the current user.
+
+        Args:
+            socket_path: The file path at which to create the socket.
+            daemon: The Daemon to which commands are submitted.
+        """
+        self.daemon = daemon
+        socketserver.UnixStreamServer.__init__(self, socket_path, CommandHandler)
+        os.chmod(socket_path, SOCKET_MODE)
+
+
+class Daemon:
+    """Loop running commands from a socket and signals against a WarmCrawler one at a time.
+
+    Commands run on the thread which called serve so that the crawler's database connection
+    never changes threads. SIGHUP crawls every source, SIGUSR1 flushes and SIGTERM or SIGINT
+    shut down after the running command finishes.
+    """
+
+    def __init__(self, crawler, socket_path):
+        """Create a new daemon without yet listening for commands.
+
+        Args:
+            crawler: The WarmCrawler against which commands run.
+            socket_path: The file path at which to listen for commands.
+        """
+        self.__crawler = crawler
+        self.__socket_path = socket_path
+        self.__commands = queue.SimpleQueue()
+
+    def submit(self, command, reply=None):
+        """Queue a command. Safe to call from any thread and from signal handlers.
+
+        Args:
+            command: The string command to run.
+            reply: Optional queue.SimpleQueue to which the dict response is put.
+        """
+        self.__commands.put((command, reply))
+
+    def install_signal_handlers(self):
+        """Translate signals into commands."""
+        def handle_signal(received, frame):
+            self.submit(COMMAND_SIGNALS[received])
+
+        for signum in COMMAND_SIGNALS:
+            signal.signal(signum, handle_signal)
+
+    def serve(self):
+        """Run commands until asked to shut down, then flush and release resources."""
+        remove_stale_socket(self.__socket_path)
+        server = CommandServer(self.__socket_path, self)
+        listener = threading.Thread(target=server.serve_forever, daemon=True)
+        listener.start()
+        logger.info('Listening for commands on %s.', self.__socket_path)
+
+        try:
+            self.__run_commands()
+        finally:
+            server.shutdown()
+            server.server_close()
+            os.remove(self.__socket_path)
+            self.__crawler.close()
+
+    def __run_commands(self):
+        while True:
+            try:
+                (command, reply) = self.__commands.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                continue
+
+            if command == 'shutdown':
+                response = {'ok': True}
+            else:
+                try:
+                    response = self.__crawler.execute(command)
+                except Exception as e:
+                    logger.exception('Failed to run %s.', command)
+                    response = {'ok': False, 'error': str(e)}
+
+            if reply is not None:
+                reply.put(response)
+
+            if command == 'shutdown':
+                self.__reject_pending()
+                return
+
+    def __reject_pending(self):
+        while True:
+            try:
+                (command, reply) = self.__commands.get_nowait()
+            except queue.Empty:
+                return
+
+            if reply is not None:
+                reply.put({'ok': False, 'error': 'Shutting down before running %s.' % command})
+
+
+def remove_stale_socket(socket_path):
+    """Remove a socket left behind by a daemon which did not shut down cleanly.
+
+    Args:
+        socket_path: The file path of the socket.
+    Raises:
+        RuntimeError: If another daemon is still listening on the socket.
+    """
+    if not os.path.exists(socket_path):
+        return
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(socket_path)
+        return
+    finally:
+        client.close()
+
+    raise RuntimeError('A daemon is already listening on %s.' % socket_path)
+
+
+def send_command(socket_path, command, timeout=None):
+    """Send a command to a running daemon and wait for its response.
+
+    Args:
+        socket_path: The file path of the daemon's socket.
+        command: The string command like "crawl npr".
+        timeout: Optional number of seconds to wait for the response.
+    Returns:
+        Dict response from the daemon.
+    Raises:
+        ConnectionError: If the daemon closed the connection without responding.
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(timeout)
+    try:
+        client.connect(socket_path)
+        client.sendall(command.encode(ENCODING) + b'\n')
+        with client.makefile('rb') as response:
+            line = response.readline()
+    finally:
+        client.close()
+
+    if not line:
+        raise ConnectionError('Daemon at %s closed without responding.' % socket_path)
+
+    return json.loads(line.decode(ENCODING))
+
+
+def get_default_socket_path():
+    """Get the default location of the daemon's socket, alongside the default database.
+
+    Returns:
+        String path to the socket.
+    """
+    parent_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(parent_dir, DEFAULT_SOCKET_NAME)
+
+
+def main():
+    """Execute this script from the command line."""
+    parser = argparse.ArgumentParser(
+        description='Run a resident crawler or send it a command (crawl [source], flush, status, '
+        'shutdown).'
+    )
+    parser.add_argument('--send', help='Command to send to a running daemon.')
+    parser.add_argument(
+        '--socket',
+        default=get_default_socket_path(),
+        help='Path of the command socket. Defaults to %s.' % DEFAULT_SOCKET_NAME
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=news_crawler.DEFAULT_WORKERS,
+        help='Number of sources to fetch at once.'
+    )
+    parser.add_argument(
+        '--socket-timeout',
+        type=float,
+        default=news_crawler.DEFAULT_TIMEOUT,
+        help='Seconds to wait on connecting to a server or between bytes received from it.'
+    )
+    parser.add_argument(
+        '--crawl-on-start',
+        action='store_true',
+        help='Crawl every source as soon as the daemon starts.'
+    )
+    parser.add_argument('--ignore-cache', action='store_true', help='Always download feeds.')
+    parser.add_argument('--ignore-seen', action='store_true', help='Transform every item.')
+    options = parser.parse_args()
+
+    if options.send:
+        print(json.dumps(send_command(options.socket, options.send), indent=2))
+        return
+
+    db = persist.get_default_db()
+    crawler = WarmCrawler(
+        db,
+        sources.SOURCES,
+        seen_links.get_default_path(),
+        workers=options.workers,
+        timeout=options.socket_timeout,
+        use_cache=not options.ignore_cache,
+        filter_seen=not options.ignore_seen
+    )
+    daemon = Daemon(crawler, options.socket)
+    daemon.install_signal_handlers()
+
+    if options.crawl_on_start:
+        daemon.submit('crawl')
+
+    try:
+        daemon.serve()
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+import unittest.mock
+
+import daemon
+import model
+import sources
+import strategies
+
+
+class DaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        parent_dir = os.path.dirname(os.path.realpath(__file__))
+        with open(os.path.join(parent_dir, 'create_table.sql')) as f:
+            create_sql = f.read()
+
+        self.__connection = sqlite3.connect(':memory:')
+        self.__connection.executescript(create_sql)
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__seen_path = os.path.join(self.__temp_dir.name, 'articles.seen')
+
+        self.__sources = [
+            sources.NewsSource('npr', strategies.NprParseStrategy()),
+            sources.NewsSource('bbc', strategies.BbcParseStrategy())
+        ]
+        self.__patcher = unittest.mock.patch(
+            'news_crawler.process_source',
+            self.__fake_process_source
+        )
+        self.__patcher.start()
+        self.__crawler = daemon.WarmCrawler(self.__connection, self.__sources, self.__seen_path)
+
+    def tearDown(self):
+        self.__patcher.stop()
+        self.__temp_dir.cleanup()
+
+    def test_crawl(self):
+        response = self.__crawler.execute('crawl')
+        self.assertEqual(response, {'ok': True, 'articles': {'npr': 2, 'bbc': 2}})
+
+        response = self.__crawler.execute('crawl')
+        self.assertEqual(response['articles'], {'npr': 0, 'bbc': 0})
+
+        cursor = self.__connection.cursor()
+        cursor.execute('''SELECT count(*) FROM articles''')
+        self.assertEqual(cursor.fetchone()[0], 4)
+
+    def test_crawl_one(self):
+        response = self.__crawler.execute('crawl NPR')
+        self.assertEqual(response['articles'], {'npr': 2})
+
+        response = self.__crawler.execute('crawl CNN')
+        self.assertFalse(response['ok'])
+
+    def test_flush(self):
+        self.__crawler.execute('crawl')
+        self.assertEqual(self.__crawler.execute('flush'), {'ok': True})
+        self.assertTrue(os.path.exists(self.__seen_path))
+
+        status = self.__crawler.execute('status')['status']
+        self.assertEqual(status['crawls'], 1)
+        self.assertEqual(status['seen'], 4)
+
+    def test_unknown_command(self):
+        self.assertFalse(self.__crawler.execute('explode')['ok'])
+
+    def test_serve(self):
+        socket_path = os.path.join(self.__temp_dir.name, 'crawler.sock')
+        responses = []
+
+        def send_commands():
+            while not os.path.exists(socket_path):
+                time.sleep(0.01)
+
+            responses.append(daemon.send_command(socket_path, 'crawl bbc', timeout=5))
+            responses.append(daemon.send_command(socket_path, 'shutdown', timeout=5))
+
+        client = threading.Thread(target=send_commands)
+        client.start()
+        daemon.Daemon(self.__crawler, socket_path).serve()
+        client.join()
+
+        self.assertEqual(responses[0]['articles'], {'bbc': 2})
+        self.assertEqual(responses[1], {'ok': True})
+        self.assertFalse(os.path.exists(socket_path))
+        self.assertTrue(os.path.exists(self.__seen_path))
+
+    def __fake_process_source(self, source, context=None):
+        date = datetime.datetime(2019, 5, 20, tzinfo=datetime.timezone.utc)
+        articles = [
+            model.Article(source.get_url(), '', 'title', '', date, date, link, 'author')
+            for link in ['link 1', 'link 2']
+        ]
+        seen = context.get_seen()
+        return [
+            article for article in articles
+            if not seen.contains(article.get_source(), article.get_link())
+        ]
@@ -0,0 +1,232 @@
+"""Fast parsing of the date formats found in news feeds.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import functools
+import re
+
+
+CACHE_SIZE = 4096
+
+MONTHS = {
+    'jan': 1,
+    'feb': 2,
+    'mar': 3,
+    'apr': 4,
+    'may': 5,
+    'jun': 6,
+    'jul': 7,
+    'aug': 8,
+    'sep': 9,
+    'oct': 10,
+    'nov': 11,
+    'dec': 12
+}
+
+TIMEZONE_OFFSETS = {
+    'UT': 0,
+    'UTC': 0,
+    'GMT': 0,
+    'Z': 0,
+    'BST': 1,
+    'CET': 1,
+    'CEST': 2,
+    'EST': -5,
+    'EDT': -4,
+    'CST': -6,
+    'CDT': -5,
+    'MST': -7,
+    'MDT': -6,
+    'PST': -8,
+    'PDT': -7
+}
+
+TIMEZONES = dict(
+    (name, datetime.timezone(datetime.timedelta(hours=hours)))
+    for (name, hours) in TIMEZONE_OFFSETS.items()
+)
+
+DATEUTIL_TZINFOS = dict((name, hours * 3600) for (name, hours) in TIMEZONE_OFFSETS.items())
+
+RFC_822_PATTERN = re.compile(
+    r'^\s*(?:[A-Za-z]{3},?\s*)?(\d{1,2})\s+([A-Za-z]{3})[A-Za-z]*\s+(\d{2}|\d{4})\s+'
+    r'(\d{1,2}):(\d{2})(?::(\d{2}))?\s*([+-]\d{4}|[A-Za-z]{1,5})?\s*$'
+)
+
+ISO_8601_PATTERN = re.compile(
+    r'^\s*(\d{4})-(\d{2})-(\d{2})(?:[Tt ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?)?'
+    r'\s*([Zz]|[+-]\d{2}(?::?\d{2})?)?\s*$'
+)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def parse_date(text):
+    """Parse a date as found in RSS or Atom feeds.
+
+    RFC 822 dates like those in RSS pubDate and ISO 8601 dates like those in Atom or dc:date are
+    parsed directly, resolving common timezone abbreviations through TIMEZONE_OFFSETS. Anything
+    else is given to dateutil. Results are memoized as many items in a feed share timestamps.
+
+    Args:
+        text: The string date to parse.
+    Returns:
+        The datetime.datetime parsed, which is naive if the text had no timezone.
+    Raises:
+        ValueError: The text could not be parsed as a date.
+    """
+    parsed = parse_rfc_822(text)
+    if parsed is not None:
+        return parsed
+
+    parsed = parse_iso_8601(text)
+    if parsed is not None:
+        return parsed
+
+    import dateutil.parser
+    return dateutil.parser.parse(text, tzinfos=DATEUTIL_TZINFOS)
+
+
+def parse_rfc_822(text):
+    """Parse a RFC 822 date like Mon, 20 May 2019 01:02:03 -0400.
+
+    Args:
+        text: The string date to parse.
+    Returns:
+        The datetime.datetime parsed or None if the text is not in a supported RFC 822 form.
+    """
+    match = RFC_822_PATTERN.match(text)
+    if not match:
+        return None
+
+    (day, month_name, year, hour, minute, second, zone) = match.groups()
+
+    month = MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+
+    year = int(year)
+    if year < 100:
+        year += 2000 if year < 50 else 1900
+
+    if zone is None:
+        tzinfo = None
+    elif zone[0] in '+-':
+        tzinfo = make_timezone(zone[0], zone[1:3], zone[3:5])
+    else:
+        tzinfo = TIMEZONES.get(zone.upper())
+        if tzinfo is None:
+            return None
+
+    try:
+        return datetime.datetime(
+            year,
+            month,
+            int(day),
+            int(hour),
+            int(minute),
+            int(second) if second else 0,
+            tzinfo=tzinfo
+        )
+    except ValueError:
+        return None
+
+
+def parse_iso_8601(text):
+    """Parse an ISO 8601 date like 2019-05-20T01:02:03Z.
+
+    Args:
+        text: The string date to parse.
+    Returns:
+        The datetime.datetime parsed or None if the text is not in a supported ISO 8601 form.
+    """
+    match = ISO_8601_PATTERN.match(text)
+    if not match:
+        return None
+
+    (year, month, day, hour, minute, second, fraction, zone) = match.groups()
+
+    if zone is None:
+        tzinfo = None
+    elif zone in ('Z', 'z'):
+        tzinfo = datetime.timezone.utc
+    else:
+        minutes = zone[-2:] if len(zone) > 3 else '00'
+        tzinfo = make_timezone(zone[0], zone[1:3], minutes)
+
+    try:
+        return datetime.datetime(
+            int(year),
+            int(month),
+            int(day),
+            int(hour) if hour else 0,
+            int(minute) if minute else 0,
+            int(second) if second else 0,
+            int(fraction.ljust(6, '0')) if fraction else 0,
+            tzinfo=tzinfo
+        )
+    except ValueError:
+        return None
+
+
+def make_timezone(sign, hours, minutes):
+    """Make a fixed offset timezone.
+
+    Args:
+        sign: String + or - for the direction of the offset from UTC.
+        hours: String number of hours offset.
+        minutes: String number of minutes offset.
+    Returns:
+        The datetime.timezone for the offset.
+    """
+    offset = datetime.timedelta(hours=int(hours), minutes=int(minutes))
+    return datetime.timezone(-offset if sign == '-' else offset)
+
+
+def to_epoch(value):
+    """Convert a datetime into whole seconds since the Unix epoch.
+
+    Args:
+        value: The datetime.datetime to convert which is taken to be UTC if naive.
+    Returns:
+        Integer seconds since the epoch or None if value is None.
+    """
+    if value is None:
+        return None
+
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+
+    return int(value.timestamp())
+
+
+def from_epoch(seconds):
+    """Convert seconds since the Unix epoch into a datetime.
+
+    Args:
+        seconds: Integer seconds since the epoch or None.
+    Returns:
+        UTC datetime.datetime or None if seconds is None.
+    """
+    if seconds is None:
+        return None
+
+    return datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
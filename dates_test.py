@@ -0,0 +1,59 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import unittest
+
+import dateutil.parser
+
+import dates
+
+
+class DatesTest(unittest.TestCase):
+
+    def test_rfc_822(self):
+        parsed = dates.parse_date('Mon, 20 May 2019 01:02:03 -0400')
+        self.assertEqual(parsed, dateutil.parser.parse('2019-05-20T01:02:03-04:00'))
+        self.assertEqual(parsed.utcoffset(), datetime.timedelta(hours=-4))
+
+    def test_rfc_822_abbreviation(self):
+        parsed = dates.parse_date('Mon, 20 May 2019 01:02:03 EDT')
+        self.assertEqual(parsed.utcoffset(), datetime.timedelta(hours=-4))
+
+        parsed = dates.parse_date('20 May 19 01:02 GMT')
+        self.assertEqual(parsed, dateutil.parser.parse('2019-05-20T01:02:00Z'))
+
+    def test_iso_8601(self):
+        parsed = dates.parse_date('2019-05-20T01:02:03.294816Z')
+        self.assertEqual(parsed, dateutil.parser.parse('2019-05-20T01:02:03.294816Z'))
+
+        parsed = dates.parse_date('2019-05-20T01:02:03-04:00')
+        self.assertEqual(parsed.utcoffset(), datetime.timedelta(hours=-4))
+
+    def test_naive(self):
+        parsed = dates.parse_date('2019-05-20 01:02:03')
+        self.assertEqual(parsed, datetime.datetime(2019, 5, 20, 1, 2, 3))
+
+    def test_fallback(self):
+        parsed = dates.parse_date('May 20, 2019 1:02 AM EST')
+        self.assertEqual(parsed.hour, 1)
+        self.assertEqual(parsed.utcoffset(), datetime.timedelta(hours=-5))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            dates.parse_date('not a date')
@@ -0,0 +1,367 @@
+"""Columnar export of the articles database into memory mappable NumPy arrays.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import argparse
+import datetime
+import json
+import os
+
+import numpy
+
+import persist
+
+
+DEFAULT_CHUNK_SIZE = 100000
+
+MISSING_DATE = numpy.iinfo(numpy.int64).min
+
+MANIFEST_NAME = 'manifest.json'
+
+CATEGORY_COLUMNS = ('source', 'sourceFeed')
+DATE_COLUMNS = ('publishDate', 'crawlDate')
+TEXT_COLUMNS = ('title', 'description', 'link', 'author')
+
+SELECT_SQL = '''
+    SELECT
+        rowid,
+        source,
+        sourceFeed,
+        title,
+        description,
+        publishDate,
+        crawlDate,
+        link,
+        author
+    FROM
+        articles
+    WHERE
+        rowid > ?
+    ORDER BY
+        rowid
+'''
+
+
+class Manifest:
+    """Record of what has been exported so far, shared by every part of an export."""
+
+    def __init__(self, last_rowid=0, parts=None, dictionaries=None):
+        """Create a new manifest.
+
+        Args:
+            last_rowid: The largest articles rowid already exported.
+            parts: List of part directory names in the order written.
+            dictionaries: Dict from category column name to the list of its values, where each
+                value's index is its code in the exported arrays.
+        """
+        self.__last_rowid = last_rowid
+        self.__parts = parts if parts else []
+        self.__dictionaries = dictionaries if dictionaries else {
+            column: [] for column in CATEGORY_COLUMNS
+        }
+        self.__codes = {
+            column: {value: code for (code, value) in enumerate(values)}
+            for (column, values) in self.__dictionaries.items()
+        }
+
+    def get_last_rowid(self):
+        """Get the largest rowid exported so far.
+
+        Returns:
+            Integer rowid where later rows have yet to be exported.
+        """
+        return self.__last_rowid
+
+    def get_parts(self):
+        """Get the parts written so far.
+
+        Returns:
+            List of part directory names in the order written.
+        """
+        return self.__parts
+
+    def get_dictionary(self, column):
+        """Get the values of a dictionary encoded column.
+
+        Args:
+            column: The name of the category column like source.
+        Returns:
+            List of string values indexed by code.
+        """
+        return self.__dictionaries[column]
+
+    def encode(self, column, value):
+        """Get the code for a category value, adding it to the dictionary if new.
+
+        Args:
+            column: The name of the category column like source.
+            value: The string value to encode.
+        Returns:
+            Integer code for the value.
+        """
+        codes = self.__codes[column]
+        code = codes.get(value)
+
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+            self.__dictionaries[column].append(value)
+
+        return code
+
+    def add_part(self, name, last_rowid):
+        """Record that a part was written.
+
+        Args:
+            name: The part directory name.
+            last_rowid: The largest rowid in the part.
+        """
+        self.__parts.append(name)
+        self.__last_rowid = last_rowid
+
+    def to_dict(self):
+        """Serialize this manifest.
+
+        Returns:
+            Dict which can be written as JSON.
+        """
+        return {
+            'lastRowid': self.__last_rowid,
+            'parts': self.__parts,
+            'dictionaries': self.__dictionaries
+        }
+
+
+def load_manifest(directory):
+    """Load the manifest for an export directory.
+
+    Args:
+        directory: Path to the export directory.
+    Returns:
+        The Manifest saved or an empty Manifest if nothing was exported yet.
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return Manifest()
+
+    with open(path) as f:
+        raw = json.load(f)
+
+    return Manifest(raw['lastRowid'], raw['parts'], raw['dictionaries'])
+
+
+def save_manifest(directory, manifest):
+    """Atomically save the manifest for an export directory.
+
+    Args:
+        directory: Path to the export directory.
+        manifest: The Manifest to save.
+    """
+    path = os.path.join(directory, MANIFEST_NAME)
+    temp_path = path + '.tmp'
+
+    with open(temp_path, 'w') as f:
+        json.dump(manifest.to_dict(), f)
+
+    os.replace(temp_path, path)
+
+
+def parse_epoch(value):
+    """Convert a stored date into seconds since the Unix epoch.
+
+    Args:
+        value: ISO 8601 string as written by persist, an integer epoch or empty / None if
+            missing. Dates without a timezone are taken to be UTC.
+    Returns:
+        Integer seconds since the epoch or MISSING_DATE.
+    """
+    if value is None or value == '':
+        return MISSING_DATE
+
+    if isinstance(value, int):
+        return value
+
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+
+    return int(parsed.timestamp())
+
+
+def encode_text(values):
+    """Encode strings as concatenated UTF-8 bytes with offsets like Apache Arrow.
+
+    Args:
+        values: List of strings where None is written as an empty string.
+    Returns:
+        Tuple of the uint8 data array and int64 offsets array of length len(values) + 1.
+    """
+    encoded = [value.encode('utf-8') if value else b'' for value in values]
+    offsets = numpy.zeros(len(encoded) + 1, dtype=numpy.int64)
+    numpy.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8)
+    return (data, offsets)
+
+
+def write_part(directory, name, rows, manifest):
+    """Write a chunk of rows as a part of the export.
+
+    Args:
+        directory: Path to the export directory.
+        name: The name of the part directory to create.
+        rows: List of tuples from SELECT_SQL.
+        manifest: The Manifest whose dictionaries encode category columns.
+    """
+    part_dir = os.path.join(directory, name)
+    os.makedirs(part_dir, exist_ok=True)
+
+    columns = list(zip(*rows))
+    (rowids, sources, source_feeds, titles, descriptions, publish_dates, crawl_dates, links,
+        authors) = columns
+
+    arrays = {
+        'rowid': numpy.array(rowids, dtype=numpy.int64),
+        'source': numpy.array(
+            [manifest.encode('source', value) for value in sources],
+            dtype=numpy.int32
+        ),
+        'sourceFeed': numpy.array(
+            [manifest.encode('sourceFeed', value) for value in source_feeds],
+            dtype=numpy.int32
+        ),
+        'publishDate': numpy.array([parse_epoch(x) for x in publish_dates], dtype=numpy.int64),
+        'crawlDate': numpy.array([parse_epoch(x) for x in crawl_dates], dtype=numpy.int64)
+    }
+
+    texts = zip(TEXT_COLUMNS, (titles, descriptions, links, authors))
+    for (column, values) in texts:
+        (data, offsets) = encode_text(values)
+        arrays[column + '.data'] = data
+        arrays[column + '.offsets'] = offsets
+
+    for (array_name, array) in arrays.items():
+        numpy.save(os.path.join(part_dir, array_name + '.npy'), array)
+
+
+def export_articles(target_db, directory, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Export articles not yet exported into new parts of an export directory.
+
+    Rows are read and written one chunk at a time. Only rows inserted since the last export are
+    included such that later updates to already exported rows are not reflected.
+
+    Args:
+        target_db: DB API v2 compliant connection to the articles database.
+        directory: Path to the export directory, created if needed.
+        chunk_size: The maximum number of rows per part.
+    Returns:
+        The number of rows exported.
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+
+    cursor = target_db.cursor()
+    cursor.execute(SELECT_SQL, (manifest.get_last_rowid(),))
+
+    count = 0
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+
+        name = 'part-%05d' % len(manifest.get_parts())
+        write_part(directory, name, rows, manifest)
+        manifest.add_part(name, rows[-1][0])
+        save_manifest(directory, manifest)
+        count += len(rows)
+
+    return count
+
+
+class TextColumn:
+    """Read only view over strings encoded by encode_text."""
+
+    def __init__(self, data, offsets):
+        """Create a new view.
+
+        Args:
+            data: The uint8 array of concatenated UTF-8 bytes.
+            offsets: The int64 array of string boundaries.
+        """
+        self.__data = data
+        self.__offsets = offsets
+
+    def __len__(self):
+        return len(self.__offsets) - 1
+
+    def __getitem__(self, index):
+        start = self.__offsets[index]
+        end = self.__offsets[index + 1]
+        return self.__data[start:end].tobytes().decode('utf-8')
+
+
+def load_part(directory, name, mmap=True):
+    """Load a part of an export.
+
+    Args:
+        directory: Path to the export directory.
+        name: The name of the part directory.
+        mmap: Flag indicating if arrays should be memory mapped rather than read into memory.
+    Returns:
+        Dict from column name to numpy array for numeric and category columns or to TextColumn
+        for text columns.
+    """
+    part_dir = os.path.join(directory, name)
+    mmap_mode = 'r' if mmap else None
+
+    def load(array_name):
+        return numpy.load(os.path.join(part_dir, array_name + '.npy'), mmap_mode=mmap_mode)
+
+    columns = dict(
+        (column, load(column))
+        for column in ('rowid',) + CATEGORY_COLUMNS + DATE_COLUMNS
+    )
+
+    for column in TEXT_COLUMNS:
+        columns[column] = TextColumn(load(column + '.data'), load(column + '.offsets'))
+
+    return columns
+
+
+def main():
+    """Execute this script from the command line."""
+    parser = argparse.ArgumentParser(description='Export new articles into columnar arrays.')
+    parser.add_argument('--db', help='Path to the database. Defaults to articles.db.')
+    parser.add_argument('--out', default='export', help='Export directory. Defaults to export.')
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help='Rows per part. Defaults to %d.' % DEFAULT_CHUNK_SIZE
+    )
+    options = parser.parse_args()
+
+    db = persist.get_db(options.db) if options.db else persist.get_default_db()
+    count = export_articles(db, options.out, chunk_size=options.chunk_size)
+    print('Exported %d articles.' % count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import export
+import model
+import persist
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        parent_dir = os.path.dirname(os.path.realpath(__file__))
+        with open(os.path.join(parent_dir, 'create_table.sql')) as f:
+            create_sql = f.read()
+
+        self.__connection = sqlite3.connect(':memory:')
+        self.__connection.executescript(create_sql)
+        self.__temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.__temp_dir.cleanup()
+
+    def test_export_articles(self):
+        self.__persist('NPR', 'link 1', 'title 1')
+        self.__persist('BBC', 'link 2', 'títle 2')
+
+        count = export.export_articles(self.__connection, self.__temp_dir.name)
+        self.assertEqual(count, 2)
+
+        manifest = export.load_manifest(self.__temp_dir.name)
+        part = export.load_part(self.__temp_dir.name, manifest.get_parts()[0])
+        self.assertEqual(list(part['source']), [0, 1])
+        self.assertEqual(manifest.get_dictionary('source'), ['NPR', 'BBC'])
+        self.assertEqual(part['title'][1], 'títle 2')
+        self.assertEqual(part['author'][0], 'author')
+        self.assertEqual(int(part['publishDate'][0]), 1558310400)
+
+    def test_export_incremental(self):
+        self.__persist('NPR', 'link 1', 'title 1')
+        export.export_articles(self.__connection, self.__temp_dir.name)
+
+        self.__persist('BBC', 'link 2', 'title 2')
+        self.__persist('NPR', 'link 3', 'title 3')
+        count = export.export_articles(self.__connection, self.__temp_dir.name)
+        self.assertEqual(count, 2)
+
+        manifest = export.load_manifest(self.__temp_dir.name)
+        self.assertEqual(len(manifest.get_parts()), 2)
+
+        part = export.load_part(self.__temp_dir.name, manifest.get_parts()[1])
+        self.assertEqual(list(part['source']), [1, 0])
+        self.assertEqual(part['link'][1], 'link 3')
+
+    def __persist(self, source, link, title):
+        date = datetime.datetime(2019, 5, 20, tzinfo=datetime.timezone.utc)
+        article = model.Article(source, '', title, '', date, date, link, 'author')
+        persist.persist_articles([article], self.__connection)
@@ -0,0 +1,293 @@
+"""Cache of HTTP validators allowing feeds to be requested conditionally.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import hashlib
+import threading
+
+
+ENCODING = 'utf-8'
+ITEM_HASH_SIZE = 8
+
+CREATE_SQL = '''
+    CREATE TABLE IF NOT EXISTS feedCache (
+        `url` TEXT PRIMARY KEY,
+        `etag` TEXT,
+        `lastModified` TEXT,
+        `bodyHash` TEXT,
+        `itemHashes` BLOB
+    )
+'''
+
+SELECT_SQL = '''
+    SELECT
+        url,
+        etag,
+        lastModified,
+        bodyHash,
+        itemHashes
+    FROM
+        feedCache
+'''
+
+UPSERT_SQL = '''
+    INSERT INTO
+        feedCache (
+            url,
+            etag,
+            lastModified,
+            bodyHash,
+            itemHashes
+        )
+    VALUES
+        (
+            ?,
+            ?,
+            ?,
+            ?,
+            ?
+        )
+    ON CONFLICT (url) DO UPDATE SET
+        etag = excluded.etag,
+        lastModified = excluded.lastModified,
+        bodyHash = excluded.bodyHash,
+        itemHashes = excluded.itemHashes
+'''
+
+
+class FeedCache:
+    """Validators and content hashes for each feed URL, saved alongside the articles.
+
+    Conditional request validators let servers skip sending unchanged feeds. As many servers
+    ignore them, a hash of each feed's body is also kept so that byte identical bodies are not
+    parsed again, along with a hash of each item so that only changed items are transformed.
+
+    State is held in memory while crawling so that the cache may be used from many worker threads
+    and is only written back to the database through save. What is learned from a response is held
+    apart until its feed is confirmed as parsed in full and then committed once its articles are
+    persisted. Feeds which fail along the way are requested and parsed in full again next time
+    rather than skipped as unchanged.
+    """
+
+    def __init__(self, target_db):
+        """Load the validators and hashes saved in a database.
+
+        Args:
+            target_db: DB API v2 compliant connection in which the cache is saved.
+        """
+        self.__db = target_db
+        self.__lock = threading.Lock()
+
+        cursor = self.__db.cursor()
+        cursor.execute(CREATE_SQL)
+        cursor.execute(SELECT_SQL)
+
+        self.__validators = {}
+        self.__contents = {}
+        self.__pending = {}
+        self.__confirmed = set()
+        for (url, etag, last_modified, body_hash, item_hashes) in cursor:
+            self.__validators[url] = (etag, last_modified)
+            self.__contents[url] = (body_hash, split_item_hashes(item_hashes))
+
+    def get_request_headers(self, url):
+        """Get the headers asking a server to only respond with a feed if it has changed.
+
+        Args:
+            url: The string URL of the feed to be requested.
+        Returns:
+            Dict of conditional request headers which is empty if the feed was not seen before.
+        """
+        with self.__lock:
+            (etag, last_modified) = self.__validators.get(url, (None, None))
+
+        headers = {}
+
+        if etag:
+            headers['If-None-Match'] = etag
+
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        return headers
+
+    def update(self, url, response_headers):
+        """Hold the validators sent back with a full response until the feed is committed.
+
+        Args:
+            url: The string URL of the feed which was requested.
+            response_headers: Case insensitive mapping of the headers in the response.
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+
+        with self.__lock:
+            self.__pending.setdefault(url, {})['validators'] = (etag, last_modified)
+
+    def confirm(self, url):
+        """Mark a feed as parsed in full such that what was held for it is kept on commit.
+
+        Args:
+            url: The string URL of the feed.
+        """
+        with self.__lock:
+            self.__confirmed.add(url)
+
+    def commit(self):
+        """Keep what was held for each confirmed feed once its articles have been persisted.
+
+        Anything held for feeds which were not confirmed, like those which failed to parse, is
+        dropped.
+        """
+        with self.__lock:
+            for url in self.__confirmed:
+                updates = self.__pending.get(url)
+                if not updates:
+                    continue
+
+                if 'validators' in updates:
+                    self.__validators[url] = updates['validators']
+
+                (body_hash, item_hashes) = self.__contents.get(url, (None, frozenset()))
+                self.__contents[url] = (
+                    updates.get('body_hash', body_hash),
+                    updates.get('item_hashes', item_hashes)
+                )
+
+            self.__pending = {}
+            self.__confirmed = set()
+
+    def discard(self):
+        """Drop everything held since the last commit, like when persisting articles failed."""
+        with self.__lock:
+            self.__pending = {}
+            self.__confirmed = set()
+
+    def record_body(self, url, text):
+        """Hold the hash of a feed's body, reporting if it differs from the last body committed.
+
+        Args:
+            url: The string URL of the feed which was requested.
+            text: The string body of the response.
+        Returns:
+            True if the body changed or the feed was not seen before and False if it is byte
+            identical to the last body committed.
+        """
+        body_hash = hashlib.sha256(text.encode(ENCODING)).hexdigest()
+
+        with self.__lock:
+            last_hash = self.__contents.get(url, (None, frozenset()))[0]
+            self.__pending.setdefault(url, {})['body_hash'] = body_hash
+
+        return body_hash != last_hash
+
+    def get_item_hashes(self, url):
+        """Get the hashes of the items found in the last full parse of a feed committed.
+
+        Args:
+            url: The string URL of the feed.
+        Returns:
+            frozenset of byte string hashes from hash_item which is empty if not yet parsed.
+        """
+        with self.__lock:
+            return self.__contents.get(url, (None, frozenset()))[1]
+
+    def update_item_hashes(self, url, item_hashes):
+        """Hold the hashes of every item found in a feed until the feed is committed.
+
+        Args:
+            url: The string URL of the feed.
+            item_hashes: Iterable over byte string hashes from hash_item.
+        """
+        with self.__lock:
+            self.__pending.setdefault(url, {})['item_hashes'] = frozenset(item_hashes)
+
+    def save(self):
+        """Write the committed validators and hashes back to the database."""
+        with self.__lock:
+            urls = set(self.__validators.keys()) | set(self.__contents.keys())
+            rows = []
+            for url in urls:
+                (etag, last_modified) = self.__validators.get(url, (None, None))
+                (body_hash, item_hashes) = self.__contents.get(url, (None, frozenset()))
+                rows.append((url, etag, last_modified, body_hash, join_item_hashes(item_hashes)))
+
+        cursor = self.__db.cursor()
+        cursor.executemany(UPSERT_SQL, rows)
+        self.__db.commit()
+
+
+def hash_item(item):
+    """Hash the text and attributes of a feed item.
+
+    Args:
+        item: The item_parser.FeedItem to hash.
+    Returns:
+        Byte string of ITEM_HASH_SIZE bytes.
+    """
+    hasher = hashlib.blake2b(digest_size=ITEM_HASH_SIZE)
+
+    fields = item.get_fields()
+    for name in sorted(fields):
+        hasher.update(name.encode(ENCODING))
+        hasher.update(b'\0')
+        hasher.update(fields[name].encode(ENCODING))
+        hasher.update(b'\0')
+
+    attributes = item.get_attributes()
+    for name in sorted(attributes):
+        hasher.update(name.encode(ENCODING))
+        for (attribute, value) in sorted(attributes[name].items()):
+            hasher.update(b'\1')
+            hasher.update(attribute.encode(ENCODING))
+            hasher.update(b'\0')
+            hasher.update(value.encode(ENCODING))
+
+        hasher.update(b'\0')
+
+    return hasher.digest()
+
+
+def join_item_hashes(item_hashes):
+    """Pack item hashes into a single value for the itemHashes column.
+
+    Args:
+        item_hashes: Iterable over byte string hashes from hash_item.
+    Returns:
+        Bytes with the hashes concatenated in sorted order.
+    """
+    return b''.join(sorted(item_hashes))
+
+
+def split_item_hashes(packed):
+    """Unpack the value of the itemHashes column.
+
+    Args:
+        packed: Bytes from join_item_hashes or None.
+    Returns:
+        frozenset of byte string hashes.
+    """
+    if not packed:
+        return frozenset()
+
+    return frozenset(
+        bytes(packed[i:i + ITEM_HASH_SIZE]) for i in range(0, len(packed), ITEM_HASH_SIZE)
+    )
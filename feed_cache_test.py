@@ -0,0 +1,203 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sqlite3
+import unittest
+import unittest.mock
+
+import feed_cache
+import item_parser
+import strategies
+import template_method
+
+
+FEED = '''<?xml version="1.0"?>
+<rss version="2.0">
+    <channel>
+        <item><title>Title 1</title><guid>https://example.com/1</guid></item>
+        <item><title>%s</title><guid>https://example.com/2</guid></item>
+    </channel>
+</rss>
+'''
+
+URL = 'http://example.com/rss'
+ETAG = '"abc"'
+
+
+class FakeServer:
+
+    def __init__(self, text):
+        self.__text = text
+        self.__requests = []
+
+    def get(self, url, timeout=None, headers=None):
+        self.__requests.append(headers or {})
+
+        if headers and headers.get('If-None-Match') == ETAG:
+            return unittest.mock.Mock(status_code=304, headers={}, text='')
+
+        return unittest.mock.Mock(status_code=200, headers={'ETag': ETAG}, text=self.__text)
+
+    def get_requests(self):
+        return self.__requests
+
+
+class BrokenStrategy(strategies.BbcParseStrategy):
+
+    def extract(self, item):
+        raise ValueError('Could not parse item.')
+
+
+class FeedCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__connection = sqlite3.connect(':memory:')
+
+    def test_unknown_url(self):
+        cache = feed_cache.FeedCache(self.__connection)
+        self.assertEqual(cache.get_request_headers('http://example.com/rss'), {})
+
+    def test_update(self):
+        cache = feed_cache.FeedCache(self.__connection)
+        cache.update('http://example.com/rss', {
+            'ETag': '"abc"',
+            'Last-Modified': 'Mon, 20 May 2019 01:02:03 GMT'
+        })
+        self.assertEqual(cache.get_request_headers('http://example.com/rss'), {})
+
+        cache.confirm('http://example.com/rss')
+        cache.commit()
+
+        headers = cache.get_request_headers('http://example.com/rss')
+        self.assertEqual(headers['If-None-Match'], '"abc"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 20 May 2019 01:02:03 GMT')
+
+    def test_save(self):
+        cache = feed_cache.FeedCache(self.__connection)
+        cache.update('http://example.com/rss', {'ETag': '"abc"'})
+        cache.confirm('http://example.com/rss')
+        cache.commit()
+        cache.save()
+
+        cache.update('http://example.com/rss', {'ETag': '"def"'})
+        cache.confirm('http://example.com/rss')
+        cache.commit()
+        cache.save()
+
+        reloaded = feed_cache.FeedCache(self.__connection)
+        headers = reloaded.get_request_headers('http://example.com/rss')
+        self.assertEqual(headers, {'If-None-Match': '"def"'})
+
+    def test_unconfirmed_dropped(self):
+        cache = feed_cache.FeedCache(self.__connection)
+        cache.update('http://example.com/rss', {'ETag': '"abc"'})
+        cache.update('http://example.com/other', {'ETag': '"def"'})
+        cache.confirm('http://example.com/other')
+        cache.discard()
+        cache.commit()
+        cache.save()
+
+        reloaded = feed_cache.FeedCache(self.__connection)
+        self.assertEqual(reloaded.get_request_headers('http://example.com/rss'), {})
+        self.assertEqual(reloaded.get_request_headers('http://example.com/other'), {})
+
+    def test_not_modified(self):
+        server = FakeServer(FEED % 'Title 2')
+        cache = feed_cache.FeedCache(self.__connection)
+        strategy = strategies.BbcParseStrategy()
+
+        articles = list(template_method.parse(URL, strategy, session=server, cache=cache))
+        self.assertEqual(len(articles), 2)
+        cache.commit()
+        cache.save()
+
+        reloaded = feed_cache.FeedCache(self.__connection)
+        articles = list(template_method.parse(URL, strategy, session=server, cache=reloaded))
+        self.assertEqual(articles, [])
+        self.assertEqual(server.get_requests()[1], {'If-None-Match': ETAG})
+
+    def test_not_modified_after_failed_parse(self):
+        server = FakeServer(FEED % 'Title 2')
+        cache = feed_cache.FeedCache(self.__connection)
+
+        with self.assertRaises(ValueError):
+            list(template_method.parse(URL, BrokenStrategy(), session=server, cache=cache))
+
+        cache.commit()
+        cache.save()
+
+        reloaded = feed_cache.FeedCache(self.__connection)
+        strategy = strategies.BbcParseStrategy()
+        articles = list(template_method.parse(URL, strategy, session=server, cache=reloaded))
+        self.assertEqual(server.get_requests()[1], {})
+        self.assertEqual(len(articles), 2)
+
+    def test_identical_body_after_failed_parse(self):
+        server = FakeServer(FEED % 'Title 2')
+        cache = feed_cache.FeedCache(self.__connection)
+
+        with self.assertRaises(ValueError):
+            list(template_method.parse(URL, BrokenStrategy(), session=server, cache=cache))
+
+        cache.commit()
+        strategy = strategies.BbcParseStrategy()
+        text = template_method.fetch(URL, session=FakeServer(FEED % 'Title 2'), cache=cache)
+        self.assertEqual(text, FEED % 'Title 2')
+
+        articles = template_method.parse_text(text, strategy, url=URL, cache=cache)
+        self.assertEqual(len(list(articles)), 2)
+
+    def test_record_body(self):
+        cache = feed_cache.FeedCache(self.__connection)
+        self.assertTrue(cache.record_body('http://example.com/rss', FEED % 'Title 2'))
+        self.assertTrue(cache.record_body('http://example.com/rss', FEED % 'Title 2'))
+        cache.confirm('http://example.com/rss')
+        cache.commit()
+        cache.save()
+
+        reloaded = feed_cache.FeedCache(self.__connection)
+        self.assertFalse(reloaded.record_body('http://example.com/rss', FEED % 'Title 2'))
+        self.assertTrue(reloaded.record_body('http://example.com/rss', FEED % 'Title 3'))
+
+    def test_item_hashes(self):
+        cache = feed_cache.FeedCache(self.__connection)
+        items = [item_parser.FeedItem({'title': 'Title'}), item_parser.FeedItem({'title': 'Other'})]
+        hashes = [feed_cache.hash_item(item) for item in items]
+        self.assertNotEqual(hashes[0], hashes[1])
+
+        cache.update_item_hashes('http://example.com/rss', hashes)
+        self.assertEqual(cache.get_item_hashes('http://example.com/rss'), frozenset())
+        cache.confirm('http://example.com/rss')
+        cache.commit()
+        cache.save()
+
+        reloaded = feed_cache.FeedCache(self.__connection)
+        self.assertEqual(reloaded.get_item_hashes('http://example.com/rss'), frozenset(hashes))
+
+    def test_parse_changed_items(self):
+        cache = feed_cache.FeedCache(self.__connection)
+        strategy = strategies.BbcParseStrategy()
+        url = 'http://example.com/rss'
+
+        articles = template_method.parse_text(FEED % 'Title 2', strategy, url=url, cache=cache)
+        self.assertEqual([article.get_title() for article in articles], ['Title 1', 'Title 2'])
+        cache.confirm(url)
+        cache.commit()
+
+        articles = template_method.parse_text(FEED % 'Title 3', strategy, url=url, cache=cache)
+        self.assertEqual([article.get_title() for article in articles], ['Title 3'])
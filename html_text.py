@@ -0,0 +1,68 @@
+"""Lightweight extraction of plain text from HTML snippets found in feeds.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import html
+import re
+
+
+COMMENT_PATTERN = re.compile(r'<!--.*?(?:-->|$)', re.DOTALL)
+
+HIDDEN_PATTERN = re.compile(
+    r'<(script|style|noscript|template)\b[^>]*>.*?(?:</\1\s*>|$)',
+    re.DOTALL | re.IGNORECASE
+)
+
+BLOCK_TAGS = [
+    'address', 'article', 'aside', 'blockquote', 'br', 'dd', 'div', 'dl', 'dt', 'figcaption',
+    'figure', 'footer', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'ol', 'p', 'pre',
+    'section', 'table', 'td', 'th', 'tr', 'ul'
+]
+
+BLOCK_TAG_PATTERN = re.compile(
+    r'</?(?:%s)\b[^>]*>' % '|'.join(BLOCK_TAGS + [tag.upper() for tag in BLOCK_TAGS])
+)
+
+TAG_PATTERN = re.compile(r'</?[A-Za-z][^>]*>|<![^>]*>|<\?[^>]*>')
+
+
+def get_text(markup):
+    """Get the text a reader would see in a snippet of HTML.
+
+    Comments, scripts and styles are removed, block level tags separate their text by a space,
+    entities are decoded and runs of whitespace are collapsed into single spaces. Block level tags
+    are recognized in lower or upper case, which is much faster to match than ignoring case.
+
+    Args:
+        markup: The string HTML to convert.
+    Returns:
+        String plain text.
+    """
+    if '<' in markup:
+        markup = COMMENT_PATTERN.sub('', markup)
+        markup = HIDDEN_PATTERN.sub(' ', markup)
+        markup = BLOCK_TAG_PATTERN.sub(' ', markup)
+        markup = TAG_PATTERN.sub('', markup)
+
+    if '&' in markup:
+        markup = html.unescape(markup)
+
+    return ' '.join(markup.split())
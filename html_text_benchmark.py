@@ -0,0 +1,98 @@
+"""Benchmark of html_text against the BeautifulSoup text extraction it replaced.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import timeit
+
+import bs4
+
+import html_text
+
+
+PARAGRAPH = (
+    '<p>The <a href="https://example.com/story">committee</a> said on <em>Tuesday</em> that '
+    'it would &ldquo;revisit&rdquo; the proposal &mdash; a move critics called '
+    '<strong>long overdue</strong>.</p>\n'
+)
+
+SMALL_HTML = '<p>A short description &amp; a <a href="https://example.com">link</a>.</p>'
+
+LARGE_HTML = (
+    '<figure><img src="https://example.com/a.jpg" alt="" /><figcaption>Caption</figcaption>'
+    '</figure>' + PARAGRAPH * 60 + '<script>window.embed = "<p>";</script>'
+)
+
+
+def extract_with_soup(markup):
+    """Extract text as the strategies did before html_text.
+
+    Args:
+        markup: The string HTML to convert.
+    Returns:
+        String text from BeautifulSoup.
+    """
+    return bs4.BeautifulSoup(markup, 'lxml').get_text()
+
+
+def measure(function, markup, number):
+    """Measure how many snippets per second a text extractor handles.
+
+    Args:
+        function: The extractor taking a string of HTML.
+        markup: The string HTML to convert.
+        number: The number of times to run the extractor.
+    Returns:
+        Float snippets converted per second.
+    """
+    seconds = timeit.timeit(lambda: function(markup), number=number)
+    return number / seconds
+
+
+def run_benchmarks(number=200):
+    """Compare html_text to BeautifulSoup on small and large snippets.
+
+    Args:
+        number: The number of times to convert each snippet per extractor.
+    Returns:
+        List of dicts with the name of each benchmark and its items_per_second.
+    """
+    cases = [('small', SMALL_HTML), ('large', LARGE_HTML)]
+    extractors = [('soup', extract_with_soup), ('html_text', html_text.get_text)]
+
+    results = []
+    for (case_name, markup) in cases:
+        for (extractor_name, function) in extractors:
+            results.append({
+                'name': 'html_text.%s.%s' % (case_name, extractor_name),
+                'items_per_second': measure(function, markup, number)
+            })
+
+    return results
+
+
+def main():
+    """Execute this script from the command line."""
+    for result in run_benchmarks():
+        print('%-32s %12.1f items/s' % (result['name'], result['items_per_second']))
+
+
+if __name__ == '__main__':
+    main()
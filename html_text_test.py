@@ -0,0 +1,39 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import unittest
+
+import html_text
+
+
+class HtmlTextTest(unittest.TestCase):
+
+    def test_plain(self):
+        self.assertEqual(html_text.get_text('  Test\n description '), 'Test description')
+
+    def test_tags(self):
+        text = html_text.get_text('<p>Hello <b>world</b>.</p><P>Next<br/>line</P>')
+        self.assertEqual(text, 'Hello world. Next line')
+
+    def test_entities(self):
+        text = html_text.get_text('AT&amp;T &ldquo;quoted&rdquo;&nbsp;text &#8212; a &lt; b')
+        self.assertEqual(text, 'AT&T “quoted” text — a < b')
+
+    def test_hidden(self):
+        markup = '<!-- comment --><style>p { color: red; }</style><script>var a = "<p>";</script>x'
+        self.assertEqual(html_text.get_text(markup), 'x')
@@ -0,0 +1,125 @@
+"""Shared HTTP session with pooled, compressed and retried feed downloads.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import threading
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class HttpSession:
+    """Session keeping connections alive per host which records the bytes received per URL."""
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE, retries=DEFAULT_RETRIES,
+        backoff_factor=DEFAULT_BACKOFF_FACTOR):
+        """Create a new session.
+
+        Args:
+            pool_connections: The number of hosts for which connection pools are kept.
+            pool_maxsize: The number of connections kept alive per host. This should be at least
+                the number of workers which may request from the same host at once.
+            retries: The number of times a failed connection or retryable status is retried.
+            backoff_factor: Multiplier in seconds for exponential backoff between retries.
+        """
+        # Deferred so that the asyncio crawl and tooling which never open a session skip loading
+        # requests and its dependencies.
+        import requests
+        import requests.adapters
+        import urllib3.util.request
+        import urllib3.util.retry
+
+        retry = urllib3.util.retry.Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            raise_on_status=False
+        )
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+        self.__session = requests.Session()
+        self.__session.mount('http://', adapter)
+        self.__session.mount('https://', adapter)
+        self.__session.headers['Accept-Encoding'] = urllib3.util.request.ACCEPT_ENCODING
+
+        self.__bytes_received = {}
+        self.__lock = threading.Lock()
+
+    def get(self, url, timeout=None, headers=None):
+        """Request a URL through the pooled connections.
+
+        Args:
+            url: The string URL to request.
+            timeout: Optional number of seconds to wait on connecting to or reading from the
+                server before giving up, applied to each attempt including retries.
+            headers: Optional dict of additional headers to send.
+        Returns:
+            The requests.Response with its content already read.
+        """
+        response = self.__session.get(url, timeout=timeout, headers=headers)
+        self.__record(url, get_wire_size(response))
+        return response
+
+    def get_bytes_received(self):
+        """Get the number of bytes received so far for each URL requested.
+
+        Returns:
+            Dict from string URL to integer number of bytes received on the wire.
+        """
+        with self.__lock:
+            return dict(self.__bytes_received)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.__session.close()
+
+    def __record(self, url, num_bytes):
+        with self.__lock:
+            self.__bytes_received[url] = self.__bytes_received.get(url, 0) + num_bytes
+
+
+def get_wire_size(response):
+    """Estimate the number of bytes in a response body as sent over the wire.
+
+    Args:
+        response: The requests.Response whose content has been read.
+    Returns:
+        The compressed size of the body if known. Chunked responses without a Content-Length fall
+        back to the decoded size.
+    """
+    bytes_read = response.raw.tell() if response.raw else 0
+    if bytes_read:
+        return bytes_read
+
+    content_length = response.headers.get('Content-Length')
+    if content_length and content_length.isdigit():
+        return int(content_length)
+
+    return len(response.content)
@@ -0,0 +1,71 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import gzip
+import http.server
+import threading
+import unittest
+
+import http_session
+
+
+BODY = b'<rss><channel>' + b'<item><title>Test title</title></item>' * 100 + b'</channel></rss>'
+
+
+class GzipHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        compressed = gzip.compress(BODY)
+        self.send_response(200)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(compressed)))
+        self.end_headers()
+        self.wfile.write(compressed)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HttpSessionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), GzipHandler)
+        self.__thread = threading.Thread(target=self.__server.serve_forever)
+        self.__thread.start()
+        self.__url = 'http://127.0.0.1:%d/feed' % self.__server.server_address[1]
+        self.__session = http_session.HttpSession(retries=0)
+
+    def tearDown(self):
+        self.__session.close()
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+
+    def test_get_decompresses(self):
+        response = self.__session.get(self.__url, timeout=5)
+        self.assertEqual(response.content, BODY)
+
+    def test_get_bytes_received(self):
+        self.__session.get(self.__url, timeout=5)
+        self.__session.get(self.__url, timeout=5)
+
+        bytes_received = self.__session.get_bytes_received()[self.__url]
+        self.assertEqual(bytes_received, 2 * len(gzip.compress(BODY)))
+        self.assertTrue(bytes_received < len(BODY))
@@ -0,0 +1,314 @@
+"""Backends parsing RSS and Atom feeds into lightweight item records.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import html.entities
+import re
+
+import lxml.etree
+
+import util
+
+
+CHUNK_SIZE = 65536
+
+XML_ENTITIES = frozenset(['amp', 'lt', 'gt', 'quot', 'apos'])
+
+ENTITY_PATTERN = re.compile(
+    r'(<!\[CDATA\[.*?\]\]>)|&(?:(#[0-9]+|#[xX][0-9a-fA-F]+|[A-Za-z][A-Za-z0-9]*);)?',
+    re.DOTALL
+)
+
+
+class FeedItem:
+    """Record of the text and attributes found within a single RSS item or Atom entry.
+
+    Fields are named by their lowercase tag including any namespace prefix like dc:creator. Tags
+    nested below the item's children are named by their path like author/name. Only the first
+    occurrence of each name is kept.
+    """
+
+    __slots__ = ('__fields', '__attributes')
+
+    def __init__(self, fields, attributes=None):
+        """Create a new item record.
+
+        Args:
+            fields: Dict from field name to the string text found within that tag.
+            attributes: Optional dict from field name to a dict of that tag's attributes.
+        """
+        self.__fields = fields
+        self.__attributes = attributes if attributes else {}
+
+    def get_text(self, name):
+        """Get the text found within a tag.
+
+        Args:
+            name: The name of the field like title, dc:creator or author/name.
+        Returns:
+            The string text of the tag which is empty if the tag had no text or None if the tag
+            was not found.
+        """
+        return self.__fields.get(name)
+
+    def get_attribute(self, name, attribute):
+        """Get an attribute of a tag.
+
+        Args:
+            name: The name of the field like atom:link.
+            attribute: The name of the attribute like href.
+        Returns:
+            The string attribute value or None if the tag or attribute was not found.
+        """
+        attributes = self.__attributes.get(name)
+        return attributes.get(attribute) if attributes else None
+
+    def has(self, name):
+        """Determine if a tag was found in the item.
+
+        Args:
+            name: The name of the field.
+        Returns:
+            True if the tag was found and False otherwise.
+        """
+        return name in self.__fields
+
+    def get_fields(self):
+        """Get the text of every tag found.
+
+        Returns:
+            Dict from field name to string text.
+        """
+        return self.__fields
+
+    def get_attributes(self):
+        """Get the attributes of every tag found with attributes.
+
+        Returns:
+            Dict from field name to a dict of attribute name to string value.
+        """
+        return self.__attributes
+
+
+class XmlBackend:
+    """Backend incrementally parsing well formed feeds with lxml's pull parser.
+
+    Elements are discarded as soon as their item is recorded so memory stays bounded by the
+    largest item rather than the whole feed. Feeds which are not well formed XML are handed to a
+    fallback backend, picking up after the items already produced.
+    """
+
+    def __init__(self, fallback=None):
+        """Create a new XML backend.
+
+        Args:
+            fallback: Optional backend used for feeds which are not well formed. If not given,
+                malformed feeds raise lxml.etree.XMLSyntaxError.
+        """
+        self.__fallback = fallback
+
+    def iter_items(self, text, item_tag):
+        """Iterate over the items in a feed as they are parsed.
+
+        Args:
+            text: The string contents of the feed.
+            item_tag: The tag of each item like item for RSS or entry for Atom.
+        Returns:
+            Iterable over FeedItem.
+        """
+        parser = lxml.etree.XMLPullParser(
+            events=('end',),
+            tag=('{*}' + item_tag,),
+            huge_tree=True
+        )
+        text = escape_entities(text)
+        count = 0
+
+        try:
+            for start in range(0, len(text), CHUNK_SIZE):
+                parser.feed(text[start:start + CHUNK_SIZE])
+                for item in self.__read_items(parser):
+                    count += 1
+                    yield item
+
+            parser.close()
+            for item in self.__read_items(parser):
+                count += 1
+                yield item
+        except lxml.etree.XMLSyntaxError:
+            if not self.__fallback:
+                raise
+
+            fallback_items = self.__fallback.iter_items(text, item_tag)
+            for item in util.skip(fallback_items, count):
+                yield item
+
+    def __read_items(self, parser):
+        for (event, element) in parser.read_events():
+            fields = {}
+            attributes = {}
+            record_children(element, '', fields, attributes)
+            yield FeedItem(fields, attributes)
+
+            element.clear()
+            while element.getprevious() is not None:
+                del element.getparent()[0]
+
+
+class SoupBackend:
+    """Backend building a full BeautifulSoup tree, tolerant of badly formed feeds.
+
+    BeautifulSoup is only imported once a feed is actually parsed through this backend.
+    """
+
+    def __init__(self, features):
+        """Create a new BeautifulSoup backend.
+
+        Args:
+            features: The parser used by BeautifulSoup like lxml or html.parser.
+        """
+        self.__features = features
+
+    def iter_items(self, text, item_tag):
+        """Iterate over the items in a feed.
+
+        Args:
+            text: The string contents of the feed.
+            item_tag: The tag of each item like item for RSS or entry for Atom.
+        Returns:
+            Iterable over FeedItem.
+        """
+        import bs4
+        soup = bs4.BeautifulSoup(text, self.__features)
+        for item in soup.find_all(item_tag):
+            yield soup_to_item(item)
+
+
+def record_children(element, prefix, fields, attributes):
+    """Record the text and attributes of the tags below an lxml element.
+
+    Args:
+        element: The lxml.etree element whose children should be recorded.
+        prefix: The path to the element like author/ or empty for the item itself.
+        fields: Dict into which text should be recorded by field name.
+        attributes: Dict into which attributes should be recorded by field name.
+    """
+    for child in element:
+        tag = child.tag
+        if not isinstance(tag, str):
+            continue
+
+        if tag[0] == '{':
+            local_name = tag[tag.index('}') + 1:]
+            tag = child.prefix + ':' + local_name if child.prefix else local_name
+
+        name = prefix + tag.lower()
+        if name in fields:
+            continue
+
+        fields[name] = ''.join(child.itertext())
+        if child.attrib:
+            attributes[name] = dict(child.attrib)
+
+        if len(child):
+            record_children(child, name + '/', fields, attributes)
+
+
+def soup_to_item(item):
+    """Record the text and attributes of the tags below a BeautifulSoup item.
+
+    Args:
+        item: The bs4.element.Tag for the item.
+    Returns:
+        Newly created FeedItem.
+    """
+    fields = {}
+    attributes = {}
+    record_soup_children(item, '', fields, attributes)
+
+    if fields.get('link') == '':
+        trailing_link = util.find_trailing_link(item)
+        if trailing_link:
+            fields['link'] = trailing_link
+
+    return FeedItem(fields, attributes)
+
+
+def record_soup_children(tag, prefix, fields, attributes):
+    """Record the text and attributes of the tags below a BeautifulSoup tag.
+
+    Args:
+        tag: The bs4.element.Tag whose children should be recorded.
+        prefix: The path to the tag like author/ or empty for the item itself.
+        fields: Dict into which text should be recorded by field name.
+        attributes: Dict into which attributes should be recorded by field name.
+    """
+    import bs4.element
+
+    for child in tag.children:
+        if not isinstance(child, bs4.element.Tag):
+            continue
+
+        name = prefix + child.name.lower()
+        if name in fields:
+            continue
+
+        fields[name] = child.get_text()
+        if child.attrs:
+            attributes[name] = dict(child.attrs)
+
+        record_soup_children(child, name + '/', fields, attributes)
+
+
+def escape_entities(text):
+    """Make HTML entities and stray ampersands acceptable to an XML parser.
+
+    Named HTML entities are rewritten as numeric character references and ampersands which do
+    not start an entity are escaped. CDATA sections are left untouched.
+
+    Args:
+        text: The string contents of the feed.
+    Returns:
+        The feed contents with only XML entities remaining.
+    """
+    return ENTITY_PATTERN.sub(replace_entity, text)
+
+
+def replace_entity(match):
+    """Rewrite a single match of ENTITY_PATTERN.
+
+    Args:
+        match: The re.Match for a CDATA section, entity or ampersand.
+    Returns:
+        String replacement for the match.
+    """
+    if match.group(1):
+        return match.group(1)
+
+    name = match.group(2)
+    if name is None:
+        return '&amp;'
+    elif name[0] == '#' or name in XML_ENTITIES:
+        return match.group(0)
+    elif name in html.entities.name2codepoint:
+        return '&#%d;' % html.entities.name2codepoint[name]
+    else:
+        return '&amp;' + name + ';'
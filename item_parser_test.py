@@ -0,0 +1,79 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import unittest
+
+import lxml.etree
+
+import item_parser
+
+
+WELL_FORMED = '''<?xml version="1.0" encoding="UTF-8"?>
+<rss xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel>
+    <item>
+      <title>Title 1 &mdash; AT&T</title>
+      <description><![CDATA[<p>Description &amp; 1</p>]]></description>
+      <dc:creator>Author 1</dc:creator>
+    </item>
+    <item>
+      <title>Title 2</title>
+      <author><name>Author 2</name></author>
+    </item>
+  </channel>
+</rss>
+'''
+
+MALFORMED = '''<rss>
+  <channel>
+    <item><title>Title 1</title></item>
+    <item><title>Title 2</title><link href="a<b"/></item>
+    <item><title>Title 3</title></item>
+  </channel>
+</rss>
+'''
+
+
+class ItemParserTest(unittest.TestCase):
+
+    def test_xml_backend(self):
+        items = list(item_parser.XmlBackend().iter_items(WELL_FORMED, 'item'))
+        self.assertEqual(len(items), 2)
+
+        self.assertEqual(items[0].get_text('title'), 'Title 1 — AT&T')
+        self.assertEqual(items[0].get_text('description'), '<p>Description &amp; 1</p>')
+        self.assertEqual(items[0].get_text('dc:creator'), 'Author 1')
+        self.assertEqual(items[0].get_text('link'), None)
+
+        self.assertEqual(items[1].get_text('author/name'), 'Author 2')
+
+    def test_xml_backend_fallback(self):
+        backend = item_parser.XmlBackend(fallback=item_parser.SoupBackend('html.parser'))
+        items = list(backend.iter_items(MALFORMED, 'item'))
+        titles = [item.get_text('title') for item in items]
+        self.assertEqual(titles, ['Title 1', 'Title 2', 'Title 3'])
+
+    def test_xml_backend_no_fallback(self):
+        with self.assertRaises(lxml.etree.XMLSyntaxError):
+            list(item_parser.XmlBackend().iter_items(MALFORMED, 'item'))
+
+    def test_soup_backend(self):
+        items = list(item_parser.SoupBackend('lxml').iter_items(WELL_FORMED, 'item'))
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items[0].get_text('dc:creator'), 'Author 1')
+        self.assertEqual(items[1].get_text('author/name'), 'Author 2')
@@ -0,0 +1,591 @@
+"""Latency histograms and counters recorded per source and stage while crawling.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+
+
+MIN_SECONDS = 0.000001
+BUCKETS_PER_DOUBLING = 4
+NUM_BUCKETS = 40 * BUCKETS_PER_DOUBLING
+PERCENTILES = (0.5, 0.95, 0.99)
+
+SUMMARY_FORMAT = (
+    '    %-18s %8d runs %11.1f ms total %9.3f ms mean %9.3f ms p50 %9.3f ms p95 %9.3f ms max'
+)
+
+
+class Histogram:
+    """Distribution of latencies in logarithmic buckets of constant relative width.
+
+    Each bucket spans a quarter of a doubling such that percentiles are reported within about 19%
+    of the exact value while recording takes constant time and memory.
+    """
+
+    def __init__(self):
+        """Create a new empty histogram."""
+        self.__buckets = {}
+        self.__count = 0
+        self.__total = 0
+        self.__min = None
+        self.__max = None
+
+    def record(self, seconds):
+        """Add an observation.
+
+        Args:
+            seconds: The float latency observed.
+        """
+        bucket = get_bucket(seconds)
+        self.__buckets[bucket] = self.__buckets.get(bucket, 0) + 1
+        self.__count += 1
+        self.__total += seconds
+        self.__min = seconds if self.__min is None else min(self.__min, seconds)
+        self.__max = seconds if self.__max is None else max(self.__max, seconds)
+
+    def merge(self, other):
+        """Add every observation from another histogram.
+
+        Args:
+            other: The Histogram whose observations should be added.
+        """
+        for (bucket, count) in other.get_buckets().items():
+            self.__buckets[bucket] = self.__buckets.get(bucket, 0) + count
+
+        if other.get_count() == 0:
+            return
+
+        self.__count += other.get_count()
+        self.__total += other.get_total()
+        self.__min = other.get_min() if self.__min is None else min(self.__min, other.get_min())
+        self.__max = other.get_max() if self.__max is None else max(self.__max, other.get_max())
+
+    def get_buckets(self):
+        """Get the number of observations in each bucket.
+
+        Returns:
+            Dict from integer bucket index from get_bucket to count.
+        """
+        return dict(self.__buckets)
+
+    def get_count(self):
+        """Get the number of observations.
+
+        Returns:
+            Integer count of calls to record.
+        """
+        return self.__count
+
+    def get_total(self):
+        """Get the sum of all observations.
+
+        Returns:
+            Float total seconds.
+        """
+        return self.__total
+
+    def get_min(self):
+        """Get the smallest observation.
+
+        Returns:
+            Float seconds or None if empty.
+        """
+        return self.__min
+
+    def get_max(self):
+        """Get the largest observation.
+
+        Returns:
+            Float seconds or None if empty.
+        """
+        return self.__max
+
+    def get_mean(self):
+        """Get the average observation.
+
+        Returns:
+            Float seconds or None if empty.
+        """
+        return self.__total / self.__count if self.__count else None
+
+    def get_percentile(self, fraction):
+        """Estimate the latency below which a given fraction of observations fall.
+
+        Args:
+            fraction: The percentile as a fraction like 0.95.
+        Returns:
+            Float seconds at the upper bound of the bucket holding the percentile, never more
+            than the largest observation, or None if empty.
+        """
+        if not self.__count:
+            return None
+
+        target = fraction * self.__count
+        seen = 0
+        for bucket in sorted(self.__buckets):
+            seen += self.__buckets[bucket]
+            if seen >= target:
+                return min(get_upper_bound(bucket), self.__max)
+
+        return self.__max
+
+    def to_dict(self):
+        """Describe the histogram with primitives.
+
+        Returns:
+            Dict ready to be written as JSON with the count, total, min, max, mean, percentiles
+            and the upper bound and count of each non-empty bucket.
+        """
+        description = {
+            'count': self.__count,
+            'total': self.__total,
+            'min': self.__min,
+            'max': self.__max,
+            'mean': self.get_mean()
+        }
+
+        for fraction in PERCENTILES:
+            description['p%d' % round(fraction * 100)] = self.get_percentile(fraction)
+
+        description['buckets'] = [
+            [get_upper_bound(bucket), self.__buckets[bucket]] for bucket in sorted(self.__buckets)
+        ]
+        return description
+
+
+class Metrics:
+    """Latency histograms and counters for each source and stage of a crawl.
+
+    Sources are keyed by the URL of their feed while work shared across sources, like writing to
+    the database, has its own key. Stages are named after the work timed like fetch, parse or
+    extract. Safe to use from many worker threads.
+    """
+
+    def __init__(self, clock=time.perf_counter, detailed=False):
+        """Create a new empty set of metrics.
+
+        Args:
+            clock: Function returning the current time in float seconds, used to time stages.
+            detailed: Flag indicating if the extraction of every item should be timed, which
+                adds a histogram sample per item on top of the per feed stages.
+        """
+        self.__clock = clock
+        self.__detailed = detailed
+        self.__lock = threading.Lock()
+        self.__histograms = {}
+        self.__counters = {}
+
+    def record(self, key, stage, seconds):
+        """Record the latency of a single run of a stage.
+
+        Args:
+            key: The URL of the source or name of work shared across sources.
+            stage: The name of the stage.
+            seconds: The float latency observed.
+        """
+        with self.__lock:
+            histogram = self.__histograms.get((key, stage))
+            if histogram is None:
+                histogram = Histogram()
+                self.__histograms[(key, stage)] = histogram
+
+            histogram.record(seconds)
+
+    def increment(self, key, counter, amount=1):
+        """Add to a counter like bytes, items or errors.
+
+        Args:
+            key: The URL of the source or name of work shared across sources.
+            counter: The name of the counter.
+            amount: The number to add.
+        """
+        with self.__lock:
+            self.__counters[(key, counter)] = self.__counters.get((key, counter), 0) + amount
+
+    @contextlib.contextmanager
+    def time(self, key, stage):
+        """Time the body of a with statement as a run of a stage.
+
+        Runs ending in an exception are recorded as well.
+
+        Args:
+            key: The URL of the source or name of work shared across sources.
+            stage: The name of the stage.
+        """
+        start = self.__clock()
+        try:
+            yield
+        finally:
+            self.record(key, stage, self.__clock() - start)
+
+    def time_iter(self, key, stage, iterable, counter=None):
+        """Time the production of every value of a lazy iterable as a single run of a stage.
+
+        Only the time spent producing values is recorded, excluding time spent by the consumer
+        between values.
+
+        Args:
+            key: The URL of the source or name of work shared across sources.
+            stage: The name of the stage.
+            iterable: The iterable to time.
+            counter: Optional name of a counter to which each value produced is added.
+        Returns:
+            Iterable over the same values.
+        """
+        clock = self.__clock
+        iterator = iter(iterable)
+        elapsed = 0
+        count = 0
+
+        try:
+            while True:
+                start = clock()
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += clock() - start
+
+                count += 1
+                yield value
+        finally:
+            self.record(key, stage, elapsed)
+            if counter:
+                self.increment(key, counter, count)
+
+    def count_iter(self, key, counter, iterable):
+        """Count the values of a lazy iterable as they are produced.
+
+        Args:
+            key: The URL of the source or name of work shared across sources.
+            counter: The name of the counter to which each value is added.
+            iterable: The iterable to count.
+        Returns:
+            Iterable over the same values.
+        """
+        count = 0
+        try:
+            for value in iterable:
+                count += 1
+                yield value
+        finally:
+            self.increment(key, counter, count)
+
+    def instrument(self, key, strategy):
+        """Wrap a parse strategy such that its parsing and, if detailed, extraction are timed.
+
+        Args:
+            key: The URL of the source parsed by the strategy.
+            strategy: The ParseStrategy to wrap.
+        Returns:
+            InstrumentedStrategy recording into these metrics.
+        """
+        return InstrumentedStrategy(strategy, self, key, self.__clock, self.__detailed)
+
+    def get_detailed(self):
+        """Determine if the extraction of every item is timed.
+
+        Returns:
+            True if items are timed individually and False if only per feed stages are.
+        """
+        return self.__detailed
+
+    def get_histogram(self, key, stage):
+        """Get the latencies recorded for a stage.
+
+        Args:
+            key: The URL of the source or name of work shared across sources.
+            stage: The name of the stage.
+        Returns:
+            Histogram or None if the stage was not run for the source.
+        """
+        with self.__lock:
+            return self.__histograms.get((key, stage))
+
+    def get_counter(self, key, counter):
+        """Get the value of a counter.
+
+        Args:
+            key: The URL of the source or name of work shared across sources.
+            counter: The name of the counter.
+        Returns:
+            The number counted which is zero if never incremented.
+        """
+        with self.__lock:
+            return self.__counters.get((key, counter), 0)
+
+    def get_keys(self):
+        """Get every source for which something was recorded.
+
+        Returns:
+            Sorted list of keys.
+        """
+        with self.__lock:
+            keys = set(key for (key, name) in self.__histograms)
+            keys.update(key for (key, name) in self.__counters)
+
+        return sorted(keys)
+
+    def get_totals(self):
+        """Combine the latencies of each stage across all sources.
+
+        Returns:
+            Dict from stage name to a new Histogram merging every source's observations.
+        """
+        totals = {}
+        with self.__lock:
+            for ((key, stage), histogram) in self.__histograms.items():
+                totals.setdefault(stage, Histogram()).merge(histogram)
+
+        return totals
+
+    def to_dict(self):
+        """Describe every histogram and counter with primitives.
+
+        Returns:
+            Dict ready to be written as JSON with the stages and counters of each source and the
+            stages combined across sources.
+        """
+        with self.__lock:
+            histograms = dict(self.__histograms)
+            counters = dict(self.__counters)
+
+        description = {}
+        for ((key, stage), histogram) in histograms.items():
+            entry = description.setdefault(key, {'stages': {}, 'counters': {}})
+            entry['stages'][stage] = histogram.to_dict()
+
+        for ((key, counter), value) in counters.items():
+            entry = description.setdefault(key, {'stages': {}, 'counters': {}})
+            entry['counters'][counter] = value
+
+        return {
+            'sources': description,
+            'totals': dict(
+                (stage, histogram.to_dict()) for (stage, histogram) in self.get_totals().items()
+            )
+        }
+
+    def save(self, path):
+        """Write the metrics to disk as JSON.
+
+        Args:
+            path: The file path at which the metrics should be saved.
+        """
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+
+        os.replace(temp_path, path)
+
+    def format_summary(self):
+        """Describe the metrics for people reading the end of a crawl's output.
+
+        Returns:
+            Multi-line string with the latency of each stage combined across sources, slowest
+            first, followed by each source's stages and counters.
+        """
+        lines = ['Stage totals:']
+        totals = sorted(
+            self.get_totals().items(),
+            key=lambda entry: entry[1].get_total(),
+            reverse=True
+        )
+        for (stage, histogram) in totals:
+            lines.append(format_histogram(stage, histogram))
+
+        for key in self.get_keys():
+            lines.append('')
+            lines.append('%s:' % key)
+
+            with self.__lock:
+                stages = sorted(
+                    (stage, histogram) for ((name, stage), histogram) in self.__histograms.items()
+                    if name == key
+                )
+                counters = sorted(
+                    (counter, value) for ((name, counter), value) in self.__counters.items()
+                    if name == key
+                )
+
+            for (stage, histogram) in stages:
+                lines.append(format_histogram(stage, histogram))
+
+            if counters:
+                lines.append('    ' + ', '.join('%s=%d' % entry for entry in counters))
+
+        return '\n'.join(lines)
+
+
+class InstrumentedStrategy:
+    """Parse strategy wrapper timing the parsing of items and, if detailed, their extraction.
+
+    Parsing a feed is recorded as one run of the parse stage with the number of items counted.
+    When detailed, each call to extract is recorded as a run of the extract stage, timing the
+    strategy's own single pass extraction, and each field pulled from an item, whether by extract
+    or a getter like get_link when skipping seen articles, as a run of a stage named after its
+    getter. This shows date parsing in get_publish_date, HTML stripping in get_description and
+    link fallbacks in get_link separately. Strategies offering with_field_hook, like
+    strategies.SpecParseStrategy, have each compiled field extractor timed. Others have their
+    getters timed. Without detailed, every call goes straight to the wrapped strategy.
+    """
+
+    def __init__(self, strategy, metrics, key, clock=time.perf_counter, detailed=False):
+        """Wrap a strategy.
+
+        Args:
+            strategy: The ParseStrategy to wrap.
+            metrics: The Metrics into which timings are recorded.
+            key: The URL of the source parsed by the strategy.
+            clock: Function returning the current time in float seconds.
+            detailed: Flag indicating if extract and the getters should be timed.
+        """
+        self.__strategy = strategy
+        self.__metrics = metrics
+        self.__key = key
+        self.__clock = clock
+        self.__detailed = detailed
+        self.__hooked = detailed and hasattr(strategy, 'with_field_hook')
+        self.__target = strategy.with_field_hook(self.__time_field) if self.__hooked else strategy
+
+    def get_strategy(self):
+        """Get the wrapped strategy.
+
+        Returns:
+            The ParseStrategy being timed.
+        """
+        return self.__strategy
+
+    def get_source(self):
+        return self.__strategy.get_source()
+
+    def get_source_feed(self):
+        return self.__strategy.get_source_feed()
+
+    def iter_items(self, text):
+        items = self.__strategy.iter_items(text)
+        return self.__metrics.time_iter(self.__key, 'parse', items, counter='items')
+
+    def get_items(self, text):
+        return list(self.iter_items(text))
+
+    def get_title(self, item):
+        return self.__call_getter('get_title', self.__target.get_title, item)
+
+    def get_description(self, item):
+        return self.__call_getter('get_description', self.__target.get_description, item)
+
+    def get_publish_date(self, item):
+        return self.__call_getter('get_publish_date', self.__target.get_publish_date, item)
+
+    def get_link(self, item):
+        return self.__call_getter('get_link', self.__target.get_link, item)
+
+    def get_author(self, item):
+        return self.__call_getter('get_author', self.__target.get_author, item)
+
+    def extract(self, item):
+        if not self.__detailed:
+            return self.__target.extract(item)
+        elif self.__hooked:
+            return self.__time('extract', self.__target.extract, item)
+        else:
+            return self.__time('extract', self.__extract_by_getters, item)
+
+    def __extract_by_getters(self, item):
+        return (
+            self.get_title(item),
+            self.get_description(item),
+            self.get_publish_date(item),
+            self.get_link(item),
+            self.get_author(item)
+        )
+
+    def __call_getter(self, stage, function, item):
+        if self.__detailed and not self.__hooked:
+            return self.__time(stage, function, item)
+        else:
+            return function(item)
+
+    def __time_field(self, field, extractor):
+        stage = 'get_' + field
+        return lambda item: self.__time(stage, extractor, item)
+
+    def __time(self, stage, function, item):
+        start = self.__clock()
+        try:
+            return function(item)
+        finally:
+            self.__metrics.record(self.__key, stage, self.__clock() - start)
+
+
+def get_bucket(seconds):
+    """Find the histogram bucket holding a latency.
+
+    Args:
+        seconds: The float latency.
+    Returns:
+        Integer index from zero, for latencies of MIN_SECONDS or less, to NUM_BUCKETS - 1.
+    """
+    if seconds <= MIN_SECONDS:
+        return 0
+
+    bucket = math.ceil(math.log2(seconds / MIN_SECONDS) * BUCKETS_PER_DOUBLING)
+    return min(bucket, NUM_BUCKETS - 1)
+
+
+def get_upper_bound(bucket):
+    """Get the largest latency held by a histogram bucket.
+
+    Args:
+        bucket: Integer index from get_bucket.
+    Returns:
+        Float seconds.
+    """
+    return MIN_SECONDS * 2 ** (bucket / BUCKETS_PER_DOUBLING)
+
+
+def format_histogram(stage, histogram):
+    """Describe the latencies of a stage on a single line.
+
+    Args:
+        stage: The name of the stage.
+        histogram: The Histogram for the stage.
+    Returns:
+        String with the count and the total, mean, median, 95th percentile and max in
+        milliseconds.
+    """
+    return SUMMARY_FORMAT % (
+        stage,
+        histogram.get_count(),
+        histogram.get_total() * 1000,
+        histogram.get_mean() * 1000,
+        histogram.get_percentile(0.5) * 1000,
+        histogram.get_percentile(0.95) * 1000,
+        histogram.get_max() * 1000
+    )
+
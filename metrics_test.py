@@ -0,0 +1,218 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import metrics
+import strategies
+import template_method
+
+
+FEED = '''<?xml version="1.0"?>
+<rss version="2.0">
+    <channel>
+        <item>
+            <title>Title 1</title>
+            <description><![CDATA[<p>Description 1</p>]]></description>
+            <pubDate>Mon, 20 May 2019 01:02:03 -0400</pubDate>
+            <guid>https://example.com/1</guid>
+        </item>
+        <item>
+            <title>Title 2</title>
+            <description>Description 2</description>
+            <pubDate>Mon, 20 May 2019 02:02:03 -0400</pubDate>
+            <guid>https://example.com/2</guid>
+        </item>
+    </channel>
+</rss>
+'''
+
+URL = 'https://example.com/rss'
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.__now = 0
+
+    def advance(self, seconds):
+        self.__now += seconds
+
+    def __call__(self):
+        return self.__now
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_empty(self):
+        histogram = metrics.Histogram()
+        self.assertEqual(histogram.get_count(), 0)
+        self.assertIsNone(histogram.get_mean())
+        self.assertIsNone(histogram.get_percentile(0.5))
+
+    def test_percentiles(self):
+        histogram = metrics.Histogram()
+        for i in range(1, 101):
+            histogram.record(i / 1000)
+
+        self.assertEqual(histogram.get_count(), 100)
+        self.assertAlmostEqual(histogram.get_mean(), 0.0505)
+        self.assertEqual(histogram.get_min(), 0.001)
+        self.assertEqual(histogram.get_max(), 0.1)
+        self.assertAlmostEqual(histogram.get_percentile(0.5), 0.05, delta=0.05 * 0.2)
+        self.assertAlmostEqual(histogram.get_percentile(0.95), 0.095, delta=0.095 * 0.2)
+        self.assertEqual(histogram.get_percentile(1), 0.1)
+
+    def test_get_bucket_bounds(self):
+        self.assertEqual(metrics.get_bucket(0), 0)
+        self.assertEqual(metrics.get_bucket(10 ** 9), metrics.NUM_BUCKETS - 1)
+
+        for seconds in (0.00001, 0.0123, 4.5):
+            bucket = metrics.get_bucket(seconds)
+            self.assertLessEqual(seconds, metrics.get_upper_bound(bucket) * 1.000001)
+            self.assertGreater(seconds, metrics.get_upper_bound(bucket - 1))
+
+    def test_merge(self):
+        first = metrics.Histogram()
+        first.record(0.001)
+        second = metrics.Histogram()
+        second.record(0.003)
+        second.record(0.005)
+
+        first.merge(second)
+        first.merge(metrics.Histogram())
+
+        self.assertEqual(first.get_count(), 3)
+        self.assertAlmostEqual(first.get_total(), 0.009)
+        self.assertEqual(first.get_min(), 0.001)
+        self.assertEqual(first.get_max(), 0.005)
+
+
+class MetricsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__clock = FakeClock()
+        self.__metrics = metrics.Metrics(clock=self.__clock, detailed=True)
+
+    def test_time(self):
+        with self.__metrics.time(URL, 'fetch'):
+            self.__clock.advance(2)
+
+        with self.assertRaises(IOError):
+            with self.__metrics.time(URL, 'fetch'):
+                self.__clock.advance(1)
+                raise IOError('Could not reach source.')
+
+        histogram = self.__metrics.get_histogram(URL, 'fetch')
+        self.assertEqual(histogram.get_count(), 2)
+        self.assertEqual(histogram.get_total(), 3)
+
+    def test_time_iter_excludes_consumer(self):
+        def produce():
+            for i in range(3):
+                self.__clock.advance(1)
+                yield i
+
+        for value in self.__metrics.time_iter(URL, 'parse', produce(), counter='items'):
+            self.__clock.advance(10)
+
+        histogram = self.__metrics.get_histogram(URL, 'parse')
+        self.assertEqual(histogram.get_count(), 1)
+        self.assertEqual(histogram.get_total(), 3)
+        self.assertEqual(self.__metrics.get_counter(URL, 'items'), 3)
+
+    def test_increment(self):
+        self.__metrics.increment(URL, 'bytes', 10)
+        self.__metrics.increment(URL, 'bytes', 5)
+        self.assertEqual(self.__metrics.get_counter(URL, 'bytes'), 15)
+        self.assertEqual(self.__metrics.get_counter(URL, 'errors'), 0)
+
+    def test_instrument(self):
+        strategy = self.__metrics.instrument(URL, strategies.CnnParseStrategy())
+        articles = list(template_method.parse_text(FEED, strategy))
+
+        self.assertEqual([article.get_link() for article in articles], [
+            'https://example.com/1',
+            'https://example.com/2'
+        ])
+        self.assertEqual(self.__metrics.get_counter(URL, 'items'), 2)
+        self.assertEqual(self.__metrics.get_histogram(URL, 'parse').get_count(), 1)
+        self.assertEqual(self.__metrics.get_histogram(URL, 'extract').get_count(), 2)
+
+        for stage in ('get_title', 'get_description', 'get_publish_date', 'get_link'):
+            self.assertEqual(self.__metrics.get_histogram(URL, stage).get_count(), 2)
+
+        strategy.get_link(strategy.get_items(FEED)[0])
+        self.assertEqual(self.__metrics.get_histogram(URL, 'get_link').get_count(), 3)
+
+    def test_instrument_not_detailed(self):
+        crawl_metrics = metrics.Metrics(clock=self.__clock)
+        strategy = crawl_metrics.instrument(URL, strategies.CnnParseStrategy())
+        articles = list(template_method.parse_text(FEED, strategy))
+
+        self.assertEqual(len(articles), 2)
+        self.assertEqual(crawl_metrics.get_counter(URL, 'items'), 2)
+        self.assertEqual(crawl_metrics.get_histogram(URL, 'parse').get_count(), 1)
+        self.assertIsNone(crawl_metrics.get_histogram(URL, 'extract'))
+
+    def test_parse_fetched(self):
+        strategy = strategies.CnnParseStrategy()
+        articles = template_method.parse_fetched(
+            URL,
+            FEED,
+            strategy,
+            None,
+            None,
+            None,
+            None,
+            self.__metrics
+        )
+
+        self.assertEqual(len(list(articles)), 2)
+        self.assertEqual(self.__metrics.get_counter(URL, 'articles'), 2)
+        self.assertEqual(self.__metrics.get_counter(URL, 'bytes'), len(FEED))
+
+        template_method.parse_fetched(URL, None, strategy, None, None, None, None, self.__metrics)
+        self.assertEqual(self.__metrics.get_counter(URL, 'unchanged'), 1)
+
+    def test_summary_and_save(self):
+        with self.__metrics.time(URL, 'fetch'):
+            self.__clock.advance(0.5)
+
+        self.__metrics.record('database', 'persist', 0.25)
+        self.__metrics.increment(URL, 'errors')
+
+        summary = self.__metrics.format_summary()
+        self.assertLess(summary.index('fetch'), summary.index('persist'))
+        self.assertIn(URL + ':', summary)
+        self.assertIn('errors=1', summary)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'metrics.json')
+            self.__metrics.save(path)
+
+            with open(path) as f:
+                saved = json.load(f)
+
+        self.assertEqual(saved['sources'][URL]['counters'], {'errors': 1})
+        self.assertEqual(saved['sources'][URL]['stages']['fetch']['count'], 1)
+        self.assertEqual(saved['totals']['persist']['total'], 0.25)
+        self.assertEqual(self.__metrics.get_keys(), ['database', URL])
@@ -0,0 +1,326 @@
+"""Migrations bringing existing articles databases up to the current schema.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import argparse
+
+import feed_cache
+import persist
+import search
+
+
+DELETE_DUPLICATES_SQL = '''
+    DELETE FROM
+        articles
+    WHERE
+        rowid NOT IN (
+            SELECT
+                min(rowid)
+            FROM
+                articles
+            GROUP BY
+                source,
+                link
+        )
+'''
+
+CREATE_SOURCE_LINK_INDEX_SQL = '''
+    CREATE UNIQUE INDEX IF NOT EXISTS articlesSourceLink ON articles (source, link)
+'''
+
+
+CREATE_EPOCH_TABLE_SQL = '''
+    CREATE TABLE articlesEpoch (
+        `source` TEXT,
+        `sourceFeed` TEXT,
+        `title` TEXT,
+        `description` TEXT,
+        `publishDate` INTEGER,
+        `crawlDate` INTEGER,
+        `link` TEXT,
+        `author` TEXT
+    )
+'''
+
+COPY_TO_EPOCH_SQL = '''
+    INSERT INTO
+        articlesEpoch (
+            rowid,
+            source,
+            sourceFeed,
+            title,
+            description,
+            publishDate,
+            crawlDate,
+            link,
+            author
+        )
+    SELECT
+        rowid,
+        source,
+        sourceFeed,
+        title,
+        description,
+        CAST(strftime('%s', nullif(publishDate, '')) AS INTEGER),
+        CAST(strftime('%s', nullif(crawlDate, '')) AS INTEGER),
+        link,
+        author
+    FROM
+        articles
+'''
+
+# Columns holding the hashes of each feed's body and items, added to the original feedCache.
+FEED_CACHE_HASH_COLUMNS = [
+    ('bodyHash', 'TEXT'),
+    ('itemHashes', 'BLOB')
+]
+
+CREATE_DATE_INDICES_SQL = [
+    '''CREATE INDEX IF NOT EXISTS articlesSourcePublishDate ON articles (source, publishDate)''',
+    '''CREATE INDEX IF NOT EXISTS articlesCrawlDate ON articles (crawlDate)'''
+]
+
+# The search index as first created, keyed by the implicit rowid before articles had an id.
+CREATE_ROWID_SEARCH_SQL = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS articlesSearch USING fts5(
+        title,
+        description,
+        content='articles',
+        content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articlesSearchInsert AFTER INSERT ON articles BEGIN
+        INSERT INTO articlesSearch (rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articlesSearchDelete AFTER DELETE ON articles BEGIN
+        INSERT INTO articlesSearch (articlesSearch, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articlesSearchUpdate AFTER UPDATE OF title, description ON articles
+    BEGIN
+        INSERT INTO articlesSearch (articlesSearch, rowid, title, description)
+        VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO articlesSearch (rowid, title, description)
+        VALUES (new.rowid, new.title, new.description);
+    END
+    '''
+]
+
+CREATE_ID_TABLE_SQL = '''
+    CREATE TABLE articlesWithId (
+        `id` INTEGER PRIMARY KEY,
+        `source` TEXT,
+        `sourceFeed` TEXT,
+        `title` TEXT,
+        `description` TEXT,
+        `publishDate` INTEGER,
+        `crawlDate` INTEGER,
+        `link` TEXT,
+        `author` TEXT
+    )
+'''
+
+COPY_TO_ID_SQL = '''
+    INSERT INTO
+        articlesWithId (
+            id,
+            source,
+            sourceFeed,
+            title,
+            description,
+            publishDate,
+            crawlDate,
+            link,
+            author
+        )
+    SELECT
+        rowid,
+        source,
+        sourceFeed,
+        title,
+        description,
+        publishDate,
+        crawlDate,
+        link,
+        author
+    FROM
+        articles
+'''
+
+
+def dedupe_articles(target_db):
+    """Remove repeated articles, keeping the first seen, and index the natural key.
+
+    Args:
+        target_db: DB API v2 compliant connection to the database to migrate.
+    """
+    cursor = target_db.cursor()
+    cursor.execute(DELETE_DUPLICATES_SQL)
+    cursor.execute(CREATE_SOURCE_LINK_INDEX_SQL)
+
+
+def convert_dates_to_epoch(target_db):
+    """Store dates as integer seconds since the epoch and index them for range queries.
+
+    The articles table is rebuilt as SQLite cannot change column types, keeping each rowid.
+    Empty or unparseable dates become NULL. Dates without a timezone are taken to be UTC.
+
+    Args:
+        target_db: DB API v2 compliant connection to the database to migrate.
+    """
+    cursor = target_db.cursor()
+    cursor.execute(CREATE_EPOCH_TABLE_SQL)
+    cursor.execute(COPY_TO_EPOCH_SQL)
+    cursor.execute('DROP TABLE articles')
+    cursor.execute('ALTER TABLE articlesEpoch RENAME TO articles')
+    cursor.execute(CREATE_SOURCE_LINK_INDEX_SQL)
+
+    for sql in CREATE_DATE_INDICES_SQL:
+        cursor.execute(sql)
+
+
+def index_articles_text(target_db):
+    """Create the full text search index over titles and descriptions and fill it.
+
+    Args:
+        target_db: DB API v2 compliant connection to the database to migrate.
+    """
+    cursor = target_db.cursor()
+
+    for sql in CREATE_ROWID_SEARCH_SQL:
+        cursor.execute(sql)
+
+    cursor.execute(search.REBUILD_SQL)
+
+
+def add_feed_cache_hashes(target_db):
+    """Add the columns holding the hashes of feed bodies and items to the feed cache.
+
+    The feed cache is created with every column if the database predates it entirely.
+
+    Args:
+        target_db: DB API v2 compliant connection to the database to migrate.
+    """
+    cursor = target_db.cursor()
+    cursor.execute(feed_cache.CREATE_SQL)
+    cursor.execute('PRAGMA table_info(feedCache)')
+    existing = set(row[1] for row in cursor.fetchall())
+
+    for (name, column_type) in FEED_CACHE_HASH_COLUMNS:
+        if name not in existing:
+            cursor.execute('ALTER TABLE feedCache ADD COLUMN `%s` %s' % (name, column_type))
+
+
+def add_article_ids(target_db):
+    """Give articles an explicit integer primary key and key the search index by it.
+
+    The implicit rowid the search index referred to may be renumbered by VACUUM whereas an
+    INTEGER PRIMARY KEY is not. The table is rebuilt with each id taken from the old rowid so
+    that exports continuing from a rowid carry on where they left off.
+
+    Args:
+        target_db: DB API v2 compliant connection to the database to migrate.
+    """
+    cursor = target_db.cursor()
+    cursor.execute('DROP TABLE IF EXISTS articlesSearch')
+    cursor.execute(CREATE_ID_TABLE_SQL)
+    cursor.execute(COPY_TO_ID_SQL)
+    cursor.execute('DROP TABLE articles')
+    cursor.execute('ALTER TABLE articlesWithId RENAME TO articles')
+    cursor.execute(CREATE_SOURCE_LINK_INDEX_SQL)
+
+    for sql in CREATE_DATE_INDICES_SQL:
+        cursor.execute(sql)
+
+    search.create_search_index(target_db)
+    cursor.execute(search.REBUILD_SQL)
+
+
+MIGRATIONS = [
+    dedupe_articles,
+    convert_dates_to_epoch,
+    index_articles_text,
+    add_feed_cache_hashes,
+    add_article_ids
+]
+
+
+def get_version(target_db):
+    """Get the schema version of a database.
+
+    Args:
+        target_db: DB API v2 compliant connection to the sqlite database to check.
+    Returns:
+        Integer version where 0 is the original schema and each migration adds one.
+    """
+    cursor = target_db.cursor()
+    cursor.execute('PRAGMA user_version')
+    return cursor.fetchone()[0]
+
+
+def migrate(target_db):
+    """Run any migrations not yet applied to a database, each in its own transaction.
+
+    Each migration including its schema changes is applied atomically.
+
+    Args:
+        target_db: DB API v2 compliant connection to the sqlite database to migrate.
+    Returns:
+        The schema version of the database after migrating.
+    """
+    version = get_version(target_db)
+
+    for next_version in range(version + 1, len(MIGRATIONS) + 1):
+        try:
+            if not target_db.in_transaction:
+                target_db.cursor().execute('BEGIN')
+
+            MIGRATIONS[next_version - 1](target_db)
+            target_db.cursor().execute('PRAGMA user_version = %d' % next_version)
+            target_db.commit()
+        except Exception:
+            target_db.rollback()
+            raise
+
+    return get_version(target_db)
+
+
+def main():
+    """Execute this script from the command line."""
+    parser = argparse.ArgumentParser(description='Migrate an articles database in place.')
+    parser.add_argument('--db', help='Path to the database. Defaults to articles.db.')
+    options = parser.parse_args()
+
+    db = persist.get_db(options.db) if options.db else persist.get_default_db()
+    version = migrate(db)
+    print('Database at schema version %d.' % version)
+
+
+if __name__ == '__main__':
+    main()
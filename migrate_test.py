@@ -0,0 +1,124 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sqlite3
+import unittest
+
+import feed_cache
+import migrate
+import persist
+import search
+
+
+class MigrateTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__connection = sqlite3.connect(':memory:')
+        cursor = self.__connection.cursor()
+        cursor.execute('''
+            CREATE TABLE "articles" (
+                `source` TEXT,
+                `sourceFeed` TEXT,
+                `title` TEXT,
+                `description` TEXT,
+                `publishDate` TEXT,
+                `crawlDate` TEXT,
+                `link` TEXT,
+                `author` TEXT
+            )
+        ''')
+        rows = [
+            ('NPR', '', 'title 1', '', '', '2019-05-20T00:00:00+00:00', 'link 1', ''),
+            ('NPR', '', 'title 1', '', '', '2019-05-21T00:00:00+00:00', 'link 1', ''),
+            ('BBC', '', 'title 1', '', '', '2019-05-21T00:00:00+00:00', 'link 1', ''),
+            ('NPR', '', 'title 2', '', '', '2019-05-21T00:00:00+00:00', 'link 2', '')
+        ]
+        cursor.executemany('INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        self.__connection.commit()
+
+    def test_migrate(self):
+        self.assertEqual(migrate.get_version(self.__connection), 0)
+        version = migrate.migrate(self.__connection)
+        self.assertEqual(version, len(migrate.MIGRATIONS))
+
+        cursor = self.__connection.cursor()
+        cursor.execute('''
+            SELECT
+                crawlDate
+            FROM
+                articles
+            WHERE
+                source = 'NPR'
+                AND link = 'link 1'
+        ''')
+        results = cursor.fetchall()
+        self.assertEqual(results, [(1558310400,)])
+
+        cursor.execute('''SELECT publishDate FROM articles''')
+        self.assertEqual(cursor.fetchone(), (None,))
+
+        cursor.execute('''SELECT count(*) FROM articles''')
+        self.assertEqual(cursor.fetchone()[0], 3)
+
+        results = search.search(self.__connection, search.escape_query('title 2'))
+        self.assertEqual([result.get_link() for result in results], ['link 2'])
+
+    def test_migrate_twice(self):
+        migrate.migrate(self.__connection)
+        version = migrate.migrate(self.__connection)
+        self.assertEqual(version, len(migrate.MIGRATIONS))
+
+    def test_add_feed_cache_hashes(self):
+        cursor = self.__connection.cursor()
+        cursor.execute('''
+            CREATE TABLE feedCache (url TEXT PRIMARY KEY, etag TEXT, lastModified TEXT)
+        ''')
+        cursor.execute('''INSERT INTO feedCache VALUES ('http://example.com/rss', '"abc"', NULL)''')
+        self.__connection.commit()
+
+        migrate.migrate(self.__connection)
+
+        cache = feed_cache.FeedCache(self.__connection)
+        headers = cache.get_request_headers('http://example.com/rss')
+        self.assertEqual(headers, {'If-None-Match': '"abc"'})
+        self.assertEqual(cache.get_item_hashes('http://example.com/rss'), frozenset())
+        cache.save()
+
+    def test_add_article_ids(self):
+        migrate.migrate(self.__connection)
+
+        cursor = self.__connection.cursor()
+        cursor.execute('''SELECT id, source, link FROM articles ORDER BY id''')
+        self.assertEqual(cursor.fetchall(), [
+            (1, 'NPR', 'link 1'),
+            (3, 'BBC', 'link 1'),
+            (4, 'NPR', 'link 2')
+        ])
+
+        cursor.execute('''DELETE FROM articles WHERE id = 1''')
+        self.__connection.commit()
+        self.__connection.execute('VACUUM')
+
+        results = search.search(self.__connection, search.escape_query('title 2'))
+        self.assertEqual([result.get_article_id() for result in results], [4])
+        self.assertEqual([result.get_link() for result in results], ['link 2'])
+
+    def test_schema_version(self):
+        connection = sqlite3.connect(':memory:')
+        persist.create_schema(connection)
+        self.assertEqual(migrate.get_version(connection), len(migrate.MIGRATIONS))
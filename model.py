@@ -21,7 +21,22 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 class Article:
-    """Data structure describing an article."""
+    """Data structure describing an article.
+
+    Uses slots rather than a per-instance dict as large backfills keep millions of these in
+    memory at once.
+    """
+
+    __slots__ = (
+        '__source',
+        '__source_feed',
+        '__title',
+        '__description',
+        '__publish_date',
+        '__crawl_date',
+        '__link',
+        '__author'
+    )
 
     def __init__(self, source, source_feed, title, description, publish_date,
         crawl_date, link, author):
@@ -0,0 +1,99 @@
+"""Benchmark of the memory used per model.Article.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import gc
+import tracemalloc
+
+import model
+
+
+class DictArticle:
+    """Article as defined before slots, kept for comparison."""
+
+    def __init__(self, source, source_feed, title, description, publish_date,
+        crawl_date, link, author):
+        self.__source = source
+        self.__source_feed = source_feed
+        self.__title = title
+        self.__description = description
+        self.__publish_date = publish_date
+        self.__crawl_date = crawl_date
+        self.__link = link
+        self.__author = author
+
+
+def measure_bytes_per_article(article_class, count):
+    """Measure the memory held by each article beyond its field values.
+
+    Field values are shared across all articles so only the article objects themselves count.
+
+    Args:
+        article_class: The class to instantiate like model.Article.
+        count: The number of articles to create.
+    Returns:
+        Float bytes allocated per article.
+    """
+    date = datetime.datetime.now(datetime.timezone.utc)
+    gc.collect()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    articles = [
+        article_class('source', 'feed', 'title', 'description', date, date, 'link', 'author')
+        for i in range(count)
+    ]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del articles
+    return (after - before) / count
+
+
+def run_benchmarks(count=100000):
+    """Compare the memory of articles before and after slots.
+
+    Args:
+        count: The number of articles to create of each kind.
+    Returns:
+        List of dicts with the name of each benchmark and its bytes_per_item.
+    """
+    return [
+        {
+            'name': 'model.article.dict',
+            'bytes_per_item': measure_bytes_per_article(DictArticle, count)
+        },
+        {
+            'name': 'model.article.slots',
+            'bytes_per_item': measure_bytes_per_article(model.Article, count)
+        }
+    ]
+
+
+def main():
+    """Execute this script from the command line."""
+    for result in run_benchmarks():
+        print('%-32s %12.1f bytes/item' % (result['name'], result['bytes_per_item']))
+
+
+if __name__ == '__main__':
+    main()
@@ -20,30 +20,696 @@ OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
+import argparse
+import concurrent.futures
+import datetime
+import functools
+import itertools
+import logging
+import signal
+import sys
+import threading
+
+import feed_cache
+import http_session
+import metrics
+import parse_pool
 import persist
+import scheduler
+import seen_links
+import snapshots
 import sources
+import startup_profile
 import template_method
-import util
 
 
-def process_source(source):
+DEFAULT_WORKERS = 1
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECTIONS = 100
+STARTUP_PROFILE_FLAG = '--startup-profile'
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlContext:
+    """Resources and settings shared by every source processed in a crawl."""
+
+    def __init__(self, timeout=None, session=None, cache=None, seen=None, archive=None,
+        crawl_metrics=None):
+        """Create a new context for a crawl.
+
+        Args:
+            timeout: Optional number of seconds to wait on connecting to or reading from each
+                server before giving up. This is not a limit on the total time taken by a source.
+            session: Optional http_session.HttpSession used by sources opting into it.
+            cache: Optional feed_cache.FeedCache used to skip feeds unchanged since the last
+                crawl.
+            seen: Optional seen_links.SeenLinks used to skip articles already stored.
+            archive: Optional snapshots.SnapshotArchive in which fetched feeds are kept.
+            crawl_metrics: Optional metrics.Metrics recording timings and counts per source.
+        """
+        self.__timeout = timeout
+        self.__session = session
+        self.__cache = cache
+        self.__seen = seen
+        self.__archive = archive
+        self.__metrics = crawl_metrics
+
+    def get_timeout(self):
+        """Get how long to wait on connecting to or reading from each server.
+
+        Returns:
+            Number of seconds to wait on a connection or on the next bytes from a server before
+            giving up or None to wait indefinitely.
+        """
+        return self.__timeout
+
+    def get_session(self):
+        """Get the session shared by sources which opt into it.
+
+        Returns:
+            The shared http_session.HttpSession or None if standalone requests should be made.
+        """
+        return self.__session
+
+    def get_cache(self):
+        """Get the cache of validators used to request feeds conditionally.
+
+        Returns:
+            The feed_cache.FeedCache or None if feeds should always be downloaded in full.
+        """
+        return self.__cache
+
+    def get_seen(self):
+        """Get the set of articles already stored.
+
+        Returns:
+            The seen_links.SeenLinks or None if every item should be transformed.
+        """
+        return self.__seen
+
+    def get_archive(self):
+        """Get the archive of raw feed contents.
+
+        Returns:
+            The snapshots.SnapshotArchive or None if feed contents should not be kept.
+        """
+        return self.__archive
+
+    def get_metrics(self):
+        """Get the metrics recording the time spent on each stage of each source.
+
+        Returns:
+            The metrics.Metrics or None if nothing should be recorded.
+        """
+        return self.__metrics
+
+
+def process_source(source, context=None):
     """Process a single news source.
 
     Args:
         source: NewsSource instance describing the source whose RSS feed should be parsed.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    Returns:
+        Iterable over Article instances, each parsed only when requested.
+    """
+    if context is None:
+        context = CrawlContext()
+
+    url = source.get_url()
+    strategy = source.get_parse_strategy()
+    session = context.get_session() if source.get_use_session() else None
+    return template_method.parse(
+        url,
+        strategy,
+        timeout=context.get_timeout(),
+        session=session,
+        cache=context.get_cache(),
+        seen_links=context.get_seen(),
+        archive=context.get_archive(),
+        metrics=context.get_metrics()
+    )
+
+
+def process_source_isolated(source, context=None):
+    """Process a single news source, containing any failure to that source.
+
+    Args:
+        source: NewsSource instance describing the source whose RSS feed should be parsed.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    Returns:
+        List of Article instances parsed or None if the source could not be processed.
+    """
+    try:
+        return list(process_source(source, context=context))
+    except Exception:
+        logger.exception('Failed to process %s.', source.get_url())
+        count_error(source, context)
+        return None
+
+
+def count_error(source, context):
+    """Count a failure to process a source in the crawl's metrics if they are being recorded.
+
+    Args:
+        source: NewsSource instance describing the source which failed.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    """
+    crawl_metrics = context.get_metrics() if context else None
+    if crawl_metrics:
+        crawl_metrics.increment(source.get_url(), 'errors')
+
+
+def fetch_source(source, crawl_date, context=None):
+    """Download the contents of a single news source's feed without parsing it.
+
+    Args:
+        source: NewsSource instance describing the source whose RSS feed should be fetched.
+        crawl_date: The datetime.datetime at which the feed is being downloaded.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    Returns:
+        The string contents of the feed or None if unchanged since the last crawl.
+    """
+    if context is None:
+        context = CrawlContext()
+
+    url = source.get_url()
+    session = context.get_session() if source.get_use_session() else None
+    crawl_metrics = context.get_metrics()
+
+    with template_method.time_stage(crawl_metrics, url, 'fetch'):
+        text = template_method.fetch(
+            url,
+            timeout=context.get_timeout(),
+            session=session,
+            cache=context.get_cache()
+        )
+
+    if crawl_metrics:
+        if text is None:
+            crawl_metrics.increment(url, 'unchanged')
+        else:
+            crawl_metrics.increment(url, 'bytes', len(text.encode(template_method.ENCODING)))
+
+    archive = context.get_archive()
+    if archive and text is not None:
+        archive.add(url, text, crawl_date)
+
+    return text
+
+
+def crawl_rows(news_sources, pool, workers=DEFAULT_WORKERS, context=None):
+    """Fetch sources on worker threads and parse them on a process pool.
+
+    Failures to fetch or parse a source are contained to that source.
+
+    Args:
+        news_sources: Iterable over NewsSource to be processed.
+        pool: The parse_pool.ParsePool on which feeds are parsed. Its seen links, rather than the
+            context's, determine which items are skipped.
+        workers: The maximum number of sources to fetch at once.
+        context: Optional CrawlContext with the resources shared across the crawl. Items found
+            unchanged since the last parse through its feed cache are skipped by the pool.
+    Returns:
+        Iterable over row tuples for persist.persist_rows grouped by source in the order that
+        news_sources were given.
+    """
+    news_sources = list(news_sources)
+    crawl_metrics = context.get_metrics() if context else None
+    cache = context.get_cache() if context else None
+
+    def fetch_and_submit(source):
+        crawl_date = datetime.datetime.now(datetime.timezone.utc)
+        try:
+            text = fetch_source(source, crawl_date, context=context)
+        except Exception:
+            logger.exception('Failed to fetch %s.', source.get_url())
+            count_error(source, context)
+            return None
+
+        if text is None:
+            return None
+
+        strategy = source.get_parse_strategy()
+        if cache:
+            previous_hashes = cache.get_item_hashes(source.get_url())
+            return pool.submit_changed(text, strategy, crawl_date, previous_hashes)
+        else:
+            return pool.submit(text, strategy, crawl_date)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = executor.map(fetch_and_submit, news_sources)
+        for (source, future) in zip(news_sources, futures):
+            if future is None:
+                continue
+
+            try:
+                result = future.result()
+            except Exception:
+                logger.exception('Failed to parse %s.', source.get_url())
+                count_error(source, context)
+                continue
+
+            if cache:
+                (rows, item_hashes) = result
+                cache.update_item_hashes(source.get_url(), item_hashes)
+                cache.confirm(source.get_url())
+            else:
+                rows = result
+
+            if crawl_metrics:
+                crawl_metrics.increment(source.get_url(), 'articles', len(rows))
+
+            yield from rows
+
+
+def crawl_by_source(news_sources, workers=DEFAULT_WORKERS, context=None):
+    """Process many news sources across a bounded pool of workers, keeping articles by source.
+
+    Args:
+        news_sources: Iterable over NewsSource to be processed.
+        workers: The maximum number of sources to fetch and parse at once.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    Returns:
+        Iterable over tuples of NewsSource and the list of Article parsed from it in the order
+        that news_sources were given. Sources which could not be processed have None in place of
+        their articles.
+    """
+    news_sources = list(news_sources)
+    visitor = functools.partial(process_source_isolated, context=context)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from zip(news_sources, executor.map(visitor, news_sources))
+
+
+def crawl_concurrently(news_sources, workers, context=None):
+    """Process many news sources at the same time across a bounded pool of workers.
+
+    Args:
+        news_sources: Iterable over NewsSource to be processed.
+        workers: The maximum number of sources to fetch and parse at once.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    Returns:
+        Iterable over Article with articles grouped by source in the order that news_sources
+        were given, regardless of the order in which the sources finished. Articles from a source
+        are yielded as soon as it and all sources before it are done.
+    """
+    for (source, articles) in crawl_by_source(news_sources, workers=workers, context=context):
+        if articles is not None:
+            yield from articles
+
+
+async def process_source_async(session, source, context=None):
+    """Process a single news source on the event loop, containing any failure to that source.
+
+    Args:
+        session: The aiohttp.ClientSession through which the feed should be requested.
+        source: NewsSource instance describing the source whose RSS feed should be parsed.
+        context: Optional CrawlContext with the settings shared across the crawl. Its
+            http_session.HttpSession is not used.
     Returns:
-        List of Article instances parsed.
+        List of Article instances parsed or an empty list if the source could not be processed.
     """
+    if context is None:
+        context = CrawlContext()
+
     url = source.get_url()
     strategy = source.get_parse_strategy()
-    return template_method.parse(url, strategy)
+
+    try:
+        articles = await template_method.parse_async(
+            session,
+            url,
+            strategy,
+            timeout=context.get_timeout(),
+            cache=context.get_cache(),
+            seen_links=context.get_seen(),
+            archive=context.get_archive(),
+            metrics=context.get_metrics()
+        )
+        return list(articles)
+    except Exception:
+        logger.exception('Failed to process %s.', url)
+        count_error(source, context)
+        return []
+
+
+async def crawl_async(news_sources, connections=DEFAULT_CONNECTIONS, context=None):
+    """Process many news sources at the same time on a single event loop.
+
+    Args:
+        news_sources: Iterable over NewsSource to be processed.
+        connections: The maximum number of connections open at once across all sources.
+        context: Optional CrawlContext with the settings shared across the crawl.
+    Returns:
+        List of Article with articles grouped by source in the order that news_sources were
+        given, regardless of the order in which the sources finished.
+    """
+    import asyncio
+
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=connections)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(*[
+            process_source_async(session, source, context=context) for source in news_sources
+        ])
+
+    return list(itertools.chain.from_iterable(results))
+
+
+def crawl(news_sources, workers=DEFAULT_WORKERS, context=None):
+    """Process news sources either one after another or concurrently.
+
+    Args:
+        news_sources: Iterable over NewsSource to be processed.
+        workers: The maximum number of sources to process at once. One processes sequentially.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    Returns:
+        Iterable over Article parsed from all of the sources. Sources which could not be processed
+        are logged, counted as errors and skipped.
+    """
+    if workers > 1:
+        return crawl_concurrently(news_sources, workers, context=context)
+    else:
+        return crawl_sequentially(news_sources, context=context)
+
+
+def crawl_sequentially(news_sources, context=None):
+    """Process news sources one after another, containing any failure to its source.
+
+    Args:
+        news_sources: Iterable over NewsSource to be processed.
+        context: Optional CrawlContext with the resources shared across the crawl.
+    Returns:
+        Iterable over Article with articles grouped by source in the order that news_sources
+        were given.
+    """
+    for source in news_sources:
+        articles = process_source_isolated(source, context=context)
+        if articles is not None:
+            yield from articles
+
+
+def crawl_due_sources(news_sources, target_db, workers=DEFAULT_WORKERS, context=None, seen=None):
+    """Crawl and persist a set of sources, counting the new articles found in each.
+
+    Args:
+        news_sources: Iterable over NewsSource to be processed.
+        target_db: DB API v2 compliant connection into which articles should be persisted.
+        workers: The maximum number of sources to process at once.
+        context: Optional CrawlContext with the resources shared across the crawl. Its seen
+            links determine which articles count as new. Its feed cache is committed once the
+            articles are persisted or has what it learned discarded if persisting fails.
+        seen: Optional seen_links.SeenLinks to which persisted articles should be added.
+    Returns:
+        Dict from the URL of each source to the number of new articles found. Sources which could
+        not be processed are left out.
+    """
+    counts = {}
+    cache = context.get_cache() if context else None
+
+    def count_articles():
+        for (source, articles) in crawl_by_source(news_sources, workers=workers, context=context):
+            if articles is not None:
+                counts[source.get_url()] = len(articles)
+                yield from articles
+
+    try:
+        persist.persist_articles(
+            count_articles(),
+            target_db,
+            seen_links=seen,
+            metrics=context.get_metrics() if context else None
+        )
+    except Exception:
+        if cache:
+            cache.discard()
+        raise
+
+    if cache:
+        cache.commit()
+
+    return counts
+
+
+def log_bytes_received(session):
+    """Log the number of bytes received per source through a shared session.
+
+    Args:
+        session: The http_session.HttpSession whose transfers should be reported.
+    """
+    for url, num_bytes in sorted(session.get_bytes_received().items()):
+        logger.info('Received %d bytes from %s.', num_bytes, url)
+
+
+def parse_args(args=None):
+    """Parse command line arguments.
+
+    Args:
+        args: List of string arguments or None to use sys.argv.
+    Returns:
+        argparse.Namespace with the parsed options.
+    """
+    parser = argparse.ArgumentParser(description='Crawl RSS feeds into the articles database.')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help='Number of sources to fetch at once. Defaults to %d.' % DEFAULT_WORKERS
+    )
+    parser.add_argument(
+        '--socket-timeout',
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help='Seconds to wait on connecting to a server or between bytes received from it before '
+        'giving up. This bounds each attempt rather than the total time spent on a source, which '
+        'may be longer for a slow but steady server or with retries. Defaults to %d.'
+        % DEFAULT_TIMEOUT
+    )
+    parser.add_argument(
+        '--asyncio',
+        action='store_true',
+        help='Fetch all sources on a single asyncio event loop instead of worker threads.'
+    )
+    parser.add_argument(
+        '--connections',
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help='Connections open at once with --asyncio. Defaults to %d.' % DEFAULT_CONNECTIONS
+    )
+    parser.add_argument(
+        '--parse-processes',
+        type=int,
+        default=0,
+        help='Parse feeds on this many processes while threads fetch. Defaults to parsing on the '
+        'fetching threads.'
+    )
+    parser.add_argument(
+        '--schedule',
+        action='store_true',
+        help='Keep running, crawling each source as often as it publishes new articles.'
+    )
+    parser.add_argument(
+        '--min-interval',
+        type=float,
+        default=scheduler.DEFAULT_MIN_INTERVAL,
+        help='Fewest seconds between crawls of a source with --schedule. Defaults to %d.' % (
+            scheduler.DEFAULT_MIN_INTERVAL
+        )
+    )
+    parser.add_argument(
+        '--max-interval',
+        type=float,
+        default=scheduler.DEFAULT_MAX_INTERVAL,
+        help='Most seconds between crawls of a source with --schedule. Defaults to %d.' % (
+            scheduler.DEFAULT_MAX_INTERVAL
+        )
+    )
+    parser.add_argument(
+        '--archive',
+        action='store_true',
+        help='Keep the contents of every feed fetched in the snapshots directory for reparsing.'
+    )
+    parser.add_argument(
+        '--ignore-cache',
+        action='store_true',
+        help='Download and parse every feed in full even if unchanged since the last crawl.'
+    )
+    parser.add_argument(
+        '--ignore-seen',
+        action='store_true',
+        help='Transform every item even if its article was already stored.'
+    )
+    parser.add_argument(
+        '--metrics-file',
+        default=None,
+        help='Write the time spent on each stage of each source to this path as JSON. Implies '
+        '--detailed-metrics.'
+    )
+    parser.add_argument(
+        '--detailed-metrics',
+        action='store_true',
+        help='Also time the extraction of every item, which slows parsing slightly.'
+    )
+    parser.add_argument(
+        STARTUP_PROFILE_FLAG,
+        action='store_true',
+        help='Run under python -X importtime and report which imports startup spent time on.'
+    )
+    return parser.parse_args(args)
+
+
+def run_scheduled(options, db, cache, seen, context_seen, seen_path, archive=None,
+    crawl_metrics=None):
+    """Crawl sources as they become due until interrupted by SIGINT or SIGTERM.
+
+    The feed cache, seen links, archive index and schedule are saved after every round.
+
+    Args:
+        options: argparse.Namespace with the parsed command line options.
+        db: DB API v2 compliant connection to the articles database.
+        cache: Optional feed_cache.FeedCache used to skip unchanged feeds.
+        seen: seen_links.SeenLinks recording the articles stored.
+        context_seen: The seen_links.SeenLinks used to skip stored articles or None.
+        seen_path: The file path at which the seen links are saved.
+        archive: Optional snapshots.SnapshotArchive in which fetched feeds are kept.
+        crawl_metrics: Optional metrics.Metrics recording timings and counts across every round.
+    """
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda received, frame: stop.set())
+
+    session = http_session.HttpSession(
+        pool_maxsize=max(options.workers, http_session.DEFAULT_POOL_MAXSIZE)
+    )
+    context = CrawlContext(
+        timeout=options.socket_timeout,
+        session=session,
+        cache=cache,
+        seen=context_seen,
+        archive=archive,
+        crawl_metrics=crawl_metrics
+    )
+    crawl_scheduler = scheduler.Scheduler(
+        sources.SOURCES,
+        db,
+        min_interval=options.min_interval,
+        max_interval=options.max_interval
+    )
+
+    def crawl_due(due_sources):
+        counts = crawl_due_sources(
+            due_sources,
+            db,
+            workers=options.workers,
+            context=context,
+            seen=seen
+        )
+
+        if cache:
+            cache.save()
+
+        if archive:
+            archive.save()
+
+        seen.save(seen_path, db)
+        return counts
+
+    try:
+        crawl_scheduler.run(crawl_due, stop)
+        log_bytes_received(session)
+    finally:
+        session.close()
 
 
 def main():
     """Execute this script from the command line."""
+    options = parse_args()
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    if options.startup_profile:
+        args = startup_profile.remove_flag(sys.argv[1:], STARTUP_PROFILE_FLAG)
+        sys.exit(startup_profile.run_profiled(__file__, args))
+
     db = persist.get_default_db()
-    articles = util.flat_map(process_source, sources.SOURCES)
-    persist.persist_articles(articles, db)
+    cache = None if options.ignore_cache else feed_cache.FeedCache(db)
+
+    seen_path = seen_links.get_default_path()
+    seen = seen_links.load_seen_links(db, seen_path)
+    context_seen = None if options.ignore_seen else seen
+    archive = snapshots.SnapshotArchive(snapshots.get_default_path()) if options.archive else None
+    crawl_metrics = metrics.Metrics(
+        detailed=options.detailed_metrics or options.metrics_file is not None
+    )
+
+    if options.schedule:
+        run_scheduled(options, db, cache, seen, context_seen, seen_path, archive, crawl_metrics)
+    elif options.asyncio:
+        import asyncio
+
+        context = CrawlContext(
+            timeout=options.socket_timeout,
+            cache=cache,
+            seen=context_seen,
+            archive=archive,
+            crawl_metrics=crawl_metrics
+        )
+        articles = asyncio.run(crawl_async(
+            sources.SOURCES,
+            connections=options.connections,
+            context=context
+        ))
+        persist.persist_articles(articles, db, seen_links=seen, metrics=crawl_metrics)
+    else:
+        session = http_session.HttpSession(
+            pool_maxsize=max(options.workers, http_session.DEFAULT_POOL_MAXSIZE)
+        )
+        context = CrawlContext(
+            timeout=options.socket_timeout,
+            session=session,
+            cache=cache,
+            seen=context_seen,
+            archive=archive,
+            crawl_metrics=crawl_metrics
+        )
+
+        try:
+            if options.parse_processes > 0:
+                pool = parse_pool.ParsePool(options.parse_processes, seen=context_seen)
+                try:
+                    rows = crawl_rows(
+                        sources.SOURCES,
+                        pool,
+                        workers=options.workers,
+                        context=context
+                    )
+                    persist.persist_rows(rows, db, seen_links=seen, metrics=crawl_metrics)
+                finally:
+                    pool.close()
+            else:
+                articles = crawl(sources.SOURCES, workers=options.workers, context=context)
+                persist.persist_articles(articles, db, seen_links=seen, metrics=crawl_metrics)
+
+            log_bytes_received(session)
+        finally:
+            session.close()
+
+    if cache:
+        cache.commit()
+        cache.save()
+
+    if archive:
+        archive.close()
+
+    seen.save(seen_path, db)
+
+    if options.metrics_file:
+        crawl_metrics.save(options.metrics_file)
+
+    print(crawl_metrics.format_summary())
 
 
 if __name__ == '__main__':
@@ -0,0 +1,186 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import asyncio
+import concurrent.futures
+import time
+import unittest
+import unittest.mock
+
+import metrics
+import news_crawler
+import sources
+
+
+class NewsCrawlerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__sources = [
+            sources.NewsSource('slow', None),
+            sources.NewsSource('broken', None),
+            sources.NewsSource('fast', None)
+        ]
+
+    def test_crawl_concurrently_order(self):
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            articles = list(news_crawler.crawl(self.__sources, workers=3))
+
+        self.assertEqual(articles, ['slow 1', 'slow 2', 'fast 1', 'fast 2'])
+
+    def test_crawl_sequential(self):
+        working_sources = [self.__sources[0], self.__sources[2]]
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            articles = list(news_crawler.crawl(working_sources, workers=1))
+
+        self.assertEqual(articles, ['slow 1', 'slow 2', 'fast 1', 'fast 2'])
+
+    def test_crawl_sequential_isolates_errors(self):
+        crawl_metrics = metrics.Metrics()
+        context = news_crawler.CrawlContext(crawl_metrics=crawl_metrics)
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            articles = list(news_crawler.crawl(self.__sources, workers=1, context=context))
+
+        self.assertEqual(articles, ['slow 1', 'slow 2', 'fast 1', 'fast 2'])
+        self.assertEqual(crawl_metrics.get_counter('broken', 'errors'), 1)
+
+    def test_crawl_by_source(self):
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            results = list(news_crawler.crawl_by_source(iter(self.__sources), workers=3))
+
+        counts = [(source.get_url(), articles) for (source, articles) in results]
+        self.assertEqual(counts, [
+            ('slow', ['slow 1', 'slow 2']),
+            ('broken', None),
+            ('fast', ['fast 1', 'fast 2'])
+        ])
+
+    def test_crawl_by_source_counts_errors(self):
+        crawl_metrics = metrics.Metrics()
+        context = news_crawler.CrawlContext(crawl_metrics=crawl_metrics)
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            list(news_crawler.crawl_by_source(self.__sources, workers=3, context=context))
+
+        self.assertEqual(crawl_metrics.get_counter('broken', 'errors'), 1)
+        self.assertEqual(crawl_metrics.get_counter('fast', 'errors'), 0)
+
+    def test_crawl_due_sources_commits_cache(self):
+        cache = unittest.mock.Mock()
+        context = news_crawler.CrawlContext(cache=cache)
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            with unittest.mock.patch('persist.persist_articles', self.__fake_persist_articles):
+                news_crawler.crawl_due_sources(self.__sources, None, workers=3, context=context)
+
+        cache.commit.assert_called_once_with()
+        cache.discard.assert_not_called()
+
+    def test_crawl_due_sources_leaves_out_failures(self):
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            with unittest.mock.patch('persist.persist_articles', self.__fake_persist_articles):
+                counts = news_crawler.crawl_due_sources(self.__sources, None, workers=3)
+
+        self.assertEqual(counts, {'slow': 2, 'fast': 2})
+
+    def test_crawl_due_sources_discards_cache(self):
+        cache = unittest.mock.Mock()
+        context = news_crawler.CrawlContext(cache=cache)
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            with unittest.mock.patch('persist.persist_articles', side_effect=IOError('Disk full.')):
+                with self.assertRaises(IOError):
+                    news_crawler.crawl_due_sources(self.__sources, None, context=context)
+
+        cache.discard.assert_called_once_with()
+        cache.commit.assert_not_called()
+
+    def test_log_bytes_received(self):
+        session = unittest.mock.Mock()
+        session.get_bytes_received.return_value = {'fast': 20, 'slow': 10}
+
+        with self.assertLogs('news_crawler', level='INFO') as logs:
+            news_crawler.log_bytes_received(session)
+
+        self.assertEqual(logs.output, [
+            'INFO:news_crawler:Received 20 bytes from fast.',
+            'INFO:news_crawler:Received 10 bytes from slow.'
+        ])
+
+    def test_crawl_rows(self):
+        pool = unittest.mock.Mock()
+        pool.submit.side_effect = self.__fake_submit
+
+        with unittest.mock.patch('news_crawler.fetch_source', self.__fake_fetch_source):
+            rows = list(news_crawler.crawl_rows(self.__sources, pool, workers=3))
+
+        self.assertEqual(rows, [('slow', 1), ('fast', 1)])
+
+    def test_crawl_rows_filters_unchanged(self):
+        cache = unittest.mock.Mock()
+        cache.get_item_hashes.return_value = frozenset([b'old'])
+        pool = unittest.mock.Mock()
+        pool.submit_changed.side_effect = self.__fake_submit_changed
+        context = news_crawler.CrawlContext(cache=cache)
+
+        with unittest.mock.patch('news_crawler.fetch_source', self.__fake_fetch_source):
+            rows = list(news_crawler.crawl_rows(self.__sources, pool, workers=3, context=context))
+
+        self.assertEqual(rows, [('slow', 1), ('fast', 1)])
+        pool.submit.assert_not_called()
+        cache.update_item_hashes.assert_any_call('fast', frozenset([b'fast']))
+        cache.confirm.assert_any_call('fast')
+
+    def test_crawl_async(self):
+        with unittest.mock.patch('template_method.parse_async', self.__fake_parse_async):
+            articles = asyncio.run(news_crawler.crawl_async(self.__sources))
+
+        self.assertEqual(articles, ['slow 1', 'slow 2', 'fast 1', 'fast 2'])
+
+    async def __fake_parse_async(self, session, url, strategy, timeout=None, cache=None,
+        seen_links=None, archive=None, metrics=None):
+        if url == 'broken':
+            raise IOError('Could not reach source.')
+        elif url == 'slow':
+            await asyncio.sleep(0.05)
+
+        return [url + ' 1', url + ' 2']
+
+    def __fake_persist_articles(self, articles, target_db, seen_links=None, metrics=None):
+        return len(list(articles))
+
+    def __fake_fetch_source(self, source, crawl_date, context=None):
+        if source.get_url() == 'broken':
+            raise IOError('Could not reach source.')
+
+        return source.get_url()
+
+    def __fake_submit(self, text, strategy, crawl_date):
+        future = concurrent.futures.Future()
+        future.set_result([(text, 1)])
+        return future
+
+    def __fake_submit_changed(self, text, strategy, crawl_date, previous_hashes):
+        future = concurrent.futures.Future()
+        future.set_result(([(text, 1)], frozenset([text.encode('utf-8')])))
+        return future
+
+    def __fake_process_source(self, source, context=None):
+        url = source.get_url()
+        if url == 'broken':
+            raise IOError('Could not reach source.')
+        elif url == 'slow':
+            time.sleep(0.05)
+
+        return [url + ' 1', url + ' 2']
@@ -0,0 +1,180 @@
+"""Pool of worker processes parsing fetched feeds into rows ready to be persisted.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import concurrent.futures
+
+import persist
+import template_method
+
+
+# Seen links copied into each worker process when it starts.
+worker_seen_links = None
+
+
+def initialize_worker(seen):
+    """Prepare a worker process to skip articles already stored.
+
+    Args:
+        seen: The seen_links.SeenLinks as of the start of the crawl or None to parse every item.
+    """
+    global worker_seen_links
+    worker_seen_links = seen
+
+
+def parse_rows(text, strategy, crawl_date):
+    """Parse the contents of a feed into rows for persist.persist_rows.
+
+    Runs in a worker process. Rows rather than Article instances are returned as they are smaller
+    to send back to the parent process.
+
+    Args:
+        text: The string contents of the feed.
+        strategy: The ParseStrategy by which to parse the feed.
+        crawl_date: The datetime.datetime at which the feed was downloaded.
+    Returns:
+        List of row tuples from persist.serialize_article_to_values.
+    """
+    articles = template_method.parse_text(
+        text,
+        strategy,
+        seen_links=worker_seen_links,
+        crawl_date=crawl_date
+    )
+    return [persist.serialize_article_to_values(article) for article in articles]
+
+
+def parse_changed_rows(text, strategy, crawl_date, previous_hashes):
+    """Parse the new or changed items of a feed into rows for persist.persist_rows.
+
+    Runs in a worker process, doing the work of parse_rows with the per item filter of a
+    feed_cache.FeedCache which stays in the parent process.
+
+    Args:
+        text: The string contents of the feed.
+        strategy: The ParseStrategy by which to parse the feed.
+        crawl_date: The datetime.datetime at which the feed was downloaded.
+        previous_hashes: frozenset of hashes from feed_cache.hash_item for the items in the last
+            parse of the feed, which are skipped.
+    Returns:
+        Tuple of the list of row tuples for items not among previous_hashes and the frozenset of
+        hashes of every item in the feed.
+    """
+    item_hashes = set()
+    items_raw = template_method.filter_item_hashes(
+        strategy.iter_items(text),
+        previous_hashes,
+        item_hashes
+    )
+    articles = template_method.transform_items(
+        items_raw,
+        strategy,
+        seen_links=worker_seen_links,
+        crawl_date=crawl_date
+    )
+    rows = [persist.serialize_article_to_values(article) for article in articles]
+    return (rows, frozenset(item_hashes))
+
+
+def parse_job(job):
+    """Parse a feed described as a single tuple for use with ParsePool.map.
+
+    Args:
+        job: Tuple of the string contents of a feed, its ParseStrategy and the datetime.datetime
+            at which it was downloaded.
+    Returns:
+        List of row tuples from persist.serialize_article_to_values.
+    """
+    (text, strategy, crawl_date) = job
+    return parse_rows(text, strategy, crawl_date)
+
+
+class ParsePool:
+    """Pool of processes running the CPU bound parse and transform of feeds off the GIL.
+
+    Feeds are fetched by the parent process and their contents sent to workers, which send back
+    compact rows. Strategies are sent by pickling their spec.
+    """
+
+    def __init__(self, processes=None, seen=None):
+        """Start the worker processes.
+
+        Args:
+            processes: The number of worker processes or None for one per core.
+            seen: Optional seen_links.SeenLinks with articles already stored. A copy is sent to
+                each worker once so that items already stored are skipped before transforming.
+        """
+        self.__executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=initialize_worker,
+            initargs=(seen,)
+        )
+
+    def submit(self, text, strategy, crawl_date):
+        """Queue a feed to be parsed.
+
+        Args:
+            text: The string contents of the feed.
+            strategy: The ParseStrategy by which to parse the feed.
+            crawl_date: The datetime.datetime at which the feed was downloaded.
+        Returns:
+            concurrent.futures.Future resolving to a list of row tuples.
+        """
+        return self.__executor.submit(parse_rows, text, strategy, crawl_date)
+
+    def submit_changed(self, text, strategy, crawl_date, previous_hashes):
+        """Queue a feed to be parsed, skipping the items unchanged since its last parse.
+
+        Args:
+            text: The string contents of the feed.
+            strategy: The ParseStrategy by which to parse the feed.
+            crawl_date: The datetime.datetime at which the feed was downloaded.
+            previous_hashes: frozenset of item hashes from feed_cache.FeedCache.get_item_hashes.
+        Returns:
+            concurrent.futures.Future resolving to a tuple of a list of row tuples and the
+            frozenset of hashes of every item in the feed.
+        """
+        return self.__executor.submit(
+            parse_changed_rows,
+            text,
+            strategy,
+            crawl_date,
+            previous_hashes
+        )
+
+    def map(self, jobs, chunksize=1, function=parse_job):
+        """Parse many feeds, such as a backfill of archived snapshots.
+
+        Args:
+            jobs: Iterable over tuples of feed contents, ParseStrategy and datetime.datetime at
+                which the feed was downloaded.
+            chunksize: The number of jobs sent to a worker at a time.
+            function: Module level function run in a worker on each job and returning a list of
+                row tuples. Defaults to parse_job.
+        Returns:
+            Iterable over a list of row tuples for each job in the order given.
+        """
+        return self.__executor.map(function, jobs, chunksize=chunksize)
+
+    def close(self):
+        """Wait for queued feeds to be parsed and stop the worker processes."""
+        self.__executor.shutdown()
@@ -0,0 +1,131 @@
+"""Benchmark of parsing synthetic feeds in process against parsing them on a process pool.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import argparse
+import datetime
+import os
+import timeit
+
+import parse_pool
+import strategies
+
+
+DEFAULT_FEEDS = 40
+ITEMS_PER_FEED = 200
+
+ITEM_TEMPLATE = '''
+<item>
+    <title>Committee revisits proposal %d</title>
+    <description><![CDATA[<p>The <a href="https://example.com">committee</a> said on
+    <em>Tuesday</em> that it would &ldquo;revisit&rdquo; proposal %d.</p>]]></description>
+    <pubDate>Mon, 20 May 2019 01:02:03 -0400</pubDate>
+    <guid>https://example.com/story/%d</guid>
+</item>
+'''
+
+CRAWL_DATE = datetime.datetime(2019, 5, 21, tzinfo=datetime.timezone.utc)
+
+
+def make_feed(feed_index):
+    """Create a synthetic RSS feed.
+
+    Args:
+        feed_index: Integer distinguishing this feed's links from other feeds.
+    Returns:
+        String RSS contents with ITEMS_PER_FEED items.
+    """
+    first = feed_index * ITEMS_PER_FEED
+    items = ''.join(ITEM_TEMPLATE % (i, i, i) for i in range(first, first + ITEMS_PER_FEED))
+    return '<?xml version="1.0"?><rss version="2.0"><channel>%s</channel></rss>' % items
+
+
+def parse_serially(jobs):
+    """Parse feeds one after another in this process as the crawler did before the pool.
+
+    Args:
+        jobs: List of tuples for parse_pool.parse_job.
+    Returns:
+        Integer number of rows parsed.
+    """
+    return sum(len(parse_pool.parse_job(job)) for job in jobs)
+
+
+def parse_in_pool(jobs, processes):
+    """Parse feeds across a pool of processes, including the cost of starting it.
+
+    Args:
+        jobs: List of tuples for parse_pool.parse_job.
+        processes: The number of worker processes.
+    Returns:
+        Integer number of rows parsed.
+    """
+    pool = parse_pool.ParsePool(processes)
+    count = sum(len(rows) for rows in pool.map(jobs))
+    pool.close()
+    return count
+
+
+def run_benchmarks(feeds=DEFAULT_FEEDS, processes=None):
+    """Compare parsing feeds in process to parsing on a pool of each size up to processes.
+
+    Args:
+        feeds: The number of synthetic feeds to parse.
+        processes: The largest pool to measure. Defaults to one process per core.
+    Returns:
+        List of dicts with the name of each benchmark and its items_per_second.
+    """
+    if processes is None:
+        processes = os.cpu_count()
+
+    strategy = strategies.CnnParseStrategy()
+    jobs = [(make_feed(i), strategy, CRAWL_DATE) for i in range(feeds)]
+    items = feeds * ITEMS_PER_FEED
+
+    cases = [('serial', lambda: parse_serially(jobs))]
+    pool_sizes = sorted(set([1, processes]))
+    for size in pool_sizes:
+        cases.append(('pool_%d' % size, lambda size=size: parse_in_pool(jobs, size)))
+
+    results = []
+    for (name, function) in cases:
+        seconds = timeit.timeit(function, number=1)
+        results.append({
+            'name': 'parse_pool.%s' % name,
+            'items_per_second': items / seconds
+        })
+
+    return results
+
+
+def main():
+    """Execute this script from the command line."""
+    parser = argparse.ArgumentParser(description='Benchmark parsing feeds on a process pool.')
+    parser.add_argument('--feeds', type=int, default=DEFAULT_FEEDS, help='Number of feeds.')
+    parser.add_argument('--processes', type=int, default=None, help='Largest pool measured.')
+    options = parser.parse_args()
+
+    for result in run_benchmarks(options.feeds, options.processes):
+        print('%-32s %12.1f items/s' % (result['name'], result['items_per_second']))
+
+
+if __name__ == '__main__':
+    main()
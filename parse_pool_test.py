@@ -0,0 +1,97 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import pickle
+import unittest
+
+import parse_pool
+import persist
+import seen_links
+import strategies
+
+
+FEED = '''<?xml version="1.0"?>
+<rss version="2.0">
+    <channel>
+        <item>
+            <title>Title 1</title>
+            <description><![CDATA[<p>Description 1</p>]]></description>
+            <pubDate>Mon, 20 May 2019 01:02:03 -0400</pubDate>
+            <guid>https://example.com/1</guid>
+        </item>
+        <item>
+            <title>Title 2</title>
+            <description>Description 2</description>
+            <pubDate>Mon, 20 May 2019 02:02:03 -0400</pubDate>
+            <guid>https://example.com/2</guid>
+        </item>
+    </channel>
+</rss>
+'''
+
+CRAWL_DATE = datetime.datetime(2019, 5, 21, tzinfo=datetime.timezone.utc)
+
+
+class ParsePoolTest(unittest.TestCase):
+
+    def test_parse_rows(self):
+        rows = parse_pool.parse_rows(FEED, strategies.CnnParseStrategy(), CRAWL_DATE)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][persist.SOURCE_COLUMN], 'CNN')
+        self.assertEqual(rows[0][persist.LINK_COLUMN], 'https://example.com/1')
+        self.assertEqual(rows[0][3], 'Description 1')
+        self.assertEqual(rows[0][5], 1558396800)
+
+    def test_parse_changed_rows(self):
+        strategy = strategies.CnnParseStrategy()
+        (rows, item_hashes) = parse_pool.parse_changed_rows(FEED, strategy, CRAWL_DATE, frozenset())
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(len(item_hashes), 2)
+
+        changed_feed = FEED.replace('Title 2', 'Title 2 updated')
+        (rows, changed_hashes) = parse_pool.parse_changed_rows(
+            changed_feed,
+            strategy,
+            CRAWL_DATE,
+            item_hashes
+        )
+        self.assertEqual([row[2] for row in rows], ['Title 2 updated'])
+        self.assertEqual(len(changed_hashes & item_hashes), 1)
+
+    def test_pool(self):
+        seen = seen_links.SeenLinks(seen_links.BloomFilter(capacity=100))
+        seen.add('CNN', 'https://example.com/1')
+
+        pool = parse_pool.ParsePool(processes=2, seen=seen)
+        future = pool.submit(FEED, strategies.CnnParseStrategy(), CRAWL_DATE)
+        mapped = list(pool.map([
+            (FEED, strategies.NewYorkTimesParseStrategy(), CRAWL_DATE),
+            (FEED, strategies.BbcParseStrategy(), CRAWL_DATE)
+        ]))
+        pool.close()
+
+        rows = future.result()
+        self.assertEqual([row[persist.LINK_COLUMN] for row in rows], ['https://example.com/2'])
+        self.assertEqual([row[0] for row in mapped[0]], ['New York Times'] * 2)
+        self.assertEqual(len(mapped[1]), 2)
+
+    def test_pickle_strategy(self):
+        strategy = pickle.loads(pickle.dumps(strategies.WsjParseStrategy('World')))
+        self.assertIsInstance(strategy, strategies.WsjParseStrategy)
+        self.assertEqual(strategy.get_source_feed(), 'World')
@@ -20,10 +20,28 @@ OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
-import datetime
 import os
 import sqlite3
+import time
 
+import dates
+import util
+
+
+DEFAULT_BATCH_SIZE = 5000
+SCHEMA_FILE = 'create_table.sql'
+METRICS_KEY = 'database'
+
+PRAGMAS = [
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA cache_size = -65536'
+]
+
+# Positions within the rows made by serialize_article_to_values.
+SOURCE_COLUMN = 0
+LINK_COLUMN = 6
 
 INSERT_SQL = '''
     INSERT INTO
@@ -48,51 +66,144 @@ INSERT_SQL = '''
             ?,
             ?
         )
+    ON CONFLICT (source, link) DO UPDATE SET
+        sourceFeed = excluded.sourceFeed,
+        title = excluded.title,
+        description = excluded.description,
+        publishDate = excluded.publishDate,
+        author = excluded.author
 '''
 
 
 def serialize_article_to_values(article):
-    """Serialize an article to a list of values.
+    """Serialize an article to a row of values.
 
     Args:
         article: The article to be serialized.
     Returns:
-        list of primitives that can be used with a DB API v2 compliant connection.
+        tuple of primitives that can be used with a DB API v2 compliant connection. Dates are
+        integer seconds since the Unix epoch with None for a missing publish date.
     """
     author = article.get_author()
-    author_str = author if author else ''
-
-    publish_date = article.get_publish_date()
-    publish_date_str = publish_date.isoformat() if publish_date else ''
 
-    crawl_date_str = article.get_crawl_date().isoformat()
-
-    return [
+    return (
         article.get_source(),
         article.get_source_feed(),
         article.get_title(),
         article.get_description(),
-        publish_date_str,
-        crawl_date_str,
+        dates.to_epoch(article.get_publish_date()),
+        dates.to_epoch(article.get_crawl_date()),
         article.get_link(),
-        author_str
-    ]
+        author if author else ''
+    )
+
+
+def persist_rows(rows, target_db, batch_size=DEFAULT_BATCH_SIZE, seen_links=None, metrics=None):
+    """Persist already serialized articles to a given database in bounded batches.
+
+    Args:
+        rows: Iterable over article values as produced by serialize_article_to_values. This may be
+            a generator which is consumed lazily such that only one batch is held in memory.
+        target_db: DB API v2 compliant connection to which the rows should be persisted.
+        batch_size: The maximum number of rows written per transaction.
+        seen_links: Optional seen_links.SeenLinks to which the articles of each batch are added
+            once that batch commits such that rows rolled back are not considered stored.
+        metrics: Optional metrics.Metrics recording the time taken to write each batch and the
+            rows written under METRICS_KEY. Time spent producing the rows is not included.
+    Returns:
+        The number of rows written.
+    """
+    cursor = target_db.cursor()
+    count = 0
+
+    for batch in util.chunk(rows, batch_size):
+        start = time.perf_counter()
+
+        try:
+            cursor.executemany(INSERT_SQL, batch)
+            target_db.commit()
+        except Exception:
+            target_db.rollback()
+            if metrics:
+                metrics.increment(METRICS_KEY, 'errors')
+            raise
 
+        if seen_links is not None:
+            for row in batch:
+                seen_links.add(row[SOURCE_COLUMN], row[LINK_COLUMN])
 
-def persist_articles(articles, target_db):
-    """Persist articles to a given database.
+        if metrics:
+            metrics.record(METRICS_KEY, 'persist', time.perf_counter() - start)
+            metrics.increment(METRICS_KEY, 'rows', len(batch))
+
+        count += len(batch)
+
+    return count
+
+
+def persist_articles(articles, target_db, batch_size=DEFAULT_BATCH_SIZE, seen_links=None,
+    metrics=None):
+    """Persist articles to a given database, committing as they arrive in bounded batches.
 
     Args:
-        articles: Iterable over Article to be saved.
+        articles: Iterable over Article to be saved. This may be a generator which is consumed
+            lazily such that only one batch of articles is held in memory at a time.
         target_db: DB API v2 compliant connection to which the articles should be persisted.
+        batch_size: The maximum number of articles written per transaction.
+        seen_links: Optional seen_links.SeenLinks to be kept up to date with articles committed.
+        metrics: Optional metrics.Metrics recording the time taken to write each batch.
+    Returns:
+        The number of articles written.
+    """
+    rows = map(serialize_article_to_values, articles)
+    return persist_rows(
+        rows,
+        target_db,
+        batch_size=batch_size,
+        seen_links=seen_links,
+        metrics=metrics
+    )
+
+
+def create_schema(target_db):
+    """Create the tables and indices in create_table.sql within an empty database.
+
+    Args:
+        target_db: The sqlite3 connection to the empty database.
+    """
+    parent_dir = os.path.dirname(os.path.realpath(__file__))
+    with open(os.path.join(parent_dir, SCHEMA_FILE)) as f:
+        target_db.executescript(f.read())
+
+
+def configure_db(target_db):
+    """Configure a sqlite connection for fast bulk writes.
+
+    Uses write ahead logging so that readers do not block the crawler and only syncs to disk at
+    checkpoints which remains safe against corruption under WAL.
+
+    Args:
+        target_db: The sqlite3 connection to configure.
+    Returns:
+        The same connection after configuration.
     """
     cursor = target_db.cursor()
 
-    for article in articles:
-        article_values = serialize_article_to_values(article)
-        cursor.execute(INSERT_SQL, article_values)
+    for pragma in PRAGMAS:
+        cursor.execute(pragma)
+
+    return target_db
+
 
-    target_db.commit()
+def get_db(loc):
+    """Open a crawler database at a given location.
+
+    Args:
+        loc: Path to the sqlite database file.
+    Returns:
+        DB API v2 compliant connection to the database, configured by configure_db.
+    """
+    return configure_db(sqlite3.connect(loc))
 
 
 def get_default_db():
@@ -103,4 +214,4 @@ def get_default_db():
     """
     parent_dir = os.path.dirname(os.path.realpath(__file__))
     loc = os.path.join(parent_dir, 'articles.db')
-    return sqlite3.connect(loc)
+    return get_db(loc)
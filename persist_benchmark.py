@@ -0,0 +1,222 @@
+"""Benchmark of article range queries on text dates against indexed epoch dates.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import argparse
+import random
+import sqlite3
+import timeit
+
+import dates
+
+
+DEFAULT_ROWS = 1000000
+DEFAULT_QUERIES = 20
+SOURCES = ['NPR', 'CNN', 'Vox', 'WSJ', 'BBC', 'Fox', 'Breitbart', 'Daily Mail', 'Drudge Report']
+START_EPOCH = 1546300800
+DAY_SECONDS = 86400
+RANGE_DAYS = 7
+SPAN_DAYS = 365
+
+CREATE_TEXT_SQL = '''
+    CREATE TABLE articles (
+        `source` TEXT,
+        `publishDate` TEXT,
+        `crawlDate` TEXT,
+        `link` TEXT
+    )
+'''
+
+CREATE_EPOCH_SQL = [
+    '''
+    CREATE TABLE articles (
+        `source` TEXT,
+        `publishDate` INTEGER,
+        `crawlDate` INTEGER,
+        `link` TEXT
+    )
+    ''',
+    '''CREATE INDEX articlesSourcePublishDate ON articles (source, publishDate)''',
+    '''CREATE INDEX articlesCrawlDate ON articles (crawlDate)'''
+]
+
+INSERT_SQL = 'INSERT INTO articles (source, publishDate, crawlDate, link) VALUES (?, ?, ?, ?)'
+
+SOURCE_RANGE_SQL = '''
+    SELECT count(*) FROM articles WHERE source = ? AND publishDate >= ? AND publishDate < ?
+'''
+
+CRAWL_RANGE_SQL = 'SELECT count(*) FROM articles WHERE crawlDate >= ? AND crawlDate < ?'
+
+
+def make_rows(count):
+    """Generate synthetic articles spread over a year of crawling.
+
+    Args:
+        count: The number of rows to generate.
+    Returns:
+        Iterable over tuples of source, publishDate epoch, crawlDate epoch and link.
+    """
+    generator = random.Random(count)
+    for i in range(count):
+        publish_date = START_EPOCH + generator.randrange(SPAN_DAYS * DAY_SECONDS)
+        crawl_date = publish_date + generator.randrange(DAY_SECONDS)
+        yield (generator.choice(SOURCES), publish_date, crawl_date, 'link %d' % i)
+
+
+def to_text_row(row):
+    """Convert a synthetic row to the ISO 8601 text dates stored before epoch integers.
+
+    Args:
+        row: Tuple of source, publishDate epoch, crawlDate epoch and link.
+    Returns:
+        Tuple with the dates as strings.
+    """
+    (source, publish_date, crawl_date, link) = row
+    return (
+        source,
+        dates.from_epoch(publish_date).isoformat(),
+        dates.from_epoch(crawl_date).isoformat(),
+        link
+    )
+
+
+def to_text_range(start, end):
+    """Convert an epoch range to the ISO 8601 strings compared against text dates.
+
+    Args:
+        start: Integer epoch inclusive start of the range.
+        end: Integer epoch exclusive end of the range.
+    Returns:
+        Tuple of string start and end.
+    """
+    return (dates.from_epoch(start).isoformat(), dates.from_epoch(end).isoformat())
+
+
+def build_db(schema, rows):
+    """Create an in memory database filled with rows.
+
+    Args:
+        schema: List of SQL statements creating the table and any indices.
+        rows: Iterable over row tuples to insert.
+    Returns:
+        The sqlite3 connection.
+    """
+    connection = sqlite3.connect(':memory:')
+    cursor = connection.cursor()
+    for sql in schema:
+        cursor.execute(sql)
+    cursor.executemany(INSERT_SQL, rows)
+    connection.commit()
+    return connection
+
+
+def make_ranges(number):
+    """Pick the week long date ranges each query covers.
+
+    Args:
+        number: The number of ranges.
+    Returns:
+        List of tuples of a source, integer epoch start and integer epoch end.
+    """
+    generator = random.Random(number)
+    ranges = []
+    for _ in range(number):
+        start = START_EPOCH + generator.randrange(SPAN_DAYS - RANGE_DAYS) * DAY_SECONDS
+        ranges.append((generator.choice(SOURCES), start, start + RANGE_DAYS * DAY_SECONDS))
+    return ranges
+
+
+def measure(connection, sql, parameters):
+    """Measure how many range queries per second a database answers.
+
+    Args:
+        connection: The sqlite3 connection to query.
+        sql: The string query.
+        parameters: List of parameter tuples, one per query.
+    Returns:
+        Float queries per second.
+    """
+    cursor = connection.cursor()
+
+    def run_queries():
+        for values in parameters:
+            cursor.execute(sql, values).fetchone()
+
+    seconds = timeit.timeit(run_queries, number=1)
+    return len(parameters) / seconds
+
+
+def run_benchmarks(rows=DEFAULT_ROWS, queries=DEFAULT_QUERIES):
+    """Compare range queries on unindexed text dates to indexed epoch dates.
+
+    Args:
+        rows: The number of articles in each database.
+        queries: The number of range queries to run per benchmark.
+    Returns:
+        List of dicts with the name of each benchmark and its items_per_second.
+    """
+    text_db = build_db([CREATE_TEXT_SQL], map(to_text_row, make_rows(rows)))
+    epoch_db = build_db(CREATE_EPOCH_SQL, make_rows(rows))
+
+    ranges = make_ranges(queries)
+    epoch_source = ranges
+    text_source = [(source,) + to_text_range(start, end) for (source, start, end) in ranges]
+    epoch_crawl = [(start, end) for (source, start, end) in ranges]
+    text_crawl = [to_text_range(start, end) for (source, start, end) in ranges]
+
+    cases = [
+        ('source_publish.text', text_db, SOURCE_RANGE_SQL, text_source),
+        ('source_publish.epoch', epoch_db, SOURCE_RANGE_SQL, epoch_source),
+        ('crawl.text', text_db, CRAWL_RANGE_SQL, text_crawl),
+        ('crawl.epoch', epoch_db, CRAWL_RANGE_SQL, epoch_crawl)
+    ]
+
+    results = []
+    for (name, connection, sql, parameters) in cases:
+        results.append({
+            'name': 'persist.%s' % name,
+            'items_per_second': measure(connection, sql, parameters)
+        })
+
+    text_db.close()
+    epoch_db.close()
+    return results
+
+
+def main():
+    """Execute this script from the command line."""
+    parser = argparse.ArgumentParser(description='Benchmark article date range queries.')
+    parser.add_argument(
+        '--rows',
+        type=int,
+        default=DEFAULT_ROWS,
+        help='Number of synthetic articles to query.'
+    )
+    args = parser.parse_args()
+
+    for result in run_benchmarks(args.rows):
+        print('%-32s %12.1f items/s' % (result['name'], result['items_per_second']))
+
+
+if __name__ == '__main__':
+    main()
@@ -17,13 +17,17 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
 import datetime
+import os
 import sqlite3
+import tempfile
 import unittest
 
 import dateutil.parser
 
+import metrics
 import model
 import persist
+import seen_links
 
 
 class PersistTest(unittest.TestCase):
@@ -37,12 +41,15 @@ class PersistTest(unittest.TestCase):
                 `sourceFeed` TEXT,
                 `title` TEXT,
                 `description` TEXT,
-                `publishDate` TEXT,
-                `crawlDate` TEXT,
+                `publishDate` INTEGER,
+                `crawlDate` INTEGER,
                 `link` TEXT,
                 `author` TEXT
             )
         ''')
+        cursor.execute('''
+            CREATE UNIQUE INDEX "articlesSourceLink" ON "articles" (`source`, `link`)
+        ''')
         self.__connection.commit()
         self.__test_article = model.Article(
             'source 1',
@@ -66,6 +73,7 @@ class PersistTest(unittest.TestCase):
         values = persist.serialize_article_to_values(self.__test_article)
         self.assertEquals(len(values), 8)
         self.assertEquals(values[2], 'title 1')
+        self.assertEquals(values[4], 1558395457)
 
     def test_persist_articles(self):
         persist.persist_articles(self.__test_articles, self.__connection)
@@ -73,3 +81,111 @@ class PersistTest(unittest.TestCase):
         cursor.execute('''SELECT title FROM articles''')
         results = cursor.fetchone()
         self.assertEquals(results[0], 'title 1')
+
+    def test_persist_articles_batches(self):
+        articles = (self.__make_article('link %d' % i) for i in range(5))
+        persist.persist_articles(articles, self.__connection, batch_size=2)
+        cursor = self.__connection.cursor()
+        cursor.execute('''SELECT count(*) FROM articles''')
+        results = cursor.fetchone()
+        self.assertEquals(results[0], 5)
+
+    def test_persist_articles_metrics(self):
+        articles = (self.__make_article('link %d' % i) for i in range(5))
+        crawl_metrics = metrics.Metrics()
+        persist.persist_articles(articles, self.__connection, batch_size=2, metrics=crawl_metrics)
+        histogram = crawl_metrics.get_histogram(persist.METRICS_KEY, 'persist')
+        self.assertEquals(histogram.get_count(), 3)
+        self.assertEquals(crawl_metrics.get_counter(persist.METRICS_KEY, 'rows'), 5)
+
+    def test_persist_articles_upsert(self):
+        persist.persist_articles(self.__test_articles, self.__connection)
+
+        updated_article = self.__make_article('test link', title='title 2')
+        persist.persist_articles([updated_article], self.__connection)
+
+        cursor = self.__connection.cursor()
+        cursor.execute('''SELECT title, crawlDate FROM articles''')
+        results = cursor.fetchall()
+        self.assertEquals(len(results), 1)
+        self.assertEquals(results[0][0], 'title 2')
+        self.assertEquals(results[0][1], 1558481857)
+
+    def test_persist_rows_rolls_back_failed_batch(self):
+        rows = [
+            persist.serialize_article_to_values(self.__make_article('link 1')),
+            persist.serialize_article_to_values(self.__make_article('link 2')),
+            persist.serialize_article_to_values(self.__make_article('link 3')),
+            ('source 1', 'too few values')
+        ]
+        crawl_metrics = metrics.Metrics()
+
+        with self.assertRaises(sqlite3.Error):
+            persist.persist_rows(rows, self.__connection, batch_size=2, metrics=crawl_metrics)
+
+        cursor = self.__connection.cursor()
+        cursor.execute('''SELECT link FROM articles ORDER BY link''')
+        results = cursor.fetchall()
+        self.assertEquals(results, [('link 1',), ('link 2',)])
+        self.assertEquals(crawl_metrics.get_counter(persist.METRICS_KEY, 'errors'), 1)
+        self.assertEquals(crawl_metrics.get_counter(persist.METRICS_KEY, 'rows'), 2)
+
+    def test_persist_articles_records_seen(self):
+        seen = seen_links.SeenLinks(seen_links.BloomFilter(capacity=100))
+        persist.persist_articles(self.__test_articles, self.__connection, seen_links=seen)
+        self.assertTrue(seen.contains('source 1', 'test link'))
+
+    def test_persist_rows_rolled_back_not_seen(self):
+        rows = [
+            persist.serialize_article_to_values(self.__make_article('link 1')),
+            persist.serialize_article_to_values(self.__make_article('link 2')),
+            persist.serialize_article_to_values(self.__make_article('link 3')),
+            ('source 1', 'too few values')
+        ]
+        seen = seen_links.SeenLinks(seen_links.BloomFilter(capacity=100))
+
+        with self.assertRaises(sqlite3.Error):
+            persist.persist_rows(rows, self.__connection, batch_size=2, seen_links=seen)
+
+        self.assertTrue(seen.contains('source 1', 'link 1'))
+        self.assertTrue(seen.contains('source 1', 'link 2'))
+        self.assertFalse(seen.contains('source 1', 'link 3'))
+
+    def test_persist_articles_failed_generator_not_seen(self):
+        def articles():
+            yield self.__make_article('link 1')
+            raise IOError('Could not reach source.')
+
+        seen = seen_links.SeenLinks(seen_links.BloomFilter(capacity=100))
+        with self.assertRaises(IOError):
+            persist.persist_articles(articles(), self.__connection, seen_links=seen)
+
+        self.assertFalse(seen.contains('source 1', 'link 1'))
+
+    def test_configure_db(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            connection = persist.get_db(os.path.join(temp_dir, 'articles.db'))
+            cursor = connection.cursor()
+
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEquals(cursor.fetchone()[0], 'wal')
+            cursor.execute('PRAGMA synchronous')
+            self.assertEquals(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA temp_store')
+            self.assertEquals(cursor.fetchone()[0], 2)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEquals(cursor.fetchone()[0], -65536)
+
+            connection.close()
+
+    def __make_article(self, link, title='title 1'):
+        return model.Article(
+            'source 1',
+            'source.feed',
+            title,
+            'description 1',
+            dateutil.parser.parse('2019-05-20T23:37:37.294816Z'),
+            datetime.datetime.now(datetime.timezone.utc),
+            link,
+            'test author'
+        )
@@ -0,0 +1,355 @@
+"""Adaptive crawl scheduler polling each source about as often as it publishes new articles.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import heapq
+import logging
+import threading
+import time
+
+
+DEFAULT_MIN_INTERVAL = 15 * 60
+DEFAULT_MAX_INTERVAL = 24 * 60 * 60
+DEFAULT_INTERVAL = 60 * 60
+DEFAULT_TARGET_ITEMS = 5
+DEFAULT_SMOOTHING = 0.3
+BACKOFF_FACTOR = 2
+
+CREATE_SQL = '''
+    CREATE TABLE IF NOT EXISTS crawlSchedule (
+        `url` TEXT PRIMARY KEY,
+        `rate` REAL,
+        `interval` REAL,
+        `nextDue` REAL,
+        `lastCrawl` REAL
+    )
+'''
+
+SELECT_SQL = '''
+    SELECT
+        url,
+        rate,
+        interval,
+        nextDue,
+        lastCrawl
+    FROM
+        crawlSchedule
+'''
+
+UPSERT_SQL = '''
+    INSERT INTO
+        crawlSchedule (
+            url,
+            rate,
+            interval,
+            nextDue,
+            lastCrawl
+        )
+    VALUES
+        (
+            ?,
+            ?,
+            ?,
+            ?,
+            ?
+        )
+    ON CONFLICT (url) DO UPDATE SET
+        rate = excluded.rate,
+        interval = excluded.interval,
+        nextDue = excluded.nextDue,
+        lastCrawl = excluded.lastCrawl
+'''
+
+logger = logging.getLogger(__name__)
+
+
+class SourceState:
+    """Record of how often a feed publishes and when it should next be crawled."""
+
+    def __init__(self, url, rate, interval, next_due, last_crawl):
+        """Create a new record of a feed's schedule.
+
+        Args:
+            url: String URL of the feed.
+            rate: Smoothed float new items per second or None if not yet observed.
+            interval: Float seconds to wait between crawls of the feed.
+            next_due: Float seconds since the epoch at which the feed should next be crawled.
+            last_crawl: Float seconds since the epoch of the last crawl or None if never crawled.
+        """
+        self.__url = url
+        self.__rate = rate
+        self.__interval = interval
+        self.__next_due = next_due
+        self.__last_crawl = last_crawl
+
+    def get_url(self):
+        """Get the URL of the feed.
+
+        Returns:
+            String URL.
+        """
+        return self.__url
+
+    def get_rate(self):
+        """Get how quickly the feed publishes new items.
+
+        Returns:
+            Exponentially weighted moving average of new items per second or None if the feed has
+            not been crawled twice.
+        """
+        return self.__rate
+
+    def get_interval(self):
+        """Get how long to wait between crawls of the feed.
+
+        Returns:
+            Float seconds between crawls.
+        """
+        return self.__interval
+
+    def get_next_due(self):
+        """Get when the feed should next be crawled.
+
+        Returns:
+            Float seconds since the epoch.
+        """
+        return self.__next_due
+
+    def get_last_crawl(self):
+        """Get when the feed was last crawled.
+
+        Returns:
+            Float seconds since the epoch or None if never crawled.
+        """
+        return self.__last_crawl
+
+
+class Scheduler:
+    """Priority queue of news sources ordered by when each is next due to be crawled.
+
+    Each source is polled often enough to expect a target number of new items per crawl given its
+    observed publishing rate, bounded between a minimum and maximum interval. Schedules are saved
+    in the articles database so that a restarted crawler picks up where it left off.
+    """
+
+    def __init__(self, news_sources, target_db, min_interval=DEFAULT_MIN_INTERVAL,
+        max_interval=DEFAULT_MAX_INTERVAL, target_items=DEFAULT_TARGET_ITEMS,
+        smoothing=DEFAULT_SMOOTHING, now=None):
+        """Load the saved schedules for a set of news sources.
+
+        Args:
+            news_sources: Iterable over NewsSource to be scheduled.
+            target_db: DB API v2 compliant connection in which schedules are saved.
+            min_interval: The fewest seconds to wait between crawls of a source.
+            max_interval: The most seconds to wait between crawls of a source.
+            target_items: The number of new items ideally found in each crawl of a source.
+            smoothing: Weight between 0 and 1 given to the newest observed rate over history.
+            now: Float seconds since the epoch or None to use the current time. Sources without a
+                saved schedule are due at this time.
+        """
+        if now is None:
+            now = time.time()
+
+        self.__db = target_db
+        self.__min_interval = min_interval
+        self.__max_interval = max_interval
+        self.__target_items = target_items
+        self.__smoothing = smoothing
+        self.__lock = threading.Lock()
+
+        cursor = self.__db.cursor()
+        cursor.execute(CREATE_SQL)
+        cursor.execute(SELECT_SQL)
+        saved = {row[0]: SourceState(*row) for row in cursor}
+
+        self.__sources = {}
+        self.__states = {}
+        self.__queue = []
+        default_interval = self.__clamp(DEFAULT_INTERVAL)
+        for source in news_sources:
+            url = source.get_url()
+            state = saved.get(url, SourceState(url, None, default_interval, now, None))
+            self.__sources[url] = source
+            self.__states[url] = state
+            self.__queue.append((state.get_next_due(), url))
+
+        heapq.heapify(self.__queue)
+
+    def get_state(self, url):
+        """Get the schedule of a feed.
+
+        Args:
+            url: String URL of the feed.
+        Returns:
+            SourceState of the feed.
+        """
+        with self.__lock:
+            return self.__states[url]
+
+    def get_next_due(self):
+        """Get when the next source is due to be crawled.
+
+        Returns:
+            Float seconds since the epoch or None if no sources are waiting to be crawled.
+        """
+        with self.__lock:
+            return self.__queue[0][0] if self.__queue else None
+
+    def pop_due(self, now=None):
+        """Remove every source due to be crawled from the queue.
+
+        Each source popped should be passed back to record or retry once crawled.
+
+        Args:
+            now: Float seconds since the epoch or None to use the current time.
+        Returns:
+            List of NewsSource due to be crawled, most overdue first.
+        """
+        if now is None:
+            now = time.time()
+
+        due = []
+        with self.__lock:
+            while self.__queue and self.__queue[0][0] <= now:
+                (_, url) = heapq.heappop(self.__queue)
+                due.append(self.__sources[url])
+
+        return due
+
+    def record(self, source, new_items, now=None):
+        """Update a source's publishing rate after a crawl and schedule its next crawl.
+
+        Args:
+            source: The NewsSource which was crawled.
+            new_items: The number of items in the feed not seen in earlier crawls.
+            now: Float seconds since the epoch or None to use the current time.
+        """
+        if now is None:
+            now = time.time()
+
+        url = source.get_url()
+        with self.__lock:
+            state = self.__states[url]
+            rate = state.get_rate()
+            last_crawl = state.get_last_crawl()
+
+            if last_crawl is not None and now > last_crawl:
+                observed = new_items / (now - last_crawl)
+                if rate is None:
+                    rate = observed
+                else:
+                    rate = self.__smoothing * observed + (1 - self.__smoothing) * rate
+
+            interval = self.__choose_interval(rate, state.get_interval())
+            self.__schedule(SourceState(url, rate, interval, now + interval, now))
+
+    def retry(self, source, now=None):
+        """Schedule a source whose crawl failed to be tried again after the minimum interval.
+
+        Its publishing rate is left unchanged.
+
+        Args:
+            source: The NewsSource which could not be crawled.
+            now: Float seconds since the epoch or None to use the current time.
+        """
+        if now is None:
+            now = time.time()
+
+        url = source.get_url()
+        with self.__lock:
+            state = self.__states[url]
+            self.__schedule(SourceState(
+                url,
+                state.get_rate(),
+                state.get_interval(),
+                now + self.__min_interval,
+                state.get_last_crawl()
+            ))
+
+    def save(self):
+        """Write the schedules back to the database."""
+        with self.__lock:
+            rows = [
+                (
+                    state.get_url(),
+                    state.get_rate(),
+                    state.get_interval(),
+                    state.get_next_due(),
+                    state.get_last_crawl()
+                )
+                for state in self.__states.values()
+            ]
+
+        cursor = self.__db.cursor()
+        cursor.executemany(UPSERT_SQL, rows)
+        self.__db.commit()
+
+    def run(self, crawl_due, stop, clock=time.time):
+        """Crawl sources as they become due until asked to stop.
+
+        Args:
+            crawl_due: Function taking a list of NewsSource, crawling them and returning a dict
+                from each source's URL to the number of new items found. Sources missing from the
+                dict are retried later.
+            stop: threading.Event which ends the loop once set, interrupting any wait.
+            clock: Function returning the current float seconds since the epoch.
+        """
+        while not stop.is_set():
+            due = self.pop_due(clock())
+
+            if due:
+                try:
+                    counts = crawl_due(due)
+                except Exception:
+                    logger.exception('Failed to crawl %d due sources.', len(due))
+                    counts = {}
+
+                now = clock()
+                for source in due:
+                    new_items = counts.get(source.get_url())
+                    if new_items is None:
+                        self.retry(source, now)
+                    else:
+                        self.record(source, new_items, now)
+
+                self.save()
+            else:
+                next_due = self.get_next_due()
+                if next_due is None:
+                    return
+
+                stop.wait(max(next_due - clock(), 0))
+
+    def __choose_interval(self, rate, interval):
+        if rate is None:
+            return self.__clamp(interval)
+        elif rate <= 0:
+            return self.__clamp(interval * BACKOFF_FACTOR)
+        else:
+            return self.__clamp(self.__target_items / rate)
+
+    def __clamp(self, interval):
+        return min(max(interval, self.__min_interval), self.__max_interval)
+
+    def __schedule(self, state):
+        self.__states[state.get_url()] = state
+        heapq.heappush(self.__queue, (state.get_next_due(), state.get_url()))
@@ -0,0 +1,122 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import sqlite3
+import threading
+import unittest
+import unittest.mock
+
+import news_crawler
+import scheduler
+import sources
+
+
+class SchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__connection = sqlite3.connect(':memory:')
+        self.__fast = sources.NewsSource('fast', None)
+        self.__slow = sources.NewsSource('slow', None)
+        self.__scheduler = self.__make_scheduler()
+
+    def test_new_sources_due(self):
+        self.assertEqual(self.__scheduler.get_next_due(), 0)
+        due = self.__scheduler.pop_due(0)
+        self.assertEqual([source.get_url() for source in due], ['fast', 'slow'])
+        self.assertIsNone(self.__scheduler.get_next_due())
+
+    def test_record_adapts_interval(self):
+        self.__crawl_round({'fast': 20, 'slow': 20}, 0)
+        self.assertEqual(self.__scheduler.get_state('fast').get_interval(), 3600)
+
+        self.__crawl_round({'fast': 20, 'slow': 0}, 3600)
+        self.assertEqual(self.__scheduler.get_state('fast').get_interval(), 900)
+        self.assertEqual(self.__scheduler.get_state('slow').get_interval(), 7200)
+        self.assertEqual(self.__scheduler.get_next_due(), 3600 + 900)
+
+        for now in range(3600 + 7200, 86400 * 7, 7200):
+            self.__scheduler.record(self.__slow, 0, now)
+
+        self.assertEqual(self.__scheduler.get_state('slow').get_interval(), 86400)
+        self.assertAlmostEqual(self.__scheduler.get_state('fast').get_rate(), 20 / 3600)
+
+    def test_retry(self):
+        self.__scheduler.pop_due(0)
+        self.__scheduler.retry(self.__fast, 100)
+        self.assertEqual(self.__scheduler.get_state('fast').get_next_due(), 100 + 900)
+        self.assertIsNone(self.__scheduler.get_state('fast').get_last_crawl())
+
+    def test_save(self):
+        self.__crawl_round({'fast': 20, 'slow': 20}, 0)
+        self.__crawl_round({'fast': 20, 'slow': 0}, 3600)
+        self.__scheduler.save()
+
+        reloaded = self.__make_scheduler()
+        self.assertEqual(reloaded.get_state('slow').get_interval(), 7200)
+        self.assertEqual(reloaded.pop_due(3600 + 900), [self.__fast])
+
+    def test_run(self):
+        stop = threading.Event()
+        rounds = []
+
+        def crawl_due(due_sources):
+            rounds.append([source.get_url() for source in due_sources])
+            if len(rounds) == 2:
+                stop.set()
+            return {'fast': 1}
+
+        times = iter([0, 0, 0, 900, 900])
+        self.__scheduler.run(crawl_due, stop, clock=lambda: next(times, 900))
+
+        self.assertEqual(rounds, [['fast', 'slow'], ['slow']])
+        self.assertEqual(self.__scheduler.get_state('fast').get_next_due(), 3600)
+        self.assertEqual(self.__scheduler.get_state('slow').get_next_due(), 900 + 900)
+        self.assertIsNone(self.__scheduler.get_state('slow').get_last_crawl())
+
+    def test_run_retries_failed_source(self):
+        stop = threading.Event()
+        interval = self.__scheduler.get_state('slow').get_interval()
+
+        def crawl_due(due_sources):
+            stop.set()
+            return news_crawler.crawl_due_sources(due_sources, None)
+
+        with unittest.mock.patch('news_crawler.process_source', self.__fake_process_source):
+            with unittest.mock.patch('persist.persist_articles', self.__fake_persist_articles):
+                self.__scheduler.run(crawl_due, stop, clock=lambda: 0)
+
+        self.assertEqual(self.__scheduler.get_state('fast').get_last_crawl(), 0)
+        self.assertEqual(self.__scheduler.get_state('slow').get_next_due(), 900)
+        self.assertEqual(self.__scheduler.get_state('slow').get_interval(), interval)
+        self.assertIsNone(self.__scheduler.get_state('slow').get_last_crawl())
+
+    def __fake_process_source(self, source, context=None):
+        if source.get_url() == 'slow':
+            raise IOError('Could not reach source.')
+
+        return ['fast 1']
+
+    def __fake_persist_articles(self, articles, target_db, seen_links=None, metrics=None):
+        return len(list(articles))
+
+    def __crawl_round(self, counts, now):
+        for source in self.__scheduler.pop_due(now):
+            self.__scheduler.record(source, counts[source.get_url()], now)
+
+    def __make_scheduler(self):
+        return scheduler.Scheduler([self.__fast, self.__slow], self.__connection, now=0)
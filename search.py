@@ -0,0 +1,307 @@
+"""Full text search over article titles and descriptions using an SQLite FTS5 index.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import argparse
+
+import dates
+import persist
+
+
+DEFAULT_LIMIT = 20
+SNIPPET_TOKENS = 16
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+CREATE_SEARCH_SQL = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS articlesSearch USING fts5(
+        title,
+        description,
+        content='articles',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articlesSearchInsert AFTER INSERT ON articles BEGIN
+        INSERT INTO articlesSearch (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articlesSearchDelete AFTER DELETE ON articles BEGIN
+        INSERT INTO articlesSearch (articlesSearch, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS articlesSearchUpdate AFTER UPDATE OF title, description ON articles
+    BEGIN
+        INSERT INTO articlesSearch (articlesSearch, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO articlesSearch (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    '''
+]
+
+REBUILD_SQL = '''INSERT INTO articlesSearch (articlesSearch) VALUES ('rebuild')'''
+
+OPTIMIZE_SQL = '''INSERT INTO articlesSearch (articlesSearch) VALUES ('optimize')'''
+
+SEARCH_SQL = '''
+    SELECT
+        articles.id,
+        articles.source,
+        articles.title,
+        articles.link,
+        articles.publishDate,
+        snippet(articlesSearch, 1, ?, ?, '...', ?),
+        bm25(articlesSearch, ?, ?) AS score
+    FROM
+        articlesSearch
+    INNER JOIN
+        articles
+    ON
+        articles.id = articlesSearch.rowid
+    WHERE
+        articlesSearch MATCH ?
+        %s
+    ORDER BY
+        score
+    LIMIT ?
+'''
+
+SOURCE_FILTER_SQL = 'AND articles.source = ?'
+
+
+class SearchResult:
+    """An article matching a search along with how well it matched."""
+
+    __slots__ = (
+        '__article_id',
+        '__source',
+        '__title',
+        '__link',
+        '__publish_date',
+        '__snippet',
+        '__score'
+    )
+
+    def __init__(self, article_id, source, title, link, publish_date, snippet, score):
+        """Create a new search result record.
+
+        Args:
+            article_id: The integer id of the article in the articles table.
+            source: The name of the news source that published the article.
+            title: The title of the article.
+            link: The URL of the article.
+            publish_date: The datetime.datetime the article was published or None if unknown.
+            snippet: Excerpt of the description around the matched terms.
+            score: Float bm25 score where lower values are better matches.
+        """
+        self.__article_id = article_id
+        self.__source = source
+        self.__title = title
+        self.__link = link
+        self.__publish_date = publish_date
+        self.__snippet = snippet
+        self.__score = score
+
+    def get_article_id(self):
+        """Get the id of the matching article.
+
+        Returns:
+            Integer id in the articles table.
+        """
+        return self.__article_id
+
+    def get_source(self):
+        """Get the name of the news source that published the article.
+
+        Returns:
+            The name of the news source like "NPR".
+        """
+        return self.__source
+
+    def get_title(self):
+        """Get the title of the matching article.
+
+        Returns:
+            String article title.
+        """
+        return self.__title
+
+    def get_link(self):
+        """Get the URL of the matching article.
+
+        Returns:
+            String URL.
+        """
+        return self.__link
+
+    def get_publish_date(self):
+        """Get the date the article was published.
+
+        Returns:
+            datetime.datetime in UTC or None if the feed did not provide a date.
+        """
+        return self.__publish_date
+
+    def get_snippet(self):
+        """Get an excerpt of the description with matched terms highlighted.
+
+        Returns:
+            String excerpt.
+        """
+        return self.__snippet
+
+    def get_score(self):
+        """Get the bm25 relevance of the article to the query.
+
+        Returns:
+            Float score where lower (more negative) values are better matches.
+        """
+        return self.__score
+
+
+def create_search_index(target_db):
+    """Create the search index and the triggers keeping it in sync with articles if missing.
+
+    The index refers to articles by their id column so databases from before it was added must
+    be migrated first.
+
+    Args:
+        target_db: DB API v2 compliant connection to the sqlite database.
+    """
+    cursor = target_db.cursor()
+    for sql in CREATE_SEARCH_SQL:
+        cursor.execute(sql)
+
+
+def rebuild(target_db):
+    """Rebuild the search index from the articles table.
+
+    Needed for databases whose articles were persisted before the index existed.
+
+    Args:
+        target_db: DB API v2 compliant connection to the sqlite database.
+    """
+    cursor = target_db.cursor()
+    cursor.execute(REBUILD_SQL)
+    cursor.execute(OPTIMIZE_SQL)
+    target_db.commit()
+
+
+def escape_query(text):
+    """Convert free text into an FTS5 query matching all of its terms.
+
+    Each term is quoted so punctuation in user input is not read as query syntax.
+
+    Args:
+        text: String free text like a headline fragment.
+    Returns:
+        String FTS5 query.
+    """
+    terms = ['"%s"' % term.replace('"', '""') for term in text.split()]
+    return ' '.join(terms)
+
+
+def search(target_db, query, limit=DEFAULT_LIMIT, source=None, highlight=('[', ']')):
+    """Find the articles best matching a query by bm25 with titles weighted above descriptions.
+
+    Args:
+        target_db: DB API v2 compliant connection to the sqlite database.
+        query: String FTS5 query like "election AND (senate OR house)". Use escape_query for
+            free text.
+        limit: The maximum number of results to return.
+        source: Optional name of a news source like "NPR" to which results are restricted.
+        highlight: Tuple of strings placed before and after matched terms in snippets.
+    Returns:
+        List of SearchResult from best to worst match.
+    """
+    (highlight_start, highlight_end) = highlight
+    parameters = [
+        highlight_start,
+        highlight_end,
+        SNIPPET_TOKENS,
+        TITLE_WEIGHT,
+        DESCRIPTION_WEIGHT,
+        query
+    ]
+
+    if source is None:
+        sql = SEARCH_SQL % ''
+    else:
+        sql = SEARCH_SQL % SOURCE_FILTER_SQL
+        parameters.append(source)
+
+    parameters.append(limit)
+
+    cursor = target_db.cursor()
+    cursor.execute(sql, parameters)
+    return [
+        SearchResult(
+            article_id,
+            result_source,
+            title,
+            link,
+            dates.from_epoch(publish_date),
+            snippet,
+            score
+        )
+        for (article_id, result_source, title, link, publish_date, snippet, score) in cursor
+    ]
+
+
+def main():
+    """Execute this script from the command line."""
+    parser = argparse.ArgumentParser(description='Search crawled articles.')
+    parser.add_argument('terms', nargs='*', help='Words to find in titles and descriptions.')
+    parser.add_argument('--db', default=None, help='Path to the database. Defaults to articles.db.')
+    parser.add_argument('--source', default=None, help='Only return articles from this source.')
+    parser.add_argument('--limit', type=int, default=DEFAULT_LIMIT, help='Maximum results.')
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Create the index if needed and rebuild it from the articles table.'
+    )
+    options = parser.parse_args()
+
+    db = persist.get_db(options.db) if options.db else persist.get_default_db()
+
+    if options.rebuild:
+        create_search_index(db)
+        rebuild(db)
+
+    if options.terms:
+        query = escape_query(' '.join(options.terms))
+        for result in search(db, query, options.limit, options.source):
+            print('%s\t%s\t%s' % (result.get_source(), result.get_title(), result.get_link()))
+            print('\t%s' % result.get_snippet())
+
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import os
+import sqlite3
+import unittest
+
+import model
+import persist
+import search
+
+
+class SearchTest(unittest.TestCase):
+
+    def setUp(self):
+        parent_dir = os.path.dirname(os.path.realpath(__file__))
+        with open(os.path.join(parent_dir, 'create_table.sql')) as f:
+            create_sql = f.read()
+
+        self.__connection = sqlite3.connect(':memory:')
+        self.__connection.executescript(create_sql)
+
+        self.__persist('NPR', 'link 1', 'Senate passes budget', 'The vote was close.')
+        self.__persist('BBC', 'link 2', 'Storm hits coast', 'The senate will debate relief.')
+        self.__persist('NPR', 'link 3', 'Café reopens', 'Coffee is back downtown.')
+
+    def test_search_ranks_titles_first(self):
+        results = search.search(self.__connection, 'senate')
+        self.assertEqual([result.get_link() for result in results], ['link 1', 'link 2'])
+        self.assertEqual(results[1].get_snippet(), 'The [senate] will debate relief.')
+        self.assertEqual(results[0].get_publish_date().year, 2019)
+
+    def test_search_source(self):
+        results = search.search(self.__connection, 'senate', source='BBC')
+        self.assertEqual([result.get_link() for result in results], ['link 2'])
+
+    def test_search_diacritics(self):
+        results = search.search(self.__connection, search.escape_query('cafe'))
+        self.assertEqual([result.get_link() for result in results], ['link 3'])
+
+    def test_search_follows_upsert(self):
+        self.__persist('NPR', 'link 1', 'House passes budget', 'The vote was close.')
+        results = search.search(self.__connection, 'senate')
+        self.assertEqual([result.get_link() for result in results], ['link 2'])
+
+        results = search.search(self.__connection, 'house')
+        self.assertEqual([result.get_link() for result in results], ['link 1'])
+
+    def test_rebuild(self):
+        self.__connection.execute('''DELETE FROM articlesSearch''')
+        self.assertEqual(search.search(self.__connection, 'senate'), [])
+
+        search.rebuild(self.__connection)
+        self.assertEqual(len(search.search(self.__connection, 'senate')), 2)
+
+    def test_escape_query(self):
+        self.assertEqual(search.escape_query('say "hi" AND'), '"say" """hi""" "AND"')
+        results = search.search(self.__connection, search.escape_query('"budget'))
+        self.assertEqual([result.get_link() for result in results], ['link 1'])
+
+    def __persist(self, source, link, title, description):
+        date = datetime.datetime(2019, 5, 20, tzinfo=datetime.timezone.utc)
+        article = model.Article(source, '', title, description, date, date, link, 'author')
+        persist.persist_articles([article], self.__connection)
@@ -0,0 +1,330 @@
+"""Compact set of articles already stored, used to skip transforming known items.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import hashlib
+import math
+import os
+import struct
+
+
+DEFAULT_CAPACITY = 2000000
+DEFAULT_ERROR_RATE = 0.000001
+
+HEADER_FORMAT = '<4sQdQQQqq'
+MAGIC = b'WWT2'
+
+SELECT_FINGERPRINT_SQL = '''
+    SELECT
+        count(*),
+        coalesce(max(rowid), 0)
+    FROM
+        articles
+'''
+
+SELECT_KEYS_SQL = '''
+    SELECT
+        source,
+        link
+    FROM
+        articles
+'''
+
+
+class BloomFilter:
+    """Probabilistic set of byte strings with a fixed memory footprint.
+
+    Membership tests may report false positives at about the configured error rate while the
+    filter holds no more than its capacity but never report false negatives.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE, bits=None,
+        count=0):
+        """Create a new filter.
+
+        Args:
+            capacity: The number of keys the filter is sized to hold at the given error rate.
+            error_rate: The target probability of a false positive once at capacity.
+            bits: Optional bytearray with the contents of a previously saved filter of the same
+                capacity and error rate.
+            count: The number of keys already added to the given bits.
+        """
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+
+        self.__capacity = capacity
+        self.__error_rate = error_rate
+        self.__num_bits = num_bits
+        self.__num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self.__bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+        self.__count = count
+
+    def add(self, key):
+        """Add a key to the filter.
+
+        Args:
+            key: The bytes to add.
+        """
+        bits = self.__bits
+        for position in self.__get_positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+
+        self.__count += 1
+
+    def contains(self, key):
+        """Determine if a key may have been added to the filter.
+
+        Args:
+            key: The bytes to check.
+        Returns:
+            False if the key was definitely not added and True if it probably was.
+        """
+        bits = self.__bits
+        for position in self.__get_positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+    def get_count(self):
+        """Get the number of keys added.
+
+        Returns:
+            Integer count of calls to add, including repeated keys.
+        """
+        return self.__count
+
+    def is_saturated(self):
+        """Determine if the filter holds more keys than it was sized for.
+
+        Returns:
+            True if the false positive rate has risen above the configured error rate.
+        """
+        return self.__count > self.__capacity
+
+    def save(self, path, fingerprint):
+        """Write the filter to disk.
+
+        Args:
+            path: The file path at which the filter should be saved.
+            fingerprint: Tuple of two integers from get_fingerprint identifying the state of the
+                database the filter describes.
+        """
+        (num_articles, max_rowid) = fingerprint
+        header = struct.pack(
+            HEADER_FORMAT,
+            MAGIC,
+            self.__capacity,
+            self.__error_rate,
+            self.__count,
+            self.__num_bits,
+            self.__num_hashes,
+            num_articles,
+            max_rowid
+        )
+
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(self.__bits)
+
+        os.replace(temp_path, path)
+
+    def __get_positions(self, key):
+        digest = hashlib.blake2b(key, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.__num_bits
+        return ((first + i * second) % num_bits for i in range(self.__num_hashes))
+
+
+def load_bloom_filter(path, fingerprint=None):
+    """Read a filter written by BloomFilter.save.
+
+    Args:
+        path: The file path at which the filter was saved.
+        fingerprint: Optional tuple from get_fingerprint which the filter must have been saved
+            with. If not given, the filter is loaded regardless of the database it describes.
+    Returns:
+        The BloomFilter loaded.
+    Raises:
+        ValueError: The file is not a saved filter or was saved for a different database.
+    """
+    header_size = struct.calcsize(HEADER_FORMAT)
+
+    with open(path, 'rb') as f:
+        header = f.read(header_size)
+        bits = bytearray(f.read())
+
+    if len(header) != header_size:
+        raise ValueError('Truncated filter at %s.' % path)
+
+    (magic, capacity, error_rate, count, num_bits, num_hashes, num_articles, max_rowid) = (
+        struct.unpack(HEADER_FORMAT, header)
+    )
+
+    if magic != MAGIC or len(bits) != (num_bits + 7) // 8:
+        raise ValueError('Unrecognized filter at %s.' % path)
+
+    if fingerprint is not None and tuple(fingerprint) != (num_articles, max_rowid):
+        raise ValueError('Filter at %s was saved for a different database.' % path)
+
+    return BloomFilter(capacity, error_rate, bits=bits, count=count)
+
+
+class SeenLinks:
+    """Set of (source, link) pairs already written to the articles database."""
+
+    def __init__(self, bloom_filter=None):
+        """Create a new set of seen links.
+
+        Args:
+            bloom_filter: Optional BloomFilter holding links already seen. Starts empty if not
+                given.
+        """
+        self.__filter = bloom_filter if bloom_filter else BloomFilter()
+
+    def contains(self, source, link):
+        """Determine if an article was probably stored already.
+
+        Args:
+            source: The name of the agency that published the article.
+            link: The URL of the article.
+        Returns:
+            True if the article was probably stored already and False if it is new.
+        """
+        return self.__filter.contains(make_key(source, link))
+
+    def add(self, source, link):
+        """Record that an article was stored.
+
+        Args:
+            source: The name of the agency that published the article.
+            link: The URL of the article.
+        """
+        self.__filter.add(make_key(source, link))
+
+    def get_filter(self):
+        """Get the underlying filter.
+
+        Returns:
+            The BloomFilter holding seen links.
+        """
+        return self.__filter
+
+    def save(self, path, target_db):
+        """Write the seen links to disk along with the fingerprint of their database.
+
+        Args:
+            path: The file path at which the seen links should be saved.
+            target_db: DB API v2 compliant connection to the articles database the links were
+                stored in.
+        """
+        self.__filter.save(path, get_fingerprint(target_db))
+
+
+def make_key(source, link):
+    """Make the key under which an article is recorded.
+
+    Args:
+        source: The name of the agency that published the article.
+        link: The URL of the article.
+    Returns:
+        The bytes identifying the article.
+    """
+    return ('%s\n%s' % (source, link)).encode('utf-8')
+
+
+def get_fingerprint(target_db):
+    """Identify the state of an articles database cheaply.
+
+    A filter saved alongside one database is not trusted against another, like one which was
+    deleted and created again or replaced by a copy, as their fingerprints differ.
+
+    Args:
+        target_db: DB API v2 compliant connection to the articles database.
+    Returns:
+        Tuple of the number of articles and the largest rowid, which is zero if empty.
+    """
+    cursor = target_db.cursor()
+    cursor.execute(SELECT_FINGERPRINT_SQL)
+    (num_articles, max_rowid) = cursor.fetchone()
+    return (num_articles, max_rowid)
+
+
+def build_seen_links(target_db, capacity=DEFAULT_CAPACITY, error_rate=DEFAULT_ERROR_RATE):
+    """Build the seen links from the articles in a database.
+
+    Args:
+        target_db: DB API v2 compliant connection to the articles database.
+        capacity: The minimum number of links the filter should be sized for. This is doubled
+            until it is at least twice the number of articles already stored.
+        error_rate: The target probability of a false positive once at capacity.
+    Returns:
+        Newly built SeenLinks.
+    """
+    cursor = target_db.cursor()
+    cursor.execute('SELECT count(*) FROM articles')
+    num_articles = cursor.fetchone()[0]
+
+    while capacity < num_articles * 2:
+        capacity *= 2
+
+    seen_links = SeenLinks(BloomFilter(capacity, error_rate))
+
+    cursor.execute(SELECT_KEYS_SQL)
+    for (source, link) in cursor:
+        seen_links.add(source, link)
+
+    return seen_links
+
+
+def load_seen_links(target_db, path):
+    """Load seen links from disk, rebuilding from the database if stale, missing or saturated.
+
+    Saved links are stale if the database no longer has the fingerprint it had when they were
+    saved, such as after it was deleted, replaced or written to by another tool.
+
+    Args:
+        target_db: DB API v2 compliant connection to the articles database.
+        path: The file path at which the seen links were saved.
+    Returns:
+        SeenLinks for the articles already stored.
+    """
+    if os.path.exists(path):
+        try:
+            bloom_filter = load_bloom_filter(path, get_fingerprint(target_db))
+        except ValueError:
+            bloom_filter = None
+
+        if bloom_filter and not bloom_filter.is_saturated():
+            return SeenLinks(bloom_filter)
+
+    return build_seen_links(target_db)
+
+
+def get_default_path():
+    """Get the default location of the seen links, alongside the default database.
+
+    Returns:
+        String path to the seen links file.
+    """
+    parent_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(parent_dir, 'articles.seen')
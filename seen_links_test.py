@@ -0,0 +1,101 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import seen_links
+
+
+class SeenLinksTest(unittest.TestCase):
+
+    def test_bloom_filter(self):
+        bloom_filter = seen_links.BloomFilter(capacity=1000, error_rate=0.001)
+        for i in range(1000):
+            bloom_filter.add(b'added %d' % i)
+
+        for i in range(1000):
+            self.assertTrue(bloom_filter.contains(b'added %d' % i))
+
+        false_positives = sum(
+            1 for i in range(10000) if bloom_filter.contains(b'missing %d' % i)
+        )
+        self.assertTrue(false_positives < 50)
+        self.assertFalse(bloom_filter.is_saturated())
+
+    def __make_db(self, rows):
+        connection = sqlite3.connect(':memory:')
+        cursor = connection.cursor()
+        cursor.execute('CREATE TABLE articles (source TEXT, link TEXT)')
+        cursor.executemany('INSERT INTO articles VALUES (?, ?)', rows)
+        connection.commit()
+        return connection
+
+    def test_save_and_load(self):
+        seen = seen_links.SeenLinks(seen_links.BloomFilter(capacity=100))
+        seen.add('NPR', 'link 1')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'articles.seen')
+            seen.save(path, self.__make_db([('NPR', 'link 1')]))
+            loaded = seen_links.SeenLinks(seen_links.load_bloom_filter(path))
+
+        self.assertTrue(loaded.contains('NPR', 'link 1'))
+        self.assertFalse(loaded.contains('BBC', 'link 1'))
+        self.assertEqual(loaded.get_filter().get_count(), 1)
+
+    def test_build_seen_links(self):
+        connection = sqlite3.connect(':memory:')
+        cursor = connection.cursor()
+        cursor.execute('CREATE TABLE articles (source TEXT, link TEXT)')
+        cursor.execute('INSERT INTO articles VALUES (\'NPR\', \'link 1\')')
+        connection.commit()
+
+        seen = seen_links.build_seen_links(connection, capacity=100)
+        self.assertTrue(seen.contains('NPR', 'link 1'))
+        self.assertFalse(seen.contains('NPR', 'link 2'))
+
+    def test_load_seen_links_matching_db(self):
+        connection = self.__make_db([('NPR', 'link 1')])
+        seen = seen_links.SeenLinks(seen_links.BloomFilter(capacity=100))
+        seen.add('NPR', 'link 1')
+        seen.add('BBC', 'link 2')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'articles.seen')
+            seen.save(path, connection)
+            loaded = seen_links.load_seen_links(connection, path)
+
+        self.assertTrue(loaded.contains('BBC', 'link 2'))
+
+    def test_load_seen_links_rebuilds_for_other_db(self):
+        seen = seen_links.SeenLinks(seen_links.BloomFilter(capacity=100))
+        seen.add('NPR', 'link 1')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'articles.seen')
+            seen.save(path, self.__make_db([('NPR', 'link 1')]))
+            replaced = self.__make_db([('BBC', 'link 2')])
+            replaced.cursor().execute('INSERT INTO articles VALUES (\'BBC\', \'link 3\')')
+            loaded = seen_links.load_seen_links(replaced, path)
+
+        self.assertFalse(loaded.contains('NPR', 'link 1'))
+        self.assertTrue(loaded.contains('BBC', 'link 2'))
+        self.assertTrue(loaded.contains('BBC', 'link 3'))
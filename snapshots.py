@@ -0,0 +1,309 @@
+"""Content addressed archive of raw feed snapshots with a reparse command rebuilding articles.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import argparse
+import hashlib
+import mmap
+import os
+import sqlite3
+import threading
+import zlib
+
+import dates
+import parse_pool
+import persist
+import sources
+import util
+
+
+DEFAULT_DIRECTORY_NAME = 'snapshots'
+DEFAULT_CHUNK_SIZE = 8
+DEFAULT_WINDOW = 512
+COMPRESSION_LEVEL = 6
+ENCODING = 'utf-8'
+INDEX_NAME = 'index.db'
+OBJECTS_NAME = 'objects'
+
+CREATE_SQL = '''
+    CREATE TABLE IF NOT EXISTS snapshots (
+        `url` TEXT,
+        `crawlDate` INTEGER,
+        `digest` TEXT
+    )
+'''
+
+INSERT_SQL = '''
+    INSERT INTO
+        snapshots (
+            url,
+            crawlDate,
+            digest
+        )
+    VALUES
+        (
+            ?,
+            ?,
+            ?
+        )
+'''
+
+SELECT_SQL = '''
+    SELECT
+        url,
+        crawlDate,
+        digest
+    FROM
+        snapshots
+    WHERE
+        crawlDate >= ?
+    ORDER BY
+        crawlDate,
+        rowid
+'''
+
+
+class SnapshotArchive:
+    """Directory of compressed feed contents named by their SHA-256 digest.
+
+    Identical contents are stored once however many times they are fetched. Each fetch is
+    recorded in an index of URL, crawl date and digest. Contents may be added from many threads
+    but records are only written to the index through save.
+    """
+
+    def __init__(self, directory):
+        """Open or create an archive.
+
+        Args:
+            directory: The path to the directory holding the archive.
+        """
+        self.__directory = directory
+        os.makedirs(os.path.join(directory, OBJECTS_NAME), exist_ok=True)
+
+        self.__index = sqlite3.connect(os.path.join(directory, INDEX_NAME))
+        self.__index.cursor().execute(CREATE_SQL)
+        self.__pending = []
+        self.__lock = threading.Lock()
+
+    def add(self, url, text, crawl_date):
+        """Keep the contents of a fetched feed.
+
+        Args:
+            url: The string URL from which the feed was fetched.
+            text: The string contents of the feed.
+            crawl_date: The datetime.datetime at which the feed was fetched.
+        Returns:
+            The string hex SHA-256 digest of the contents.
+        """
+        data = text.encode(ENCODING)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.get_object_path(digest)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = '%s.%d.tmp' % (path, threading.get_ident())
+            with open(temp_path, 'wb') as f:
+                f.write(zlib.compress(data, COMPRESSION_LEVEL))
+
+            os.replace(temp_path, path)
+
+        with self.__lock:
+            self.__pending.append((url, dates.to_epoch(crawl_date), digest))
+
+        return digest
+
+    def save(self):
+        """Write records of the feeds added since the last save to the index."""
+        with self.__lock:
+            rows = self.__pending
+            self.__pending = []
+
+        self.__index.cursor().executemany(INSERT_SQL, rows)
+        self.__index.commit()
+
+    def get_object_path(self, digest):
+        """Get where the contents with a digest are stored.
+
+        Args:
+            digest: The string hex SHA-256 digest of the contents.
+        Returns:
+            String file path, sharded by the first two characters of the digest.
+        """
+        return os.path.join(self.__directory, OBJECTS_NAME, digest[:2], digest[2:])
+
+    def read(self, digest):
+        """Read the contents with a digest.
+
+        Args:
+            digest: The string hex SHA-256 digest of the contents.
+        Returns:
+            The string contents of the feed.
+        """
+        return read_object(self.get_object_path(digest))
+
+    def iter_snapshots(self, since=None):
+        """Iterate over the recorded fetches from oldest to newest.
+
+        Args:
+            since: Optional datetime.datetime before which fetches are skipped.
+        Returns:
+            Iterable over tuples of URL, integer epoch crawl date and digest.
+        """
+        since_epoch = dates.to_epoch(since) if since else 0
+        return self.__index.cursor().execute(SELECT_SQL, (since_epoch,))
+
+    def close(self):
+        """Save any pending records and close the index."""
+        self.save()
+        self.__index.close()
+
+
+def read_object(path):
+    """Decompress a stored object, memory mapping the file rather than reading it into a buffer.
+
+    Args:
+        path: The file path of the object.
+    Returns:
+        The string contents of the feed.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return zlib.decompress(mapped).decode(ENCODING)
+
+
+def parse_snapshot(job):
+    """Read and parse a stored feed. Runs in a parse_pool.ParsePool worker.
+
+    Args:
+        job: Tuple of the object's file path, the ParseStrategy for its feed and the integer epoch
+            at which it was fetched.
+    Returns:
+        List of row tuples from persist.serialize_article_to_values.
+    """
+    (path, strategy, crawl_epoch) = job
+    text = read_object(path)
+    return parse_pool.parse_rows(text, strategy, dates.from_epoch(crawl_epoch))
+
+
+def make_jobs(archive, news_sources, since=None):
+    """Describe the stored feeds to be parsed, skipping contents unchanged since the last fetch.
+
+    Fetches of a URL returning the same contents as an earlier fetch would produce the same
+    articles and are skipped. So are URLs without a source in news_sources.
+
+    Args:
+        archive: The SnapshotArchive to read.
+        news_sources: Iterable over NewsSource whose strategies parse their archived feeds.
+        since: Optional datetime.datetime before which fetches are skipped.
+    Returns:
+        Iterable over job tuples for parse_snapshot.
+    """
+    sources_by_url = dict((source.get_url(), source) for source in news_sources)
+    parsed = set()
+
+    for (url, crawl_epoch, digest) in archive.iter_snapshots(since):
+        source = sources_by_url.get(url)
+        if source is None or (url, digest) in parsed:
+            continue
+
+        parsed.add((url, digest))
+        yield (archive.get_object_path(digest), source.get_parse_strategy(), crawl_epoch)
+
+
+def reparse(archive, target_db, news_sources, processes=None, since=None,
+    chunk_size=DEFAULT_CHUNK_SIZE):
+    """Parse archived feeds with the current strategies and persist the articles.
+
+    Feeds are parsed across a process pool in the order they were fetched so that each article
+    keeps the crawl date at which it was first seen. At most DEFAULT_WINDOW feeds are queued on
+    the pool at once so that memory stays bounded however large the archive.
+
+    Args:
+        archive: The SnapshotArchive to read.
+        target_db: DB API v2 compliant connection to which articles are persisted.
+        news_sources: Iterable over NewsSource whose strategies parse their archived feeds.
+        processes: The number of worker processes or None for one per core.
+        since: Optional datetime.datetime before which fetches are skipped.
+        chunk_size: The number of feeds sent to a worker at a time.
+    Returns:
+        The number of rows written.
+    """
+    pool = parse_pool.ParsePool(processes)
+    try:
+        jobs = make_jobs(archive, news_sources, since=since)
+        rows = (
+            row
+            for window in util.chunk(jobs, DEFAULT_WINDOW)
+            for result in pool.map(window, chunksize=chunk_size, function=parse_snapshot)
+            for row in result
+        )
+        return persist.persist_rows(rows, target_db)
+    finally:
+        pool.close()
+
+
+def get_default_path():
+    """Get the default location of the archive, alongside the default database.
+
+    Returns:
+        String path to the archive directory.
+    """
+    parent_dir = os.path.dirname(os.path.realpath(__file__))
+    return os.path.join(parent_dir, DEFAULT_DIRECTORY_NAME)
+
+
+def main():
+    """Execute this script from the command line."""
+    parser = argparse.ArgumentParser(
+        description='Rebuild an articles database from archived feeds with the current strategies.'
+    )
+    parser.add_argument('command', choices=['reparse'], help='Operation to run.')
+    parser.add_argument('--out', required=True, help='Path of the new database to create.')
+    parser.add_argument(
+        '--archive',
+        default=get_default_path(),
+        help='Path to the archive. Defaults to %s.' % DEFAULT_DIRECTORY_NAME
+    )
+    parser.add_argument('--processes', type=int, default=None, help='Parse processes.')
+    parser.add_argument('--since', help='Only reparse feeds fetched on or after this date.')
+    options = parser.parse_args()
+
+    if os.path.exists(options.out):
+        parser.error('%s already exists. Reparse writes to a fresh database.' % options.out)
+
+    since = dates.parse_date(options.since) if options.since else None
+
+    archive = SnapshotArchive(options.archive)
+    db = persist.get_db(options.out)
+    persist.create_schema(db)
+    count = reparse(archive, db, sources.SOURCES, processes=options.processes, since=since)
+    print('Wrote %d articles to %s.' % (count, options.out))
+
+    db.close()
+    archive.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import persist
+import snapshots
+import sources
+import strategies
+
+
+FEED = '''<?xml version="1.0"?>
+<rss version="2.0">
+    <channel>
+        <item>
+            <title>Title %d</title>
+            <description>Description</description>
+            <pubDate>Mon, 20 May 2019 01:02:03 -0400</pubDate>
+            <guid>https://example.com/%d</guid>
+        </item>
+    </channel>
+</rss>
+'''
+
+
+class SnapshotsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.__temp_dir = tempfile.TemporaryDirectory()
+        self.__archive = snapshots.SnapshotArchive(self.__temp_dir.name)
+
+    def tearDown(self):
+        self.__archive.close()
+        self.__temp_dir.cleanup()
+
+    def test_add(self):
+        first = self.__archive.add('cnn', FEED % (1, 1), self.__make_date(20))
+        second = self.__archive.add('cnn', FEED % (1, 1), self.__make_date(21))
+        self.assertEqual(first, second)
+        self.assertEqual(self.__archive.read(first), FEED % (1, 1))
+
+        objects_dir = os.path.join(self.__temp_dir.name, snapshots.OBJECTS_NAME, first[:2])
+        self.assertEqual(os.listdir(objects_dir), [first[2:]])
+
+        self.__archive.save()
+        records = list(self.__archive.iter_snapshots())
+        self.assertEqual(records, [('cnn', 1558310400, first), ('cnn', 1558396800, first)])
+
+        records = list(self.__archive.iter_snapshots(since=self.__make_date(21)))
+        self.assertEqual(len(records), 1)
+
+    def test_reparse(self):
+        self.__archive.add('cnn', FEED % (1, 1), self.__make_date(20))
+        self.__archive.add('cnn', FEED % (2, 1), self.__make_date(21))
+        self.__archive.add('cnn', FEED % (2, 1), self.__make_date(22))
+        self.__archive.add('bbc', FEED % (3, 3), self.__make_date(21))
+        self.__archive.add('unknown', FEED % (4, 4), self.__make_date(21))
+        self.__archive.save()
+
+        news_sources = [
+            sources.NewsSource('cnn', strategies.CnnParseStrategy()),
+            sources.NewsSource('bbc', strategies.BbcParseStrategy())
+        ]
+        jobs = list(snapshots.make_jobs(self.__archive, news_sources))
+        self.assertEqual(len(jobs), 3)
+
+        connection = sqlite3.connect(':memory:')
+        persist.create_schema(connection)
+        count = snapshots.reparse(self.__archive, connection, news_sources, processes=1)
+        self.assertEqual(count, 3)
+
+        cursor = connection.cursor()
+        cursor.execute('''SELECT source, title, crawlDate FROM articles ORDER BY source''')
+        self.assertEqual(cursor.fetchall(), [
+            ('BBC', 'Title 3', 1558396800),
+            ('CNN', 'Title 2', 1558310400)
+        ])
+
+    def __make_date(self, day):
+        return datetime.datetime(2019, 5, day, tzinfo=datetime.timezone.utc)
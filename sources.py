@@ -20,21 +20,55 @@ OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
-import strategies
+import importlib
+
+STRATEGIES_MODULE = 'strategies'
+
+
+class LazyStrategy:
+    """Reference to a parse strategy which is only created, with its parser, when first needed.
+
+    Naming the strategy rather than creating it keeps the strategies module and its parsing
+    dependencies out of runs and tools that never parse a feed.
+    """
+
+    def __init__(self, class_name, *args):
+        """Create a new reference to a strategy.
+
+        Args:
+            class_name: The name of the ParseStrategy subclass in strategies like
+                NprParseStrategy.
+            args: Positional arguments with which the strategy should be constructed.
+        """
+        self.__class_name = class_name
+        self.__args = args
+
+    def resolve(self):
+        """Import the strategies module and create the referenced strategy.
+
+        Returns:
+            New instance of the named ParseStrategy.
+        """
+        module = importlib.import_module(STRATEGIES_MODULE)
+        return getattr(module, self.__class_name)(*self.__args)
 
 
 class NewsSource:
     """Structure describing a single news source."""
 
-    def __init__(self, url, parse_strategy):
+    def __init__(self, url, parse_strategy, use_session=False):
         """Create a new news source.
 
         Args:
             url: String url at which the RSS feed contents can be found.
-            parse_strategy: The strategy from strategies by which the RSS feed can be parsed.
+            parse_strategy: The strategy from strategies by which the RSS feed can be parsed or a
+                LazyStrategy creating it on first use.
+            use_session: Flag indicating if the feed should be requested through the shared
+                http_session.HttpSession, reusing connections to hosts shared with other feeds.
         """
         self.__url = url
         self.__parse_strategy = parse_strategy
+        self.__use_session = use_session
 
     def get_url(self):
         """Get the URL at which the RSS feed can be found.
@@ -45,55 +79,71 @@ class NewsSource:
         return self.__url
 
     def get_parse_strategy(self):
-        """Get the strategy by which this can be parsed.
+        """Get the strategy by which this can be parsed, creating it if not yet created.
 
         Returns:
-
+            The ParseStrategy for this source's feed.
         """
+        if isinstance(self.__parse_strategy, LazyStrategy):
+            self.__parse_strategy = self.__parse_strategy.resolve()
+
         return self.__parse_strategy
 
+    def get_use_session(self):
+        """Determine if this feed should be requested through the shared session.
+
+        Returns:
+            True if requests should go through the shared http_session.HttpSession and False if a
+            standalone request should be made.
+        """
+        return self.__use_session
+
 
 SOURCES = [
     NewsSource(
         'https://www.npr.org/rss/rss.php?id=2',
-        strategies.NprParseStrategy()),
+        LazyStrategy('NprParseStrategy')),
     NewsSource(
         'http://rss.cnn.com/rss/cnn_topstories.rss',
-        strategies.CnnParseStrategy()),
+        LazyStrategy('CnnParseStrategy')),
     NewsSource(
         'https://www.vox.com/rss/index.xml',
-        strategies.VoxParseStrategy()
+        LazyStrategy('VoxParseStrategy')
     ),
     NewsSource(
         'https://feeds.a.dj.com/rss/RSSWorldNews.xml',
-        strategies.WsjParseStrategy('World')
+        LazyStrategy('WsjParseStrategy', 'World'),
+        use_session=True
     ),
     NewsSource(
         'https://feeds.a.dj.com/rss/WSJcomUSBusiness.xml',
-        strategies.WsjParseStrategy('US Business')
+        LazyStrategy('WsjParseStrategy', 'US Business'),
+        use_session=True
     ),
     NewsSource(
         'https://feedpress.me/drudgereportfeed',
-        strategies.DrudgeReportParseStrategy()
+        LazyStrategy('DrudgeReportParseStrategy'),
+        use_session=True
     ),
     NewsSource(
         'http://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml',
-        strategies.NewYorkTimesParseStrategy()
+        LazyStrategy('NewYorkTimesParseStrategy')
     ),
     NewsSource(
         'http://feeds.bbci.co.uk/news/rss.xml',
-        strategies.BbcParseStrategy()
+        LazyStrategy('BbcParseStrategy')
     ),
     NewsSource(
         'http://feeds.feedburner.com/breitbart?format=xml',
-        strategies.BreitbartParseStrategy()
+        LazyStrategy('BreitbartParseStrategy'),
+        use_session=True
     ),
     NewsSource(
         'https://www.dailymail.co.uk/home/index.rss',
-        strategies.DailyMailParseStrategy()
+        LazyStrategy('DailyMailParseStrategy')
     ),
     NewsSource(
         'http://feeds.foxnews.com/foxnews/latest',
-        strategies.FoxParseStrategy()
+        LazyStrategy('FoxParseStrategy')
     )
 ]
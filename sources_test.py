@@ -25,3 +25,9 @@ class SourcesTest(unittest.TestCase):
 
     def test_sources(self):
         self.assertTrue(len(sources.SOURCES) > 0)
+
+    def test_lazy_strategy(self):
+        source = sources.NewsSource('url', sources.LazyStrategy('WsjParseStrategy', 'World'))
+        strategy = source.get_parse_strategy()
+        self.assertEqual(strategy.get_source_feed(), 'World')
+        self.assertIs(source.get_parse_strategy(), strategy)
@@ -0,0 +1,193 @@
+"""Profile of crawler startup summarizing the slowest imports reported by python -X importtime.
+
+----
+
+Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+
+import re
+import subprocess
+import sys
+
+
+DEFAULT_TOP = 15
+MICROSECONDS_PER_MILLISECOND = 1000
+
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+
+class ImportTime:
+    """Time taken to import a single module as reported by python -X importtime."""
+
+    __slots__ = (
+        '__module',
+        '__self_us',
+        '__cumulative_us',
+        '__depth'
+    )
+
+    def __init__(self, module, self_us, cumulative_us, depth):
+        """Create a new record of a module import.
+
+        Args:
+            module: The dotted name of the module imported.
+            self_us: Integer microseconds spent importing the module excluding its imports.
+            cumulative_us: Integer microseconds spent importing the module and its imports.
+            depth: How deeply nested the import was with zero being imported by __main__.
+        """
+        self.__module = module
+        self.__self_us = self_us
+        self.__cumulative_us = cumulative_us
+        self.__depth = depth
+
+    def get_module(self):
+        """Get the name of the module imported.
+
+        Returns:
+            Dotted module name like bs4.element.
+        """
+        return self.__module
+
+    def get_package(self):
+        """Get the top level package of the module imported.
+
+        Returns:
+            Package name like bs4.
+        """
+        return self.__module.split('.')[0]
+
+    def get_self_us(self):
+        """Get the time spent importing the module excluding its own imports.
+
+        Returns:
+            Integer microseconds.
+        """
+        return self.__self_us
+
+    def get_cumulative_us(self):
+        """Get the time spent importing the module including its own imports.
+
+        Returns:
+            Integer microseconds.
+        """
+        return self.__cumulative_us
+
+    def get_depth(self):
+        """Get how deeply nested the import was.
+
+        Returns:
+            Integer depth where zero is a module imported directly by the command.
+        """
+        return self.__depth
+
+
+def parse_import_time(line):
+    """Parse a line written by python -X importtime.
+
+    Args:
+        line: String line from stderr.
+    Returns:
+        ImportTime or None if the line is not an import time report.
+    """
+    match = IMPORT_TIME_PATTERN.match(line)
+    if not match:
+        return None
+
+    (self_us, cumulative_us, indent, module) = match.groups()
+    depth = (len(indent) - 1) // 2
+    return ImportTime(module, int(self_us), int(cumulative_us), depth)
+
+
+def summarize(import_times, top=DEFAULT_TOP):
+    """Describe where import time went, grouped by top level package.
+
+    Args:
+        import_times: List of ImportTime in the order reported.
+        top: The number of packages and modules to list.
+    Returns:
+        String multi-line report.
+    """
+    total_us = sum(record.get_self_us() for record in import_times)
+
+    package_us = {}
+    for record in import_times:
+        package = record.get_package()
+        package_us[package] = package_us.get(package, 0) + record.get_self_us()
+
+    packages = sorted(package_us.items(), key=lambda item: item[1], reverse=True)[:top]
+    modules = sorted(import_times, key=lambda record: record.get_self_us(), reverse=True)[:top]
+
+    lines = ['Imported %d modules in %.1f ms.' % (
+        len(import_times),
+        total_us / MICROSECONDS_PER_MILLISECOND
+    )]
+
+    lines.append('Slowest packages:')
+    for (package, package_total) in packages:
+        lines.append('  %-32s %9.1f ms' % (package, package_total / MICROSECONDS_PER_MILLISECOND))
+
+    lines.append('Slowest modules, excluding their own imports:')
+    for record in modules:
+        lines.append('  %-32s %9.1f ms' % (
+            record.get_module(),
+            record.get_self_us() / MICROSECONDS_PER_MILLISECOND
+        ))
+
+    return '\n'.join(lines)
+
+
+def remove_flag(args, flag):
+    """Remove a flag from command line arguments so that a re-run does not profile again.
+
+    Args:
+        args: List of string command line arguments.
+        flag: The flag to remove like --startup-profile.
+    Returns:
+        New list of arguments without the flag.
+    """
+    return [arg for arg in args if arg != flag]
+
+
+def run_profiled(script, args, top=DEFAULT_TOP):
+    """Run a script in a new interpreter under python -X importtime and report its imports.
+
+    Output from the script other than import times is passed through as it is written. The
+    report is written to stderr once the script exits, covering any imports deferred until used.
+
+    Args:
+        script: The path to the Python script to run.
+        args: List of string arguments for the script.
+        top: The number of packages and modules to list in the report.
+    Returns:
+        The script's integer exit code.
+    """
+    command = [sys.executable, '-X', 'importtime', script] + args
+    process = subprocess.Popen(command, stderr=subprocess.PIPE, universal_newlines=True)
+
+    import_times = []
+    for line in process.stderr:
+        record = parse_import_time(line)
+        if record:
+            import_times.append(record)
+        elif not line.startswith('import time: self'):
+            sys.stderr.write(line)
+
+    return_code = process.wait()
+    sys.stderr.write(summarize(import_times, top) + '\n')
+    return return_code
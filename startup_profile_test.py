@@ -0,0 +1,63 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import os
+import tempfile
+import unittest
+
+import startup_profile
+
+
+class StartupProfileTest(unittest.TestCase):
+
+    def test_parse_import_time(self):
+        line = 'import time:      1862 |      21666 |     bs4.element\n'
+        record = startup_profile.parse_import_time(line)
+        self.assertEqual(record.get_module(), 'bs4.element')
+        self.assertEqual(record.get_package(), 'bs4')
+        self.assertEqual(record.get_self_us(), 1862)
+        self.assertEqual(record.get_cumulative_us(), 21666)
+        self.assertEqual(record.get_depth(), 2)
+
+        self.assertIsNone(startup_profile.parse_import_time('Failed to process NPR.\n'))
+
+    def test_summarize(self):
+        import_times = [
+            startup_profile.ImportTime('bs4.element', 2000, 2000, 1),
+            startup_profile.ImportTime('bs4', 500, 2500, 0),
+            startup_profile.ImportTime('json', 1000, 1000, 0)
+        ]
+        report = startup_profile.summarize(import_times, top=1)
+        self.assertIn('Imported 3 modules in 3.5 ms.', report)
+        self.assertIn('bs4                                    2.5 ms', report)
+        self.assertNotIn('json', report)
+
+    def test_remove_flag(self):
+        args = ['--workers', '4', '--startup-profile']
+        args = startup_profile.remove_flag(args, '--startup-profile')
+        self.assertEqual(args, ['--workers', '4'])
+
+    def test_run_profiled(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            script = os.path.join(temp_dir, 'script.py')
+            with open(script, 'w') as f:
+                f.write('import sys\nimport json\nsys.exit(len(sys.argv))\n')
+
+            return_code = startup_profile.run_profiled(script, ['a', 'b'])
+
+        self.assertEqual(return_code, 3)
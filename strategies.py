@@ -20,14 +20,58 @@ OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
 
-import bs4
-import dateutil.parser
-
-import util
+import dates
+import html_text
+import item_parser
 
 
 class ParseStrategy:
-    """Interface for RSS parsing strategies."""
+    """Interface for RSS parsing strategies.
+
+    Items are parsed by a backend from item_parser into item_parser.FeedItem records on which the
+    getters operate. By default, feeds are parsed incrementally as XML and fall back to
+    BeautifulSoup with the parser from get_fallback_features if they are not well formed.
+    """
+
+    ITEM_TAG = 'item'
+    FALLBACK_FEATURES = 'html.parser'
+
+    def __init__(self, backend=None):
+        """Create a new parse strategy.
+
+        Args:
+            backend: Optional backend from item_parser by which items should be parsed. Defaults
+                to item_parser.XmlBackend falling back to item_parser.SoupBackend.
+        """
+        self.__backend = backend
+
+    def get_backend(self):
+        """Get the backend by which items are parsed.
+
+        Returns:
+            Backend from item_parser.
+        """
+        if self.__backend is None:
+            fallback = item_parser.SoupBackend(self.get_fallback_features())
+            self.__backend = item_parser.XmlBackend(fallback=fallback)
+
+        return self.__backend
+
+    def get_item_tag(self):
+        """Get the tag of each item in the feed.
+
+        Returns:
+            String tag like item for RSS or entry for Atom.
+        """
+        return self.ITEM_TAG
+
+    def get_fallback_features(self):
+        """Get the parser used by BeautifulSoup if the feed is not well formed.
+
+        Returns:
+            String BeautifulSoup features like lxml or html.parser.
+        """
+        return self.FALLBACK_FEATURES
 
     def get_source(self):
         """Get the name of news agency for which this strategy is intended.
@@ -45,19 +89,31 @@ class ParseStrategy:
         """
         raise NotImplementedError('Must use subclass of ParseStrategy.')
 
-    def get_items(self):
+    def get_items(self, text):
         """Get the RSS items found.
 
+        Args:
+            text: The string contents of the RSS feed.
         Returns:
-            bs4.BeautifulSoup over the items found.
+            List of item_parser.FeedItem for the items found.
         """
-        raise NotImplementedError('Must use subclass of ParseStrategy.')
+        return list(self.iter_items(text))
+
+    def iter_items(self, text):
+        """Iterate over the RSS items found, yielding each as it becomes available.
+
+        Args:
+            text: The string contents of the RSS feed.
+        Returns:
+            Iterable over item_parser.FeedItem for the items found.
+        """
+        return self.get_backend().iter_items(text, self.get_item_tag())
 
     def get_title(self, item):
         """Get the title of an article.
 
         Args:
-            item: The bs4.BeautifulSoup over the item whose title should be returned.
+            item: The item_parser.FeedItem whose title should be returned.
         Returns:
             String title for this item.
         """
@@ -67,7 +123,7 @@ class ParseStrategy:
         """Get the description of an article.
 
         Args:
-            item: The bs4.BeautifulSoup over the item whose description should be returned.
+            item: The item_parser.FeedItem whose description should be returned.
         Returns:
             String description for this item.
         """
@@ -77,7 +133,7 @@ class ParseStrategy:
         """Get the publish date of an article.
 
         Args:
-            item: The bs4.BeautifulSoup over the item whose publish date should be returned.
+            item: The item_parser.FeedItem whose publish date should be returned.
         Returns:
             Publish date as a datetime.datetime.
         """
@@ -87,374 +143,460 @@ class ParseStrategy:
         """Get the URL or link address for an article.
 
         Args:
-            item: The bs4.BeautifulSoup over the item whose link should be returned.
+            item: The item_parser.FeedItem whose link should be returned.
         Returns:
             Link for the article.
         """
         raise NotImplementedError('Must use subclass of ParseStrategy.')
 
-    def get_author(self):
+    def get_author(self, item):
         """Get the author for an article.
 
         Args:
-            item: The bs4.BeautifulSoup over the item whose author should be returned.
+            item: The item_parser.FeedItem whose author should be returned.
         Returns:
             The author of the article or None if not found.
         """
         raise NotImplementedError('Must use subclass of ParseStrategy.')
 
+    def extract(self, item):
+        """Get every field of an article at once.
 
-class NprParseStrategy(ParseStrategy):
-    """Parse strategy for the NPR news feed."""
-
-    def get_source(self):
-        return 'NPR'
-
-    def get_source_feed(self):
-        return 'All Things Considered'
-
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'lxml')
-        return soup.find_all('item')
-
-    def get_title(self, item):
-        return item.find('title').contents[0]
-
-    def get_description(self, item):
-        return item.find('description').contents[0]
-
-    def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('pubdate').contents[0]
+        Args:
+            item: The item_parser.FeedItem whose fields should be returned.
+        Returns:
+            Tuple of the title, description, publish date, link and author as returned by the
+            individual getters.
+        """
+        return (
+            self.get_title(item),
+            self.get_description(item),
+            self.get_publish_date(item),
+            self.get_link(item),
+            self.get_author(item)
         )
 
-    def get_link(self, item):
-        return item.find('guid').contents[0]
-
-    def get_author(self, item):
-        author_selection = item.find('dc:creator')
 
-        if author_selection:
-            author = author_selection.contents[0]
-        else:
-            author = None
+FIELDS = ('title', 'description', 'publish_date', 'link', 'author')
 
-        return author
+LINK_SPEC = {'paths': ['link', 'guid', 'atom:link@href'], 'skip_empty': True}
 
 
-class CnnParseStrategy(ParseStrategy):
-    """Parse strategy for the CNN news feed."""
+class SpecParseStrategy(ParseStrategy):
+    """Parse strategy configured by a declarative spec rather than by subclassing.
 
-    def get_source(self):
-        return 'CNN'
+    A spec is a dict with the keys:
 
-    def get_source_feed(self):
-        return 'Top Stories'
+     - source: Name of the news agency.
+     - source_feed: Name of the feed, helping disambiguate if there are many.
+     - item_tag: Optional tag of each item. Defaults to item.
+     - fallback_features: Optional BeautifulSoup parser for malformed feeds. Defaults to
+       html.parser.
+     - fields: Dict from each of FIELDS to either a list of paths or a dict with:
+        - paths: List of item_parser.FeedItem field names tried in order until one is found.
+          A name may end in @attribute like atom:link@href to use an attribute instead.
+        - skip_empty: Optional flag indicating paths found with empty text are also passed over.
+        - strip_html: Optional flag indicating the text is HTML to be reduced to plain text.
+        - replace: Optional dict of substrings to replace before any further processing.
+        - required: Optional flag indicating items without this field should be skipped.
 
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'html.parser')
-        return soup.find_all('item')
+    The publish_date field is parsed into a datetime.datetime through dates.parse_date. Fields
+    not in the spec are None. The spec is compiled once into one extractor per field such that
+    extract pulls every field from an item in a single call. Strategies are pickled by their spec
+    so that they may be sent to worker processes, which compile it again without any field hook.
+    """
 
-    def get_title(self, item):
-        return item.find('title').contents[0]
+    def __init__(self, spec, source_feed=None, backend=None, field_hook=None):
+        """Create a new strategy from a spec.
 
-    def get_description(self, item):
-        description_html = item.find('description').get_text()
-        return bs4.BeautifulSoup(description_html, 'lxml').get_text()
+        Args:
+            spec: The dict describing the feed as above.
+            source_feed: Optional name of the feed overriding the one in the spec.
+            backend: Optional backend from item_parser by which items should be parsed.
+            field_hook: Optional function taking the name of a field and its compiled extractor
+                and returning a function to use in its place, like one timing the extractor.
+                Only the getters and extract go through the hook, not the required check.
+        """
+        ParseStrategy.__init__(self, backend=backend)
+        self.__spec = spec
+        self.__source = spec['source']
+        self.__source_feed = source_feed if source_feed is not None else spec['source_feed']
+        self.__item_tag = spec.get('item_tag', self.ITEM_TAG)
+        self.__fallback_features = spec.get('fallback_features', self.FALLBACK_FEATURES)
+
+        field_specs = spec['fields']
+        compiled = dict((field, compile_field(field, field_specs.get(field))) for field in FIELDS)
+        self.__required = tuple(
+            compiled[field] for field in FIELDS
+            if isinstance(field_specs.get(field), dict) and field_specs[field].get('required')
+        )
 
-    def get_publish_date(self, item):
-        pub_date_selection = item.find('pubdate')
-        if pub_date_selection:
-            return dateutil.parser.parse(
-                pub_date_selection.contents[0]
+        if field_hook:
+            self.__extractors = dict(
+                (field, field_hook(field, extractor)) for (field, extractor) in compiled.items()
             )
         else:
-            return None
-
-    def get_link(self, item):
-        return item.find('guid').contents[0]
-
-    def get_author(self, item):
-        author_selection = item.find('dc:creator')
-
-        if author_selection:
-            author = author_selection.contents[0]
-        else:
-            author = None
-
-        return author
-
+            self.__extractors = compiled
 
-class VoxParseStrategy(ParseStrategy):
-    """Parse strategy for the Vox news feed."""
+        self.__extractor_list = tuple(self.__extractors[field] for field in FIELDS)
 
-    def get_source(self):
-        return 'Vox'
+    def __reduce__(self):
+        return (restore_strategy, (type(self), self.__spec, self.__source_feed, self.get_backend()))
 
-    def get_source_feed(self):
-        return ''
+    def with_field_hook(self, field_hook):
+        """Create a copy of this strategy whose field extractors go through a hook.
 
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'lxml')
-        return soup.find_all('entry')
-
-    def get_title(self, item):
-        return item.find('title').contents[0]
-
-    def get_description(self, item):
-        content_html = item.find('content').contents[0]
-        return bs4.BeautifulSoup(content_html, 'lxml').get_text()
-
-    def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('published').contents[0]
+        Args:
+            field_hook: Function taking the name of a field and its compiled extractor and
+                returning a function to use in its place.
+        Returns:
+            New instance of the same class compiled from the same spec.
+        """
+        return restore_strategy(
+            type(self),
+            self.__spec,
+            self.__source_feed,
+            self.get_backend(),
+            field_hook=field_hook
         )
 
-    def get_link(self, item):
-        return item.find('id').contents[0]
+    def get_item_tag(self):
+        return self.__item_tag
 
-    def get_author(self, item):
-        return item.find('author').find('name').contents[0]
-
-
-class WsjParseStrategy(ParseStrategy):
-    """Parse strategy for the Wall Street Journal news feed."""
-
-    def __init__(self, source_feed):
-        """Create a new parse strategy for the Wall Street Journal.
-
-        Args:
-            source_feed: The name of the feed used.
-        """
-        ParseStrategy.__init__(self)
-        self.__source_feed = source_feed
+    def get_fallback_features(self):
+        return self.__fallback_features
 
     def get_source(self):
-        return 'Wall Street Journal'
+        return self.__source
 
     def get_source_feed(self):
         return self.__source_feed
 
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'html.parser')
-        return soup.find_all('item')
-
-    def get_title(self, item):
-        return item.find('title').contents[0]
-
-    def get_description(self, item):
-        return item.find('description').contents[0]
-
-    def get_publish_date(self, item):
-        date_str = item.find('pubdate').contents[0]
-        date_str = date_str.replace('EST', '-05:00')
-        date_str = date_str.replace('EDT', '-04:00')
-        return dateutil.parser.parse(date_str)
-
-    def get_link(self, item):
-        return util.find_trailing_link(item)
-
-    def get_author(self, item):
-        return None
-
-
-class DrudgeReportParseStrategy(ParseStrategy):
-    """Parse strategy for the Drudge Report news feed."""
+    def iter_items(self, text):
+        items = ParseStrategy.iter_items(self, text)
 
-    def get_source(self):
-        return 'Drudge Report'
-
-    def get_source_feed(self):
-        return ''
-
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'lxml')
-        return soup.find_all('item')
+        if self.__required:
+            return filter(
+                lambda item: all(extractor(item) is not None for extractor in self.__required),
+                items
+            )
+        else:
+            return items
 
     def get_title(self, item):
-        return item.find('title').contents[0]
+        return self.__extractors['title'](item)
 
     def get_description(self, item):
-        html_contents = item.find('description').contents[0]
-        text = bs4.BeautifulSoup(html_contents, 'lxml').get_text()
-        return text
+        return self.__extractors['description'](item)
 
     def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('dc:date').contents[0]
-        )
+        return self.__extractors['publish_date'](item)
 
     def get_link(self, item):
-        return util.find_trailing_link(item)
+        return self.__extractors['link'](item)
 
     def get_author(self, item):
-        return None
+        return self.__extractors['author'](item)
+
+    def extract(self, item):
+        return tuple(extractor(item) for extractor in self.__extractor_list)
+
+
+def restore_strategy(strategy_class, spec, source_feed, backend, field_hook=None):
+    """Recreate a pickled SpecParseStrategy or subclass, compiling its spec again.
+
+    Args:
+        strategy_class: The SpecParseStrategy subclass to create.
+        spec: The dict describing the feed.
+        source_feed: The name of the feed.
+        backend: The backend from item_parser by which items are parsed.
+        field_hook: Optional function wrapping each compiled extractor as in SpecParseStrategy.
+    Returns:
+        New instance of strategy_class.
+    """
+    strategy = strategy_class.__new__(strategy_class)
+    SpecParseStrategy.__init__(
+        strategy,
+        spec,
+        source_feed=source_feed,
+        backend=backend,
+        field_hook=field_hook
+    )
+    return strategy
+
+
+def compile_field(field, field_spec):
+    """Compile the spec for a single field into a function extracting it from an item.
+
+    Args:
+        field: The name of the field from FIELDS.
+        field_spec: List of paths, dict of options as described in SpecParseStrategy or None if
+            the field is not provided by the feed.
+    Returns:
+        Function taking an item_parser.FeedItem and returning the field's value or None.
+    """
+    if field_spec is None:
+        return lambda item: None
+
+    if not isinstance(field_spec, dict):
+        field_spec = {'paths': field_spec}
+
+    paths = tuple(compile_path(path) for path in field_spec['paths'])
+    skip_empty = field_spec.get('skip_empty', False)
+    replacements = tuple(field_spec.get('replace', {}).items())
+    strip_html = field_spec.get('strip_html', False)
+    parse_date = field == 'publish_date'
+
+    def extract(item):
+        value = find_first(item, paths, skip_empty=skip_empty)
+        if value is None:
+            return None
 
+        for (original, replacement) in replacements:
+            value = value.replace(original, replacement)
 
-class NewYorkTimesParseStrategy(ParseStrategy):
-    """Parse strategy for the New York Times news feed."""
+        if strip_html:
+            value = html_text.get_text(value)
 
-    def get_source(self):
-        return 'New York Times'
+        if parse_date:
+            value = dates.parse_date(value)
 
-    def get_source_feed(self):
-        return 'Homepage'
+        return value
 
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'lxml')
-        return soup.find_all('item')
+    return extract
 
-    def get_title(self, item):
-        return item.find('title').contents[0]
 
-    def get_description(self, item):
-        return item.find('description').contents[0]
+def compile_path(path):
+    """Split a field path into the field name and optional attribute.
 
-    def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('pubdate').contents[0]
-        )
+    Args:
+        path: String path like title or atom:link@href.
+    Returns:
+        Tuple of the field name and attribute name, which is None for the tag's text.
+    """
+    if '@' in path:
+        (name, attribute) = path.split('@', 1)
+        return (name, attribute)
+    else:
+        return (path, None)
 
-    def get_link(self, item):
-        return item.find('guid').contents[0]
 
-    def get_author(self, item):
-        author_selection = item.find('dc:creator')
+def find_first(item, paths, skip_empty=False):
+    """Find the first value among field paths.
 
-        if author_selection:
-            author = author_selection.get_text()
+    Args:
+        item: The item_parser.FeedItem to search.
+        paths: Tuple of compiled paths from compile_path.
+        skip_empty: Flag indicating if empty strings should be passed over like missing fields.
+    Returns:
+        The first string found, which may be empty unless skip_empty, or None if every path was
+        missing (or empty if skip_empty).
+    """
+    for (name, attribute) in paths:
+        if attribute:
+            value = item.get_attribute(name, attribute)
         else:
-            author = None
-
-        return author
-
-
-class BbcParseStrategy(ParseStrategy):
-    """Parse strategy for the BBC news feed."""
-
-    def get_source(self):
-        return 'BBC'
-
-    def get_source_feed(self):
-        return 'Top Stories'
-
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'html.parser')
-        return list(filter(
-            lambda x: x.find('title').contents != None,
-            soup.find_all('item')
-        ))
-
-    def get_title(self, item):
-        return item.find('title').contents[0]
-
-    def get_description(self, item):
-        return item.find('description').get_text()
-
-    def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('pubdate').contents[0]
-        )
-
-    def get_link(self, item):
-        return item.find('guid').contents[0]
-
-    def get_author(self, item):
-        return None
-
-
-class BreitbartParseStrategy(ParseStrategy):
-
-    def get_source(self):
-        return 'Breitbart'
+            value = item.get_text(name)
+
+        if value or (value is not None and not skip_empty):
+            return value
+
+    return None
+
+
+NPR_SPEC = {
+    'source': 'NPR',
+    'source_feed': 'All Things Considered',
+    'fallback_features': 'lxml',
+    'fields': {
+        'title': ['title'],
+        'description': ['description'],
+        'publish_date': ['pubdate'],
+        'link': ['guid'],
+        'author': ['dc:creator']
+    }
+}
+
+CNN_SPEC = {
+    'source': 'CNN',
+    'source_feed': 'Top Stories',
+    'fields': {
+        'title': ['title'],
+        'description': {'paths': ['description'], 'strip_html': True},
+        'publish_date': ['pubdate'],
+        'link': ['guid'],
+        'author': ['dc:creator']
+    }
+}
+
+VOX_SPEC = {
+    'source': 'Vox',
+    'source_feed': '',
+    'item_tag': 'entry',
+    'fallback_features': 'lxml',
+    'fields': {
+        'title': ['title'],
+        'description': {'paths': ['content'], 'strip_html': True},
+        'publish_date': ['published'],
+        'link': ['id'],
+        'author': ['author/name']
+    }
+}
+
+WSJ_SPEC = {
+    'source': 'Wall Street Journal',
+    'source_feed': '',
+    'fields': {
+        'title': ['title'],
+        'description': ['description'],
+        'publish_date': ['pubdate'],
+        'link': LINK_SPEC
+    }
+}
+
+DRUDGE_REPORT_SPEC = {
+    'source': 'Drudge Report',
+    'source_feed': '',
+    'fallback_features': 'lxml',
+    'fields': {
+        'title': ['title'],
+        'description': {'paths': ['description'], 'strip_html': True},
+        'publish_date': ['dc:date'],
+        'link': LINK_SPEC
+    }
+}
+
+NEW_YORK_TIMES_SPEC = {
+    'source': 'New York Times',
+    'source_feed': 'Homepage',
+    'fallback_features': 'lxml',
+    'fields': {
+        'title': ['title'],
+        'description': ['description'],
+        'publish_date': ['pubdate'],
+        'link': ['guid'],
+        'author': ['dc:creator']
+    }
+}
+
+BBC_SPEC = {
+    'source': 'BBC',
+    'source_feed': 'Top Stories',
+    'fields': {
+        'title': {'paths': ['title'], 'required': True},
+        'description': ['description'],
+        'publish_date': ['pubdate'],
+        'link': ['guid']
+    }
+}
+
+BREITBART_SPEC = {
+    'source': 'Breitbart',
+    'source_feed': '',
+    'fields': {
+        'title': ['title'],
+        'description': ['description'],
+        'publish_date': ['pubdate'],
+        'link': ['guid'],
+        'author': ['author']
+    }
+}
+
+DAILY_MAIL_SPEC = {
+    'source': 'Daily Mail',
+    'source_feed': 'Homepage',
+    'fields': {
+        'title': ['title'],
+        'description': ['description'],
+        'publish_date': ['pubdate'],
+        'link': ['guid']
+    }
+}
+
+FOX_SPEC = {
+    'source': 'Fox',
+    'source_feed': 'Top News',
+    'fields': {
+        'title': ['title'],
+        'description': ['description'],
+        'publish_date': ['pubdate'],
+        'link': ['guid'],
+        'author': ['dc:creator']
+    }
+}
+
+
+class NprParseStrategy(SpecParseStrategy):
+    """Parse strategy for the NPR news feed."""
 
-    def get_source_feed(self):
-        return ''
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, NPR_SPEC, backend=backend)
 
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'html.parser')
-        return soup.find_all('item')
 
-    def get_title(self, item):
-        return item.find('title').contents[0]
+class CnnParseStrategy(SpecParseStrategy):
+    """Parse strategy for the CNN news feed."""
 
-    def get_description(self, item):
-        return item.find('description').get_text()
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, CNN_SPEC, backend=backend)
 
-    def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('pubdate').contents[0]
-        )
 
-    def get_link(self, item):
-        return item.find('guid').contents[0]
+class VoxParseStrategy(SpecParseStrategy):
+    """Parse strategy for the Vox news feed."""
 
-    def get_author(self, item):
-        return item.find('author').contents[0]
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, VOX_SPEC, backend=backend)
 
 
-class DailyMailParseStrategy(ParseStrategy):
+class WsjParseStrategy(SpecParseStrategy):
+    """Parse strategy for the Wall Street Journal news feed."""
 
-    def get_source(self):
-        return 'Daily Mail'
+    def __init__(self, source_feed, backend=None):
+        """Create a new parse strategy for the Wall Street Journal.
 
-    def get_source_feed(self):
-        return 'Homepage'
+        Args:
+            source_feed: The name of the feed used.
+            backend: Optional backend from item_parser by which items should be parsed.
+        """
+        SpecParseStrategy.__init__(self, WSJ_SPEC, source_feed=source_feed, backend=backend)
 
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'html.parser')
-        return soup.find_all('item')
 
-    def get_title(self, item):
-        return item.find('title').contents[0]
+class DrudgeReportParseStrategy(SpecParseStrategy):
+    """Parse strategy for the Drudge Report news feed."""
 
-    def get_description(self, item):
-        return item.find('description').get_text()
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, DRUDGE_REPORT_SPEC, backend=backend)
 
-    def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('pubdate').contents[0]
-        )
 
-    def get_link(self, item):
-        return item.find('guid').contents[0]
+class NewYorkTimesParseStrategy(SpecParseStrategy):
+    """Parse strategy for the New York Times news feed."""
 
-    def get_author(self, item):
-        return None
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, NEW_YORK_TIMES_SPEC, backend=backend)
 
 
-class FoxParseStrategy(ParseStrategy):
+class BbcParseStrategy(SpecParseStrategy):
+    """Parse strategy for the BBC news feed."""
 
-    def get_source(self):
-        return 'Fox'
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, BBC_SPEC, backend=backend)
 
-    def get_source_feed(self):
-        return 'Top News'
 
-    def get_items(self, text):
-        soup = bs4.BeautifulSoup(text, 'html.parser')
-        return soup.find_all('item')
+class BreitbartParseStrategy(SpecParseStrategy):
+    """Parse strategy for the Breitbart news feed."""
 
-    def get_title(self, item):
-        return item.find('title').contents[0]
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, BREITBART_SPEC, backend=backend)
 
-    def get_description(self, item):
-        return item.find('description').get_text()
 
-    def get_publish_date(self, item):
-        return dateutil.parser.parse(
-            item.find('pubdate').contents[0]
-        )
+class DailyMailParseStrategy(SpecParseStrategy):
+    """Parse strategy for the Daily Mail news feed."""
 
-    def get_link(self, item):
-        return item.find('guid').contents[0]
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, DAILY_MAIL_SPEC, backend=backend)
 
-    def get_author(self, item):
-        author_selection = item.find('dc:creator')
 
-        if author_selection:
-            author = author_selection.contents[0]
-        else:
-            author = None
+class FoxParseStrategy(SpecParseStrategy):
+    """Parse strategy for the Fox news feed."""
 
-        return author
+    def __init__(self, backend=None):
+        SpecParseStrategy.__init__(self, FOX_SPEC, backend=backend)
@@ -19,6 +19,7 @@ CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 import os
 import unittest
 
+import item_parser
 import strategies
 
 
@@ -64,6 +65,46 @@ class StrategiesTest(unittest.TestCase):
         strategy = strategies.FoxParseStrategy()
         self.__test_items(strategy, 'fox', True)
 
+    def test_wsj_link_fallback(self):
+        strategy = strategies.WsjParseStrategy('US Business')
+
+        item = item_parser.FeedItem({'guid': 'Guid link'})
+        self.assertEqual(strategy.get_link(item), 'Guid link')
+
+        item = item_parser.FeedItem(
+            {'link': '', 'atom:link': ''},
+            {'atom:link': {'href': 'Atom link'}}
+        )
+        self.assertEqual(strategy.get_link(item), 'Atom link')
+
+    def test_empty_field_kept(self):
+        strategy = strategies.NprParseStrategy()
+
+        item = item_parser.FeedItem({'description': '', 'dc:creator': ''})
+        self.assertEqual(strategy.get_description(item), '')
+        self.assertEqual(strategy.get_author(item), '')
+        self.assertEqual(strategy.get_title(item), None)
+
+    def test_spec(self):
+        strategy = strategies.SpecParseStrategy({
+            'source': 'Example',
+            'source_feed': 'Example feed',
+            'fields': {
+                'title': ['missing', 'title'],
+                'description': {'paths': ['description'], 'strip_html': True},
+                'publish_date': ['pubdate'],
+                'link': ['atom:link@href', 'guid'],
+                'author': ['dc:creator']
+            }
+        })
+        self.__test_items(strategy, 'nyt', True)
+
+        items = strategy.get_items(self.__get_contents('nyt'))
+        (title, description, publish_date, link, author) = strategy.extract(items[0])
+        self.assertEqual(title, 'Test title')
+        self.assertEqual(link, 'Test link')
+        self.assertEqual(author, 'Test author')
+
     def __test_items(self, strategy, name, test_author):
         contents = self.__get_contents(name)
         items = strategy.get_items(contents)
@@ -82,6 +123,14 @@ class StrategiesTest(unittest.TestCase):
         if test_author:
             self.assertEquals(strategy.get_author(items[0]), 'Test author')
 
+        xml_items = item_parser.XmlBackend().iter_items(contents, strategy.get_item_tag())
+        soup_backend = item_parser.SoupBackend(strategy.get_fallback_features())
+        soup_items = soup_backend.iter_items(contents, strategy.get_item_tag())
+        self.assertEquals(
+            [strategy.extract(item) for item in xml_items],
+            [strategy.extract(item) for item in soup_items]
+        )
+
     def __get_contents(self, name):
         parent_dir = os.path.dirname(os.path.realpath(__file__))
         examples_dir = os.path.join(parent_dir, 'rss_examples')
@@ -19,29 +19,36 @@ NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FO
 OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
 CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 """
+import contextlib
 import datetime
 
-import requests
-
+import feed_cache
 import model
 
 
-def transform_rss_item(item, strategy):
+OK = 200
+NOT_MODIFIED = 304
+ENCODING = 'utf-8'
+
+
+def transform_rss_item(item, strategy, link=None, crawl_date=None):
     """Transform a single RSS item.
 
     Args:
-        item: The bs4.BeautifulSoup over the item to be transformed.
+        item: The item_parser.FeedItem to be transformed.
         strategy: The ParseStrategy by which to transform the given item.
+        link: Optional link for the item if already found through strategy.get_link.
+        crawl_date: Optional datetime.datetime at which the feed was downloaded. Defaults to now.
     Returns:
         Newly created Article.
     """
     source = strategy.get_source()
     source_feed = strategy.get_source_feed()
-    title = strategy.get_title(item)
-    description = strategy.get_description(item)
-    pubdate = strategy.get_publish_date(item)
-    link = strategy.get_link(item)
-    author = strategy.get_author(item)
+    (title, description, pubdate, item_link, author) = strategy.extract(item)
+    link = link if link is not None else item_link
+
+    if crawl_date is None:
+        crawl_date = datetime.datetime.now(datetime.timezone.utc)
 
     return model.Article(
         source,
@@ -49,24 +56,306 @@ def transform_rss_item(item, strategy):
         title,
         description,
         pubdate,
-        datetime.datetime.now(datetime.timezone.utc),
+        crawl_date,
         link,
         author
     )
 
 
-def parse(url, strategy):
+def parse_text(text, strategy, seen_links=None, crawl_date=None, url=None, cache=None):
+    """Parse all items from the contents of a RSS feed using a given strategy.
+
+    Args:
+        text: The string contents of the RSS feed.
+        strategy: The ParseStrategy by which to gather Article objects from the given contents.
+        seen_links: Optional seen_links.SeenLinks with articles already stored. Items whose link
+            was seen are dropped before the rest of their fields are extracted.
+        crawl_date: Optional datetime.datetime at which the feed was downloaded. Defaults to the
+            time each item is transformed.
+        url: Optional string URL from which the feed was downloaded, required with cache.
+        cache: Optional feed_cache.FeedCache. Items identical to one in the last parse of the
+            feed are dropped before their link is extracted.
+    Returns:
+        Iterable over model.Article, each transformed only when requested.
+    """
+    items_raw = strategy.iter_items(text)
+
+    if cache is not None:
+        items_raw = filter_unchanged(items_raw, url, cache)
+
+    return transform_items(items_raw, strategy, seen_links=seen_links, crawl_date=crawl_date)
+
+
+def transform_items(items_raw, strategy, seen_links=None, crawl_date=None):
+    """Transform RSS items into articles, skipping those already stored.
+
+    Args:
+        items_raw: Iterable over the item_parser.FeedItem to be transformed.
+        strategy: The ParseStrategy by which to transform the given items.
+        seen_links: Optional seen_links.SeenLinks with articles already stored.
+        crawl_date: Optional datetime.datetime at which the feed was downloaded.
+    Returns:
+        Iterable over model.Article, each transformed only when requested.
+    """
+    if seen_links is None:
+        return map(
+            lambda item_raw: transform_rss_item(item_raw, strategy, crawl_date=crawl_date),
+            items_raw
+        )
+    else:
+        return filter_seen(items_raw, strategy, seen_links, crawl_date=crawl_date)
+
+
+def filter_unchanged(items_raw, url, cache):
+    """Drop items found unchanged in the last parse of a feed.
+
+    The hashes of every item are remembered in the cache once all items have been read.
+
+    Args:
+        items_raw: Iterable over the item_parser.FeedItem in the feed.
+        url: The string URL of the feed.
+        cache: The feed_cache.FeedCache holding the hashes of the items last parsed.
+    Returns:
+        Iterable over the items which are new or changed.
+    """
+    item_hashes = set()
+    yield from filter_item_hashes(items_raw, cache.get_item_hashes(url), item_hashes)
+    cache.update_item_hashes(url, item_hashes)
+
+
+def filter_item_hashes(items_raw, previous_hashes, item_hashes):
+    """Drop items whose hash is among those of a previous parse.
+
+    Args:
+        items_raw: Iterable over the item_parser.FeedItem in the feed.
+        previous_hashes: Collection of byte string hashes from feed_cache.hash_item for the
+            items last parsed.
+        item_hashes: Set to which the hash of every item read, changed or not, is added.
+    Returns:
+        Iterable over the items which are new or changed.
+    """
+    for item_raw in items_raw:
+        item_hash = feed_cache.hash_item(item_raw)
+        item_hashes.add(item_hash)
+        if item_hash not in previous_hashes:
+            yield item_raw
+
+
+def filter_seen(items_raw, strategy, seen_links, crawl_date=None):
+    """Transform only those RSS items not already stored.
+
+    Args:
+        items_raw: Iterable over the items to be transformed.
+        strategy: The ParseStrategy by which to transform the given items.
+        seen_links: The seen_links.SeenLinks with articles already stored.
+        crawl_date: Optional datetime.datetime at which the feed was downloaded.
+    Returns:
+        Iterable over model.Article for the items whose links were not seen.
+    """
+    source = strategy.get_source()
+
+    for item_raw in items_raw:
+        link = strategy.get_link(item_raw)
+        if not seen_links.contains(source, link):
+            yield transform_rss_item(item_raw, strategy, link=link, crawl_date=crawl_date)
+
+
+def fetch(url, timeout=None, session=None, cache=None):
+    """Download the contents of a RSS feed.
+
+    Args:
+        url: String URL at which the RSS feed contents can be found.
+        timeout: Optional number of seconds to wait on connecting to or reading from the server
+            before giving up. None waits indefinitely.
+        session: Optional http_session.HttpSession through which the request should be made. If
+            not given, a standalone request is made.
+        cache: Optional feed_cache.FeedCache used to request the feed conditionally and to
+            recognize bodies identical to the last one committed.
+    Returns:
+        The string contents of the RSS feed or None if unchanged since it was last cached.
+    """
+    headers = cache.get_request_headers(url) if cache else None
+
+    if session:
+        requester = session
+    else:
+        import requests
+        requester = requests
+
+    rss = requester.get(url, timeout=timeout, headers=headers)
+
+    if rss.status_code == NOT_MODIFIED:
+        return None
+
+    if cache and rss.status_code == OK:
+        cache.update(url, rss.headers)
+
+        if not cache.record_body(url, rss.text):
+            cache.confirm(url)
+            return None
+
+    return rss.text
+
+
+def parse(url, strategy, timeout=None, session=None, cache=None, seen_links=None, archive=None,
+    metrics=None):
     """Parse all items from a RSS feed using a given strategy.
 
     Args:
         url: String URL at which the RSS feed contents can be found.
         strategy: The ParseStrategy by which to gather Article objects from the given URL.
+        timeout: Optional number of seconds to wait on connecting to or reading from the server
+            before giving up. None waits indefinitely.
+        session: Optional http_session.HttpSession through which the request should be made. If
+            not given, a standalone request is made.
+        cache: Optional feed_cache.FeedCache used to skip feeds and items unchanged since the last
+            crawl.
+        seen_links: Optional seen_links.SeenLinks used to skip articles already stored.
+        archive: Optional snapshots.SnapshotArchive in which the feed contents are kept.
+        metrics: Optional metrics.Metrics recording the time spent fetching, parsing and in each
+            getter along with the bytes, items and articles found under the feed's URL.
     Returns:
-        List of model.Article.
+        Iterable over model.Article which is empty if the feed has not changed.
     """
-    rss = requests.get(url)
-    items_raw = strategy.get_items(rss.text)
-    return list(map(
-        lambda item_raw: transform_rss_item(item_raw, strategy),
-        items_raw
-    ))
+    crawl_date = datetime.datetime.now(datetime.timezone.utc)
+
+    with time_stage(metrics, url, 'fetch'):
+        text = fetch(url, timeout=timeout, session=session, cache=cache)
+
+    return parse_fetched(url, text, strategy, crawl_date, cache, seen_links, archive, metrics)
+
+
+async def fetch_async(session, url, timeout=None, cache=None):
+    """Download the contents of a RSS feed without blocking the event loop.
+
+    Args:
+        session: The aiohttp.ClientSession through which the request should be made.
+        url: String URL at which the RSS feed contents can be found.
+        timeout: Optional number of seconds to wait on connecting to or reading from the server
+            before giving up. None waits indefinitely.
+        cache: Optional feed_cache.FeedCache used to request the feed conditionally and to
+            recognize bodies identical to the last one committed.
+    Returns:
+        The string contents of the RSS feed or None if unchanged since it was last cached.
+    """
+    import aiohttp
+
+    headers = cache.get_request_headers(url) if cache else None
+    client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    async with session.get(url, timeout=client_timeout, headers=headers) as response:
+        if response.status == NOT_MODIFIED:
+            return None
+
+        text = await response.text()
+
+        if cache and response.status == OK:
+            cache.update(url, response.headers)
+
+            if not cache.record_body(url, text):
+                cache.confirm(url)
+                return None
+
+        return text
+
+
+async def parse_async(session, url, strategy, timeout=None, cache=None, seen_links=None,
+    archive=None, metrics=None):
+    """Parse all items from a RSS feed using a given strategy, fetching through asyncio.
+
+    Args:
+        session: The aiohttp.ClientSession through which the feed should be requested.
+        url: String URL at which the RSS feed contents can be found.
+        strategy: The ParseStrategy by which to gather Article objects from the given URL.
+        timeout: Optional number of seconds to wait on connecting to or reading from the server
+            before giving up. None waits indefinitely.
+        cache: Optional feed_cache.FeedCache used to skip feeds and items unchanged since the last
+            crawl.
+        seen_links: Optional seen_links.SeenLinks used to skip articles already stored.
+        archive: Optional snapshots.SnapshotArchive in which the feed contents are kept.
+        metrics: Optional metrics.Metrics recording the time spent fetching, parsing and in each
+            getter along with the bytes, items and articles found under the feed's URL.
+    Returns:
+        Iterable over model.Article which is empty if the feed has not changed.
+    """
+    crawl_date = datetime.datetime.now(datetime.timezone.utc)
+
+    with time_stage(metrics, url, 'fetch'):
+        text = await fetch_async(session, url, timeout=timeout, cache=cache)
+
+    return parse_fetched(url, text, strategy, crawl_date, cache, seen_links, archive, metrics)
+
+
+def parse_fetched(url, text, strategy, crawl_date, cache, seen_links, archive, metrics):
+    """Parse the contents of a feed just downloaded by parse or parse_async.
+
+    Args:
+        url: String URL from which the feed was downloaded.
+        text: The string contents of the feed or None if unchanged since the last crawl.
+        strategy: The ParseStrategy by which to gather Article objects from the contents.
+        crawl_date: The datetime.datetime at which the feed was downloaded.
+        cache: Optional feed_cache.FeedCache used to skip items unchanged since the last crawl.
+        seen_links: Optional seen_links.SeenLinks used to skip articles already stored.
+        archive: Optional snapshots.SnapshotArchive in which the feed contents are kept.
+        metrics: Optional metrics.Metrics in which the parse is recorded.
+    Returns:
+        Iterable over model.Article which is empty if the feed has not changed.
+    """
+    if text is None:
+        if metrics:
+            metrics.increment(url, 'unchanged')
+
+        return []
+
+    if archive:
+        archive.add(url, text, crawl_date)
+
+    if metrics:
+        metrics.increment(url, 'bytes', len(text.encode(ENCODING)))
+        strategy = metrics.instrument(url, strategy)
+
+    articles = parse_text(
+        text,
+        strategy,
+        seen_links=seen_links,
+        crawl_date=crawl_date,
+        url=url,
+        cache=cache
+    )
+
+    if cache:
+        articles = confirm_when_parsed(articles, url, cache)
+
+    if metrics:
+        articles = metrics.count_iter(url, 'articles', articles)
+
+    return articles
+
+
+def confirm_when_parsed(articles, url, cache):
+    """Confirm a feed with its cache once every article in it has been parsed.
+
+    Args:
+        articles: Iterable over the model.Article parsed from the feed.
+        url: The string URL of the feed.
+        cache: The feed_cache.FeedCache holding what was learned from the feed's response.
+    Returns:
+        Iterable over the same articles.
+    """
+    yield from articles
+    cache.confirm(url)
+
+
+def time_stage(metrics, key, stage):
+    """Time a stage if metrics are being recorded.
+
+    Args:
+        metrics: The metrics.Metrics into which the stage should be recorded or None.
+        key: The URL of the source or name of work shared across sources.
+        stage: The name of the stage like fetch.
+    Returns:
+        Context manager timing the body of a with statement which does nothing without metrics.
+    """
+    if metrics is None:
+        return contextlib.nullcontext()
+
+    return metrics.time(key, stage)
@@ -37,24 +37,58 @@ def flat_map(visitor, collection):
     )
 
 
+def chunk(collection, size):
+    """Split an iterable into lists of bounded size without materializing the whole iterable.
+
+    Args:
+        collection: The iterable to split.
+        size: The maximum number of elements in each chunk.
+    Returns:
+        Iterable over lists with up to size elements each in their original order.
+    """
+    iterator = iter(collection)
+
+    while True:
+        group = list(itertools.islice(iterator, size))
+        if not group:
+            return
+        yield group
+
+
+def skip(collection, count):
+    """Skip past the first elements of an iterable.
+
+    Args:
+        collection: The iterable whose elements should be skipped.
+        count: The number of elements to skip.
+    Returns:
+        Iterable over the remaining elements.
+    """
+    return itertools.islice(collection, count, None)
+
+
 def find_trailing_link(item):
-    """Parse a poorly formated trailing link.
+    """Find the URL of an item whose link tag was parsed as an empty element.
+
+    HTML parsers like html.parser treat <link> as a void element such that the URL it contained
+    ends up in the text node immediately following the now empty tag. Only the item's direct
+    children and that one sibling are inspected.
 
     Args:
         item: The item as bs4.BeautifulSoup from which to get the link.
     Returns:
-        The URL from the link.
+        The URL from the link or None if the item has no link.
     """
-    contents = list(map(str, item.contents))
-
-    link_found = False
+    link = item.find('link', recursive=False)
+    if link is None:
+        return None
 
-    link_i = 0
-    while not link_found:
-        if contents[link_i].strip() == '<link/>':
-            link_found = True
-        else:
-            link_i += 1
+    link_text = link.get_text().strip()
+    if link_text:
+        return link_text
 
-    link_text = item.contents[link_i + 1]
-    return link_text.strip()
+    trailing = link.next_sibling
+    if isinstance(trailing, str) and trailing.strip():
+        return trailing.strip()
+    else:
+        return None
@@ -0,0 +1,45 @@
+"""Copyright 2019 Data Driven Empathy LLC
+
+Permission is hereby granted, free of charge, to any person obtaining a copy of this software and
+associated documentation files (the "Software"), to deal in the Software without restriction,
+including without limitation the rights to use, copy, modify, merge, publish, distribute,
+sublicense, and/or sell copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all copies or substantial
+portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR IMPLIED, INCLUDING BUT
+NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES
+OR OTHER LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN
+CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+
+import unittest
+
+import bs4
+
+import util
+
+
+class UtilTest(unittest.TestCase):
+
+    def test_find_trailing_link(self):
+        item = self.__parse('<item><title>Test</title><link>Test link</link></item>')
+        self.assertEqual(util.find_trailing_link(item), 'Test link')
+
+    def test_find_trailing_link_missing(self):
+        item = self.__parse('<item><title>Test</title><guid>Test link</guid></item>')
+        self.assertEqual(util.find_trailing_link(item), None)
+
+    def test_find_trailing_link_empty(self):
+        item = self.__parse('<item><link/><title>Test</title></item>')
+        self.assertEqual(util.find_trailing_link(item), None)
+
+    def test_chunk(self):
+        chunks = list(util.chunk(range(5), 2))
+        self.assertEqual(chunks, [[0, 1], [2, 3], [4]])
+
+    def __parse(self, text):
+        return bs4.BeautifulSoup(text, 'html.parser').find('item')